@@ -14,6 +14,17 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 from app.models.base import BaseModel
 from app.models.person import Person
 from app.models.transaction import Transaction
+from app.models.idempotency_key import IdempotencyKey
+from app.models.balance_shard import BalanceShard
+from app.models.ledger_entry import LedgerEntry
+from app.models.balance_checkpoint import BalanceCheckpoint
+from app.models.scheduled_transfer import ScheduledTransfer
+from app.models.recurring_payment import RecurringPayment
+from app.models.recurring_payment_run import RecurringPaymentRun
+from app.models.outbox_event import OutboxEvent
+from app.models.outbox_partition import OutboxPartition
+from app.models.monthly_statement import MonthlyStatement
+from app.models.daily_rollup import DailyRollup, DailyCounterpartyRollup
 from app.core.database import Base
 
 # this is the Alembic Config object
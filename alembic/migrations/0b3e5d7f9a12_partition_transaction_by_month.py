@@ -0,0 +1,142 @@
+"""partition transaction by month
+
+Revision ID: 0b3e5d7f9a12
+Revises: f2b7c9e1a4d6
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b3e5d7f9a12'
+down_revision: Union[str, None] = 'f2b7c9e1a4d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 50000
+# Partitions created ahead of the current month. The naming and bounds below
+# are copied from TransactionPartitionService on purpose: this revision must
+# not change if that code does.
+MONTHS_AHEAD = 3
+
+# Foreign keys to transaction.id: a partitioned table can only have unique
+# constraints that include the partition key, so they cannot stay.
+TRANSACTION_REFERENCES = (
+    ("ledger_entry", "transaction_id"),
+    ("scheduled_transfer", "transaction_id"),
+    ("recurring_payment", "last_transaction_id"),
+)
+
+COLUMNS = "id, amount, transaction_type, sender_id, recipient_id, created_at, updated_at"
+
+INDEXES = (
+    ("ix_transaction_id", ["id"]),
+    ("ix_transaction_sender_created", ["sender_id", "created_at", "id"]),
+    ("ix_transaction_recipient_created", ["recipient_id", "created_at", "id"]),
+)
+
+
+def _month_start(moment: datetime) -> date:
+    return date(moment.year, moment.month, 1)
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _months(first, last):
+    month = first
+    while month <= last:
+        yield month
+        month = _add_months(month, 1)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    conn = op.get_bind()
+    for table, column in TRANSACTION_REFERENCES:
+        op.drop_constraint(f"{table}_{column}_fkey", table, type_="foreignkey")
+
+    # The swap is catalog-only, so the exclusive lock on transaction is
+    # brief; the application writes to the partitioned table right after.
+    op.execute('ALTER TABLE "transaction" RENAME TO transaction_unpartitioned')
+    op.execute("ALTER TABLE transaction_unpartitioned RENAME CONSTRAINT transaction_pkey TO transaction_unpartitioned_pkey")
+    for name, _ in INDEXES:
+        op.drop_index(name, table_name="transaction_unpartitioned")
+
+    op.execute("""
+        CREATE TABLE "transaction" (
+            id integer NOT NULL DEFAULT nextval('transaction_id_seq'),
+            amount bigint NOT NULL,
+            transaction_type integer NOT NULL,
+            sender_id integer NOT NULL REFERENCES person (id),
+            recipient_id integer REFERENCES person (id),
+            created_at timestamp without time zone NOT NULL DEFAULT now(),
+            updated_at timestamp without time zone,
+            CONSTRAINT transaction_pkey PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.execute('ALTER SEQUENCE transaction_id_seq OWNED BY "transaction".id')
+    op.execute('CREATE TABLE transaction_default PARTITION OF "transaction" DEFAULT')
+
+    first = conn.execute(sa.text("SELECT min(created_at) FROM transaction_unpartitioned")).scalar()
+    current = _month_start(datetime.now(timezone.utc))
+    for month in _months(_month_start(first) if first else current, _add_months(current, MONTHS_AHEAD)):
+        op.execute(
+            f'CREATE TABLE "transaction_y{month.year:04d}m{month.month:02d}" PARTITION OF "transaction" '
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')"
+        )
+    for name, columns in INDEXES:
+        op.create_index(name, "transaction", columns, unique=False)
+
+    # Old rows are copied in id batches, each committed on its own; history
+    # reads only see them once their batch is in.
+    max_id = conn.execute(sa.text("SELECT coalesce(max(id), 0) FROM transaction_unpartitioned")).scalar()
+    for start_id in range(0, max_id + 1, BATCH_SIZE):
+        with op.get_context().autocommit_block():
+            conn.execute(
+                sa.text(
+                    f'INSERT INTO "transaction" ({COLUMNS}) '
+                    f"SELECT id, amount, transaction_type, sender_id, recipient_id, coalesce(created_at, now()), updated_at "
+                    f"FROM transaction_unpartitioned WHERE id >= :start AND id < :end"
+                ),
+                {"start": start_id, "end": start_id + BATCH_SIZE}
+            )
+    op.drop_table("transaction_unpartitioned")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('ALTER TABLE "transaction" RENAME TO transaction_partitioned')
+    op.execute("ALTER TABLE transaction_partitioned RENAME CONSTRAINT transaction_pkey TO transaction_partitioned_pkey")
+    for name, _ in INDEXES:
+        op.drop_index(name, table_name="transaction_partitioned")
+
+    op.execute("""
+        CREATE TABLE "transaction" (
+            id integer NOT NULL DEFAULT nextval('transaction_id_seq'),
+            amount bigint NOT NULL,
+            transaction_type integer NOT NULL,
+            sender_id integer NOT NULL REFERENCES person (id),
+            recipient_id integer REFERENCES person (id),
+            created_at timestamp without time zone,
+            updated_at timestamp without time zone,
+            CONSTRAINT transaction_pkey PRIMARY KEY (id)
+        )
+    """)
+    op.execute('ALTER SEQUENCE transaction_id_seq OWNED BY "transaction".id')
+    # Archived partitions are gone from the database and are not restored
+    op.execute(f'INSERT INTO "transaction" ({COLUMNS}) SELECT {COLUMNS} FROM transaction_partitioned')
+    op.execute('DROP TABLE transaction_partitioned')
+    for name, columns in INDEXES:
+        op.create_index(name, "transaction", columns, unique=False)
+
+    for table, column in TRANSACTION_REFERENCES:
+        op.execute(f'UPDATE {table} SET {column} = NULL WHERE {column} NOT IN (SELECT id FROM "transaction")')
+        op.create_foreign_key(f"{table}_{column}_fkey", table, "transaction", [column], ["id"])
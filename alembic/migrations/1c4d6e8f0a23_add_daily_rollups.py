@@ -0,0 +1,69 @@
+"""add daily rollups
+
+Revision ID: 1c4d6e8f0a23
+Revises: 0b3e5d7f9a12
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1c4d6e8f0a23'
+down_revision: Union[str, None] = '0b3e5d7f9a12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "daily_rollup",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("account_id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("deposits", sa.BigInteger(), nullable=False),
+        sa.Column("withdrawals", sa.BigInteger(), nullable=False),
+        sa.Column("transfers_in", sa.BigInteger(), nullable=False),
+        sa.Column("transfers_out", sa.BigInteger(), nullable=False),
+        sa.Column("count_in", sa.Integer(), nullable=False),
+        sa.Column("count_out", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["account_id"], ["person.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("account_id", "day", name="uq_daily_rollup_account_day")
+    )
+    op.create_index(op.f("ix_daily_rollup_id"), "daily_rollup", ["id"], unique=False)
+
+    op.create_table(
+        "daily_counterparty_rollup",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("account_id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("counterparty_id", sa.Integer(), nullable=False),
+        sa.Column("amount_in", sa.BigInteger(), nullable=False),
+        sa.Column("amount_out", sa.BigInteger(), nullable=False),
+        sa.Column("transaction_count", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["account_id"], ["person.id"]),
+        sa.ForeignKeyConstraint(["counterparty_id"], ["person.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "account_id", "day", "counterparty_id",
+            name="uq_daily_counterparty_rollup_account_day_counterparty"
+        )
+    )
+    op.create_index(op.f("ix_daily_counterparty_rollup_id"), "daily_counterparty_rollup", ["id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_daily_counterparty_rollup_id"), table_name="daily_counterparty_rollup")
+    op.drop_table("daily_counterparty_rollup")
+    op.drop_index(op.f("ix_daily_rollup_id"), table_name="daily_rollup")
+    op.drop_table("daily_rollup")
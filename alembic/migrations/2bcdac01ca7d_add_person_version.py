@@ -0,0 +1,29 @@
+"""add person version
+
+Revision ID: 2bcdac01ca7d
+Revises: 89e66c6cabe6
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2bcdac01ca7d'
+down_revision: Union[str, None] = '89e66c6cabe6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A constant default is a catalog-only change, so no table rewrite.
+    op.add_column("person", sa.Column("version", sa.Integer(), nullable=False, server_default="1"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("person", "version")
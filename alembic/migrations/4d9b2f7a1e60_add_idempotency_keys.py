@@ -0,0 +1,51 @@
+"""add idempotency keys
+
+Revision ID: 4d9b2f7a1e60
+Revises: 1c4d6e8f0a23
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4d9b2f7a1e60'
+down_revision: Union[str, None] = '1c4d6e8f0a23'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The table shipped without a revision and only existed where startup's
+    # create_all made it, so leave those databases as they are.
+    if sa.inspect(op.get_bind()).has_table("idempotency_key"):
+        return
+
+    op.create_table(
+        "idempotency_key",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("key", sa.String(length=255), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("request_hash", sa.String(length=64), nullable=False),
+        sa.Column("response", sa.JSON(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["person.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id", "key", name="uq_idempotency_key_user_key")
+    )
+    op.create_index(op.f("ix_idempotency_key_id"), "idempotency_key", ["id"], unique=False)
+    # purge-idempotency-keys deletes by expires_at in batches
+    op.create_index(op.f("ix_idempotency_key_expires_at"), "idempotency_key", ["expires_at"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_idempotency_key_expires_at"), table_name="idempotency_key")
+    op.drop_index(op.f("ix_idempotency_key_id"), table_name="idempotency_key")
+    op.drop_table("idempotency_key")
@@ -0,0 +1,57 @@
+"""add scheduled transfers
+
+Revision ID: 5e0c7a9d3f21
+Revises: 2bcdac01ca7d
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e0c7a9d3f21'
+down_revision: Union[str, None] = '2bcdac01ca7d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "scheduled_transfer",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("sender_id", sa.Integer(), nullable=False),
+        sa.Column("recipient_id", sa.Integer(), nullable=False),
+        sa.Column("amount", sa.BigInteger(), nullable=False),
+        sa.Column("execute_at", sa.DateTime(), nullable=False),
+        sa.Column("status", sa.Integer(), nullable=False),
+        sa.Column("transaction_id", sa.Integer(), nullable=True),
+        sa.Column("error_code", sa.String(length=64), nullable=True),
+        sa.Column("executed_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["sender_id"], ["person.id"]),
+        sa.ForeignKeyConstraint(["recipient_id"], ["person.id"]),
+        sa.ForeignKeyConstraint(["transaction_id"], ["transaction.id"]),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index(op.f("ix_scheduled_transfer_id"), "scheduled_transfer", ["id"], unique=False)
+    op.create_index(op.f("ix_scheduled_transfer_sender_id"), "scheduled_transfer", ["sender_id"], unique=False)
+    op.create_index(
+        "ix_scheduled_transfer_due",
+        "scheduled_transfer",
+        ["execute_at"],
+        unique=False,
+        postgresql_where=sa.text("status = 1")
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_scheduled_transfer_due", table_name="scheduled_transfer")
+    op.drop_index(op.f("ix_scheduled_transfer_sender_id"), table_name="scheduled_transfer")
+    op.drop_index(op.f("ix_scheduled_transfer_id"), table_name="scheduled_transfer")
+    op.drop_table("scheduled_transfer")
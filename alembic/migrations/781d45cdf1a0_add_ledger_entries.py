@@ -0,0 +1,67 @@
+"""add ledger entries
+
+Revision ID: 781d45cdf1a0
+Revises: d05081934c18
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '781d45cdf1a0'
+down_revision: Union[str, None] = 'd05081934c18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "ledger_entry",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("account_id", sa.Integer(), nullable=False),
+        sa.Column("seq", sa.BigInteger(), nullable=True),
+        sa.Column("amount", sa.BigInteger(), nullable=False),
+        sa.Column("balance_after", sa.BigInteger(), nullable=True),
+        sa.Column("transaction_id", sa.Integer(), nullable=True),
+        sa.Column("transaction_type", sa.Integer(), nullable=True),
+        sa.Column("counterparty_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["account_id"], ["person.id"]),
+        sa.ForeignKeyConstraint(["counterparty_id"], ["person.id"]),
+        sa.ForeignKeyConstraint(["transaction_id"], ["transaction.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("account_id", "seq", name="uq_ledger_entry_account_seq")
+    )
+    op.create_index(op.f("ix_ledger_entry_id"), "ledger_entry", ["id"], unique=False)
+    op.create_index(
+        "ix_ledger_entry_pending",
+        "ledger_entry",
+        ["account_id"],
+        unique=False,
+        postgresql_where=sa.text("seq IS NULL")
+    )
+
+    # Existing balances become each account's opening entry, so running
+    # balances of new entries start from the right value. Credits still
+    # parked in balance shards are folded in the same way.
+    op.execute("""
+        INSERT INTO ledger_entry (account_id, seq, amount, balance_after, created_at, updated_at)
+        SELECT p.id, 1, p.balance + coalesce(s.total, 0), p.balance + coalesce(s.total, 0), now(), now()
+        FROM person p
+        LEFT JOIN (
+            SELECT person_id, sum(balance) AS total FROM balance_shard GROUP BY person_id
+        ) s ON s.person_id = p.id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_ledger_entry_pending", table_name="ledger_entry", postgresql_where=sa.text("seq IS NULL"))
+    op.drop_index(op.f("ix_ledger_entry_id"), table_name="ledger_entry")
+    op.drop_table("ledger_entry")
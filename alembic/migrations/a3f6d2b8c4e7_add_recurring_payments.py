@@ -0,0 +1,80 @@
+"""add recurring payments
+
+Revision ID: a3f6d2b8c4e7
+Revises: 5e0c7a9d3f21
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f6d2b8c4e7'
+down_revision: Union[str, None] = '5e0c7a9d3f21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "recurring_payment",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("sender_id", sa.Integer(), nullable=False),
+        sa.Column("recipient_id", sa.Integer(), nullable=False),
+        sa.Column("amount", sa.BigInteger(), nullable=False),
+        sa.Column("interval", sa.Integer(), nullable=False),
+        sa.Column("start_at", sa.DateTime(), nullable=False),
+        sa.Column("end_at", sa.DateTime(), nullable=True),
+        sa.Column("catch_up", sa.Boolean(), nullable=False),
+        sa.Column("next_run_at", sa.DateTime(), nullable=False),
+        sa.Column("status", sa.Integer(), nullable=False),
+        sa.Column("last_run_at", sa.DateTime(), nullable=True),
+        sa.Column("last_transaction_id", sa.Integer(), nullable=True),
+        sa.Column("last_error_code", sa.String(length=64), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["sender_id"], ["person.id"]),
+        sa.ForeignKeyConstraint(["recipient_id"], ["person.id"]),
+        sa.ForeignKeyConstraint(["last_transaction_id"], ["transaction.id"]),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index(op.f("ix_recurring_payment_id"), "recurring_payment", ["id"], unique=False)
+    op.create_index(op.f("ix_recurring_payment_sender_id"), "recurring_payment", ["sender_id"], unique=False)
+    op.create_index(
+        "ix_recurring_payment_due",
+        "recurring_payment",
+        ["next_run_at"],
+        unique=False,
+        postgresql_where=sa.text("status = 1")
+    )
+    op.create_table(
+        "recurring_payment_run",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("started_at", sa.DateTime(), nullable=False),
+        sa.Column("finished_at", sa.DateTime(), nullable=False),
+        sa.Column("batches", sa.Integer(), nullable=False),
+        sa.Column("executed", sa.Integer(), nullable=False),
+        sa.Column("failed", sa.Integer(), nullable=False),
+        sa.Column("skipped", sa.Integer(), nullable=False),
+        sa.Column("retried", sa.Integer(), nullable=False),
+        sa.Column("finished", sa.Integer(), nullable=False),
+        sa.Column("max_lag_seconds", sa.Float(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index(op.f("ix_recurring_payment_run_id"), "recurring_payment_run", ["id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_recurring_payment_run_id"), table_name="recurring_payment_run")
+    op.drop_table("recurring_payment_run")
+    op.drop_index("ix_recurring_payment_due", table_name="recurring_payment")
+    op.drop_index(op.f("ix_recurring_payment_sender_id"), table_name="recurring_payment")
+    op.drop_index(op.f("ix_recurring_payment_id"), table_name="recurring_payment")
+    op.drop_table("recurring_payment")
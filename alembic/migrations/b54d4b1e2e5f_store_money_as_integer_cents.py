@@ -0,0 +1,154 @@
+"""store money as integer cents
+
+Revision ID: b54d4b1e2e5f
+Revises:
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b54d4b1e2e5f'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 10000
+
+# (table, float column) pairs converted by this migration
+MONEY_COLUMNS = (
+    ("person", "balance"),
+    ("transaction", "amount"),
+)
+
+
+def _sync_trigger_sql(table: str, column: str) -> str:
+    # Keeps the shadow column in sync with rows written by the running
+    # application while the backfill is in progress.
+    return f"""
+        CREATE OR REPLACE FUNCTION {table}_{column}_cents_sync() RETURNS trigger AS $$
+        BEGIN
+            NEW.{column}_cents := round(NEW.{column} * 100)::bigint;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE TRIGGER {table}_{column}_cents_sync
+        BEFORE INSERT OR UPDATE OF {column} ON "{table}"
+        FOR EACH ROW EXECUTE FUNCTION {table}_{column}_cents_sync();
+    """
+
+
+def _backfill(table: str, column: str) -> None:
+    conn = op.get_bind()
+    max_id = conn.execute(sa.text(f'SELECT coalesce(max(id), 0) FROM "{table}"')).scalar()
+
+    # Each batch commits on its own so row locks are only held for one
+    # id range at a time instead of for the whole table.
+    for start in range(0, max_id + 1, BATCH_SIZE):
+        with op.get_context().autocommit_block():
+            conn.execute(
+                sa.text(
+                    f'UPDATE "{table}" SET {column}_cents = round({column} * 100)::bigint '
+                    f'WHERE id >= :start AND id < :end AND {column}_cents IS NULL'
+                ),
+                {"start": start, "end": start + BATCH_SIZE}
+            )
+
+
+def _create_tables() -> None:
+    # The schema used to be created by the application itself, so this
+    # first revision also has to build it on an empty database.
+    op.create_table(
+        "person",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("password", sa.String(), nullable=False),
+        sa.Column("address", sa.String(), nullable=False),
+        sa.Column("city", sa.String(), nullable=False),
+        sa.Column("state", sa.String(), nullable=False),
+        sa.Column("last_login", sa.DateTime(), nullable=True),
+        sa.Column("balance", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("type", sa.Integer(), nullable=False),
+        sa.Column("cpf", sa.String(), nullable=True),
+        sa.Column("cnpj", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index(op.f("ix_person_id"), "person", ["id"], unique=False)
+    op.create_index(op.f("ix_person_email"), "person", ["email"], unique=True)
+    op.create_table(
+        "transaction",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("amount", sa.BigInteger(), nullable=False),
+        sa.Column("transaction_type", sa.Integer(), nullable=False),
+        sa.Column("sender_id", sa.Integer(), nullable=False),
+        sa.Column("recipient_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["sender_id"], ["person.id"]),
+        sa.ForeignKeyConstraint(["recipient_id"], ["person.id"]),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index(op.f("ix_transaction_id"), "transaction", ["id"], unique=False)
+
+
+def _stores_float(table: str, column: str) -> bool:
+    # Tables created from the current models already hold integer cents;
+    # multiplying those by 100 again would corrupt every balance.
+    columns = sa.inspect(op.get_bind()).get_columns(table)
+    return not isinstance(next(c["type"] for c in columns if c["name"] == column), sa.Integer)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not sa.inspect(op.get_bind()).has_table("person"):
+        _create_tables()
+        return
+
+    money_columns = [(table, column) for table, column in MONEY_COLUMNS if _stores_float(table, column)]
+    for table, column in money_columns:
+        op.add_column(table, sa.Column(f"{column}_cents", sa.BigInteger(), nullable=True))
+        op.execute(_sync_trigger_sql(table, column))
+
+    for table, column in money_columns:
+        _backfill(table, column)
+        # A validated CHECK lets SET NOT NULL below skip its full-table scan.
+        op.execute(
+            f'ALTER TABLE "{table}" ADD CONSTRAINT {table}_{column}_cents_not_null '
+            f'CHECK ({column}_cents IS NOT NULL) NOT VALID'
+        )
+        with op.get_context().autocommit_block():
+            op.execute(f'ALTER TABLE "{table}" VALIDATE CONSTRAINT {table}_{column}_cents_not_null')
+
+    # The swap only touches the catalog, so the exclusive lock is brief.
+    for table, column in money_columns:
+        op.execute(f'DROP TRIGGER {table}_{column}_cents_sync ON "{table}"')
+        op.execute(f'DROP FUNCTION {table}_{column}_cents_sync()')
+        op.drop_column(table, column)
+        op.alter_column(table, f"{column}_cents", new_column_name=column, nullable=False)
+        op.drop_constraint(f"{table}_{column}_cents_not_null", table, type_="check")
+
+    op.alter_column("person", "balance", server_default="0")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column(
+        "transaction", "amount",
+        type_=sa.Float(),
+        postgresql_using="amount / 100.0"
+    )
+    op.alter_column(
+        "person", "balance",
+        type_=sa.Float(),
+        server_default=None,
+        nullable=True,
+        postgresql_using="balance / 100.0"
+    )
@@ -0,0 +1,63 @@
+"""add transactional outbox
+
+Revision ID: c71e4f09b5d2
+Revises: a3f6d2b8c4e7
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core import config
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c71e4f09b5d2'
+down_revision: Union[str, None] = 'a3f6d2b8c4e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "outbox_event",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("account_id", sa.Integer(), nullable=False),
+        sa.Column("partition", sa.Integer(), nullable=False),
+        sa.Column("event_type", sa.String(length=64), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("dispatched_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index(op.f("ix_outbox_event_id"), "outbox_event", ["id"], unique=False)
+    op.create_index(
+        "ix_outbox_event_pending",
+        "outbox_event",
+        ["partition", "id"],
+        unique=False,
+        postgresql_where=sa.text("dispatched_at IS NULL")
+    )
+    partition_table = op.create_table(
+        "outbox_partition",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("last_dispatched_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index(op.f("ix_outbox_partition_id"), "outbox_partition", ["id"], unique=False)
+    op.bulk_insert(partition_table, [{"id": partition_id} for partition_id in range(config.OUTBOX_PARTITIONS)])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_outbox_partition_id"), table_name="outbox_partition")
+    op.drop_table("outbox_partition")
+    op.drop_index("ix_outbox_event_pending", table_name="outbox_event")
+    op.drop_index(op.f("ix_outbox_event_id"), table_name="outbox_event")
+    op.drop_table("outbox_event")
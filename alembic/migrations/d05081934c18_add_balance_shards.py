@@ -0,0 +1,47 @@
+"""add balance shards
+
+Revision ID: d05081934c18
+Revises: b54d4b1e2e5f
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd05081934c18'
+down_revision: Union[str, None] = 'b54d4b1e2e5f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A constant default is a catalog-only change, so no table rewrite.
+    op.add_column(
+        "person",
+        sa.Column("balance_shards", sa.Integer(), nullable=False, server_default="0")
+    )
+    op.create_table(
+        "balance_shard",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("person_id", sa.Integer(), nullable=False),
+        sa.Column("shard_index", sa.Integer(), nullable=False),
+        sa.Column("balance", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["person_id"], ["person.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("person_id", "shard_index", name="uq_balance_shard_person_shard")
+    )
+    op.create_index(op.f("ix_balance_shard_id"), "balance_shard", ["id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_balance_shard_id"), table_name="balance_shard")
+    op.drop_table("balance_shard")
+    op.drop_column("person", "balance_shards")
@@ -0,0 +1,54 @@
+"""add transaction history indexes
+
+Revision ID: e4a8b1c6d9f3
+Revises: c71e4f09b5d2
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a8b1c6d9f3'
+down_revision: Union[str, None] = 'c71e4f09b5d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY cannot run inside a transaction block; building the
+    # indexes this way does not block writes to the transaction table.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_transaction_sender_created",
+            "transaction",
+            ["sender_id", "created_at", "id"],
+            unique=False,
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            "ix_transaction_recipient_created",
+            "transaction",
+            ["recipient_id", "created_at", "id"],
+            unique=False,
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_transaction_recipient_created",
+            table_name="transaction",
+            postgresql_concurrently=True
+        )
+        op.drop_index(
+            "ix_transaction_sender_created",
+            table_name="transaction",
+            postgresql_concurrently=True
+        )
@@ -0,0 +1,48 @@
+"""add monthly statements
+
+Revision ID: f2b7c9e1a4d6
+Revises: e4a8b1c6d9f3
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b7c9e1a4d6'
+down_revision: Union[str, None] = 'e4a8b1c6d9f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "monthly_statement",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("account_id", sa.Integer(), nullable=False),
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column("opening_balance", sa.BigInteger(), nullable=False),
+        sa.Column("closing_balance", sa.BigInteger(), nullable=False),
+        sa.Column("deposits", sa.BigInteger(), nullable=False),
+        sa.Column("withdrawals", sa.BigInteger(), nullable=False),
+        sa.Column("transfers_in", sa.BigInteger(), nullable=False),
+        sa.Column("transfers_out", sa.BigInteger(), nullable=False),
+        sa.Column("transaction_count", sa.Integer(), nullable=False),
+        sa.Column("closed_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["account_id"], ["person.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("account_id", "month", name="uq_monthly_statement_account_month")
+    )
+    op.create_index(op.f("ix_monthly_statement_id"), "monthly_statement", ["id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_monthly_statement_id"), table_name="monthly_statement")
+    op.drop_table("monthly_statement")
@@ -1,12 +1,13 @@
 from fastapi import APIRouter, Depends, Response, Request, status
 from sqlalchemy.orm import Session
 from app.core.database import get_db
+from app.core.json_response import EnvelopeRoute
 from app.schemas.person import NaturalPersonCreate, LegalPersonCreate, LoginRequest
 from app.services.auth_service import AuthService
 from typing import Dict, Any
 from app.core.response_handler import ResponseHandler
 
-router = APIRouter()
+router = APIRouter(route_class=EnvelopeRoute)
 
 @router.post(
     "/user/register/natural",
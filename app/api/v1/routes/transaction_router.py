@@ -1,12 +1,44 @@
-from fastapi import APIRouter, Depends, Request, status
+from fastapi import APIRouter, Depends, Header, Path, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from app.core.database import get_db
-from app.schemas.transaction import TransferRequest, DepositRequest, WithdrawRequest
-from app.services.transaction_service import TransactionService
+from app.core.json_response import EnvelopeRoute
+from app.core import config
+from app.schemas.transaction import TransferRequest, DepositRequest, WithdrawRequest, BatchTransferRequest, ScheduledTransferRequest, RecurringPaymentRequest, HistoryFilters
+from app.services.transaction_service import TransactionService, HISTORY_EXPORT_CSV, HISTORY_EXPORT_NDJSON
+from app.services.scheduled_transfer_service import ScheduledTransferService
+from app.services.recurring_payment_service import RecurringPaymentService
+from app.services.etag_service import EtagService
+from app.services.statement_service import StatementService
+from app.services.analytics_service import AnalyticsService
+from app.core.etag import CACHE_CONTROL, etag_matches, not_modified
 from app.core.security import get_current_user_from_request
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Literal
+from datetime import date, datetime
 
-router = APIRouter(prefix="/operation")
+router = APIRouter(prefix="/operation", route_class=EnvelopeRoute)
+
+EXPORT_MEDIA_TYPES = {
+    HISTORY_EXPORT_CSV: "text/csv; charset=utf-8",
+    HISTORY_EXPORT_NDJSON: "application/x-ndjson"
+}
+
+def history_filters(
+    created_from: Optional[datetime] = Query(None, alias="from", description="Data e hora (ISO 8601) inicial, inclusiva"),
+    created_to: Optional[datetime] = Query(None, alias="to", description="Data e hora (ISO 8601) final, inclusiva"),
+    type: Optional[Literal["deposit", "withdraw", "transfer"]] = Query(None, description="Tipo da transação"),
+    direction: Optional[Literal["in", "out"]] = Query(None, description="Entradas (in) ou saídas (out)"),
+    min_amount: Optional[str] = Query(None, description="Valor mínimo em reais, inclusivo"),
+    max_amount: Optional[str] = Query(None, description="Valor máximo em reais, inclusivo")
+) -> HistoryFilters:
+    return HistoryFilters(
+        created_from=created_from,
+        created_to=created_to,
+        type=type,
+        direction=direction,
+        min_amount=min_amount,
+        max_amount=max_amount
+    )
 
 @router.post(
     "/transfer",
@@ -17,11 +49,116 @@ router = APIRouter(prefix="/operation")
 def transfer(
     request: Request,
     data: TransferRequest, 
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    current_user = get_current_user_from_request(request)
+    transaction_service = TransactionService(db)
+    return transaction_service.transfer(data, current_user, idempotency_key)
+
+@router.post(
+    "/transfer/batch",
+    summary="Transferir valores em lote",
+    description="Transfere valores da sua conta para vários destinatários em uma única operação, como no pagamento de folha",
+    status_code=status.HTTP_200_OK
+)
+def batch_transfer(
+    request: Request,
+    data: BatchTransferRequest, 
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
     db: Session = Depends(get_db)
 ) -> Dict[str, Any]:
     current_user = get_current_user_from_request(request)
     transaction_service = TransactionService(db)
-    return transaction_service.transfer(data, current_user)
+    return transaction_service.batch_transfer(data, current_user, idempotency_key)
+
+@router.post(
+    "/transfer/scheduled",
+    summary="Agendar transferência",
+    description="Agenda uma transferência da sua conta para ser executada em uma data futura",
+    status_code=status.HTTP_201_CREATED
+)
+def schedule_transfer(
+    request: Request,
+    data: ScheduledTransferRequest,
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    current_user = get_current_user_from_request(request)
+    scheduled_transfer_service = ScheduledTransferService(db)
+    return scheduled_transfer_service.schedule(data, current_user)
+
+@router.get(
+    "/transfer/scheduled",
+    summary="Listar transferências agendadas",
+    description="Recupera as transferências agendadas pelo usuário e o status de cada uma",
+    status_code=status.HTTP_200_OK
+)
+def get_scheduled_transfers(
+    request: Request,
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    current_user = get_current_user_from_request(request)
+    scheduled_transfer_service = ScheduledTransferService(db)
+    return scheduled_transfer_service.get_scheduled_transfers(current_user.id)
+
+@router.delete(
+    "/transfer/scheduled/{scheduled_id}",
+    summary="Cancelar transferência agendada",
+    description="Cancela uma transferência agendada que ainda não foi executada",
+    status_code=status.HTTP_200_OK
+)
+def cancel_scheduled_transfer(
+    request: Request,
+    scheduled_id: int,
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    current_user = get_current_user_from_request(request)
+    scheduled_transfer_service = ScheduledTransferService(db)
+    return scheduled_transfer_service.cancel(scheduled_id, current_user)
+
+@router.post(
+    "/transfer/recurring",
+    summary="Criar pagamento recorrente",
+    description="Cria uma transferência recorrente (diária, semanal ou mensal), como aluguel ou folha de pagamento",
+    status_code=status.HTTP_201_CREATED
+)
+def create_recurring_payment(
+    request: Request,
+    data: RecurringPaymentRequest,
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    current_user = get_current_user_from_request(request)
+    recurring_payment_service = RecurringPaymentService(db)
+    return recurring_payment_service.create(data, current_user)
+
+@router.get(
+    "/transfer/recurring",
+    summary="Listar pagamentos recorrentes",
+    description="Recupera os pagamentos recorrentes do usuário, a próxima execução e o resultado da última",
+    status_code=status.HTTP_200_OK
+)
+def get_recurring_payments(
+    request: Request,
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    current_user = get_current_user_from_request(request)
+    recurring_payment_service = RecurringPaymentService(db)
+    return recurring_payment_service.get_recurring_payments(current_user.id)
+
+@router.delete(
+    "/transfer/recurring/{recurring_id}",
+    summary="Cancelar pagamento recorrente",
+    description="Cancela as próximas execuções de um pagamento recorrente ativo",
+    status_code=status.HTTP_200_OK
+)
+def cancel_recurring_payment(
+    request: Request,
+    recurring_id: int,
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    current_user = get_current_user_from_request(request)
+    recurring_payment_service = RecurringPaymentService(db)
+    return recurring_payment_service.cancel(recurring_id, current_user)
 
 @router.post(
     "/deposit",
@@ -32,11 +169,12 @@ def transfer(
 def deposit(
     request: Request,
     data: DepositRequest, 
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
     db: Session = Depends(get_db)
 ) -> Dict[str, Any]:
     current_user = get_current_user_from_request(request)
     transaction_service = TransactionService(db)
-    return transaction_service.deposit(data, current_user)
+    return transaction_service.deposit(data, current_user, idempotency_key)
 
 @router.post(
     "/withdraw",
@@ -47,36 +185,117 @@ def deposit(
 def withdraw(
     request: Request,
     data: WithdrawRequest, 
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
     db: Session = Depends(get_db)
 ) -> Dict[str, Any]:
     current_user = get_current_user_from_request(request)
     transaction_service = TransactionService(db)
-    return transaction_service.withdraw(data, current_user)
+    return transaction_service.withdraw(data, current_user, idempotency_key)
 
 @router.get(
     "/history",
     summary="Obter extrato de transações",
-    description="Recupera o histórico de transações do usuário",
+    description="Recupera o histórico de transações do usuário, da mais recente para a mais antiga, paginado por cursor",
     status_code=status.HTTP_200_OK
 )
 def get_transaction_history(
     request: Request, 
+    response: Response,
+    limit: int = Query(config.HISTORY_PAGE_SIZE, ge=1, le=config.HISTORY_MAX_PAGE_SIZE, description="Quantidade máxima de transações por página"),
+    cursor: Optional[str] = Query(None, description="Valor de `next_cursor` da página anterior"),
+    filters: HistoryFilters = Depends(history_filters),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
     db: Session = Depends(get_db)
 ) -> Dict[str, Any]:
     current_user = get_current_user_from_request(request)
     transaction_service = TransactionService(db)
-    return transaction_service.get_transaction_history(current_user.id)
+    result = transaction_service.get_transaction_history(current_user.id, limit, cursor, filters)
+    
+    # The page is read first: the tag covers the counterparties it shows
+    etag = EtagService(db).get_history_etag(current_user, result["data"]["transactions"])
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return result
+
+@router.get(
+    "/history/export",
+    summary="Exportar extrato de transações",
+    description="Exporta o histórico completo (ou filtrado) em CSV ou NDJSON, enviado em streaming e opcionalmente compactado com gzip",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse
+)
+def export_transaction_history(
+    request: Request,
+    format: Literal["csv", "ndjson"] = Query(HISTORY_EXPORT_NDJSON, description="Formato do arquivo"),
+    gzip: bool = Query(False, description="Compacta o arquivo com gzip"),
+    filters: HistoryFilters = Depends(history_filters),
+    db: Session = Depends(get_db)
+) -> StreamingResponse:
+    current_user = get_current_user_from_request(request)
+    transaction_service = TransactionService(db)
+    chunks = transaction_service.export_transaction_history(current_user.id, format, filters, gzip)
+    
+    filename = f"extrato.{format}" + (".gz" if gzip else "")
+    media_type = "application/gzip" if gzip else EXPORT_MEDIA_TYPES[format]
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@router.get(
+    "/statement/{month}",
+    summary="Obter extrato mensal",
+    description="Recupera o resumo de um mês (saldo inicial e final, entradas e saídas por tipo e quantidade de transações)",
+    status_code=status.HTTP_200_OK
+)
+def get_monthly_statement(
+    request: Request,
+    month: str = Path(..., pattern=r"^\d{4}-(0[1-9]|1[0-2])$", description="Mês no formato AAAA-MM"),
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    current_user = get_current_user_from_request(request)
+    statement_service = StatementService(db)
+    return statement_service.get_statement(current_user.id, month)
+
+@router.get(
+    "/analytics",
+    summary="Obter análise de gastos",
+    description="Recupera totais por dia ou semana (por tipo e direção), ticket médio e principais contrapartes do período",
+    status_code=status.HTTP_200_OK
+)
+def get_analytics(
+    request: Request,
+    granularity: Literal["day", "week"] = Query("day", description="Agrupamento da série: por dia ou por semana (iniciando na segunda-feira)"),
+    start: Optional[date] = Query(None, alias="from", description="Data inicial, inclusiva (padrão: últimos 30 dias)"),
+    end: Optional[date] = Query(None, alias="to", description="Data final, inclusiva (padrão: hoje)"),
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    current_user = get_current_user_from_request(request)
+    analytics_service = AnalyticsService(db)
+    return analytics_service.get_analytics(current_user.id, granularity, start, end)
 
 @router.get(
     "/balance",
     summary="Obter saldo do usuário",
-    description="Recupera apenas o saldo atual do usuário autenticado",
+    description="Recupera o saldo atual do usuário autenticado ou, com `at`, o saldo em uma data",
     status_code=status.HTTP_200_OK
 )
 def get_balance(
     request: Request,
+    response: Response,
+    at: Optional[datetime] = Query(None, description="Data e hora (ISO 8601) para consultar o saldo"),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
     db: Session = Depends(get_db)
 ) -> Dict[str, Any]:
     current_user = get_current_user_from_request(request)
+    etag = EtagService(db).get_account_etag(current_user)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    
     transaction_service = TransactionService(db)
-    return transaction_service.get_balance(current_user.id)
\ No newline at end of file
+    return transaction_service.get_balance(current_user.id, at)
\ No newline at end of file
@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends, Request, status
+from fastapi import APIRouter, Depends, Header, Request, Response, status
 from sqlalchemy.orm import Session
 from app.core.database import get_db
+from app.core.json_response import EnvelopeRoute
 from app.services.profile_service import ProfileService
+from app.services.etag_service import EtagService
+from app.core.etag import CACHE_CONTROL, etag_matches, not_modified
 from app.core.security import get_current_user_from_request
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
-router = APIRouter(prefix="/user")
+router = APIRouter(prefix="/user", route_class=EnvelopeRoute)
 
 @router.get(
     "/profile",
@@ -15,8 +18,16 @@ router = APIRouter(prefix="/user")
 )
 def get_profile(
     request: Request,
+    response: Response,
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
     db: Session = Depends(get_db)
 ) -> Dict[str, Any]:
     current_user = get_current_user_from_request(request)
+    etag = EtagService(db).get_account_etag(current_user)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    
     profile_service = ProfileService(db)
     return profile_service.get_profile(current_user.id)
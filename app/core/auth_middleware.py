@@ -1,12 +1,11 @@
-from fastapi import Request, status
-from fastapi.responses import JSONResponse
+from fastapi import Request
 import jwt 
 from typing import Optional, List, Pattern
 import re
 from app.core import config
 from app.core.database import get_db
 from app.models.person import Person
-from app.core.response_handler import ResponseHandler
+from app.core.static_responses import INVALID_TOKEN
 from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
 import logging
 
@@ -66,16 +65,7 @@ class AuthMiddleware(BaseHTTPMiddleware):
         return None
     
     def _handle_no_auth(self):
-        response_handler = ResponseHandler()
-        response_data = response_handler.error(
-            message="Token de autenticação inválido ou expirado",
-            error_code="INVALID_TOKEN"
-        )
-        return JSONResponse(
-            content=response_data,
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            headers={"WWW-Authenticate": "Bearer"}
-        )
+        return INVALID_TOKEN()
     
     def _verify_token(self, token: str) -> Optional[Person]:
         try:
@@ -0,0 +1,17 @@
+from datetime import date, datetime, timezone
+
+
+def utcnow() -> datetime:
+    """Current UTC time as a naive datetime, matching the DateTime columns"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def month_start(moment: datetime) -> date:
+    """First day of the month of ``moment``"""
+    return date(moment.year, moment.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    """First day of the month ``months`` after (or before, if negative) ``month``"""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
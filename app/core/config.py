@@ -7,4 +7,51 @@ DATABASE_HOST: str = os.getenv("DATABASE_HOST", "localhost")
 DATABASE_PORT: str = os.getenv("DATABASE_PORT", "5432")
 DATABASE_USER: str = os.getenv("DATABASE_USER", "postgres")
 DATABASE_PASSWORD: str = os.getenv("DATABASE_PASSWORD", "postgres")
-DATABASE_NAME: str = os.getenv("DATABASE_NAME", "banking")
\ No newline at end of file
+DATABASE_NAME: str = os.getenv("DATABASE_NAME", "banking")
+IDEMPOTENCY_KEY_TTL_SECONDS: int = int(os.getenv("IDEMPOTENCY_KEY_TTL_SECONDS", "86400"))
+IDEMPOTENCY_CACHE_SIZE: int = int(os.getenv("IDEMPOTENCY_CACHE_SIZE", "10000"))
+
+BATCH_TRANSFER_MAX_ITEMS: int = int(os.getenv("BATCH_TRANSFER_MAX_ITEMS", "1000"))
+
+TRANSFER_PIPELINE_ENABLED: bool = os.getenv("TRANSFER_PIPELINE_ENABLED", "false").lower() == "true"
+TRANSFER_PIPELINE_BATCH_SIZE: int = int(os.getenv("TRANSFER_PIPELINE_BATCH_SIZE", "100"))
+TRANSFER_PIPELINE_LINGER_MS: float = float(os.getenv("TRANSFER_PIPELINE_LINGER_MS", "5"))
+
+BALANCE_CHECKPOINT_LAG_SECONDS: int = int(os.getenv("BALANCE_CHECKPOINT_LAG_SECONDS", "60"))
+
+OPTIMISTIC_RETRY_ATTEMPTS: int = int(os.getenv("OPTIMISTIC_RETRY_ATTEMPTS", "5"))
+OPTIMISTIC_RETRY_BACKOFF_MS: float = float(os.getenv("OPTIMISTIC_RETRY_BACKOFF_MS", "5"))
+
+SCHEDULED_TRANSFER_BATCH_SIZE: int = int(os.getenv("SCHEDULED_TRANSFER_BATCH_SIZE", "100"))
+SCHEDULED_TRANSFER_WORKERS: int = int(os.getenv("SCHEDULED_TRANSFER_WORKERS", "4"))
+SCHEDULED_TRANSFER_MAX_PER_SECOND: float = float(os.getenv("SCHEDULED_TRANSFER_MAX_PER_SECOND", "500"))
+SCHEDULED_TRANSFER_POLL_SECONDS: float = float(os.getenv("SCHEDULED_TRANSFER_POLL_SECONDS", "1"))
+
+RECURRING_PAYMENT_BATCH_SIZE: int = int(os.getenv("RECURRING_PAYMENT_BATCH_SIZE", "1000"))
+
+OUTBOX_PARTITIONS: int = int(os.getenv("OUTBOX_PARTITIONS", "16"))
+OUTBOX_BATCH_SIZE: int = int(os.getenv("OUTBOX_BATCH_SIZE", "500"))
+OUTBOX_WORKERS: int = int(os.getenv("OUTBOX_WORKERS", "4"))
+OUTBOX_POLL_SECONDS: float = float(os.getenv("OUTBOX_POLL_SECONDS", "0.5"))
+OUTBOX_DELETE_DISPATCHED: bool = os.getenv("OUTBOX_DELETE_DISPATCHED", "true").lower() == "true"
+
+HISTORY_PAGE_SIZE: int = int(os.getenv("HISTORY_PAGE_SIZE", "50"))
+HISTORY_MAX_PAGE_SIZE: int = int(os.getenv("HISTORY_MAX_PAGE_SIZE", "500"))
+HISTORY_EXPORT_CHUNK_ROWS: int = int(os.getenv("HISTORY_EXPORT_CHUNK_ROWS", "1000"))
+
+TRANSACTION_PARTITION_MONTHS_AHEAD: int = int(os.getenv("TRANSACTION_PARTITION_MONTHS_AHEAD", "3"))
+TRANSACTION_RETENTION_MONTHS: int = int(os.getenv("TRANSACTION_RETENTION_MONTHS", "24"))
+TRANSACTION_ARCHIVE_DIR: str = os.getenv("TRANSACTION_ARCHIVE_DIR", "archive/transactions")
+
+ANALYTICS_DEFAULT_DAYS: int = int(os.getenv("ANALYTICS_DEFAULT_DAYS", "30"))
+ANALYTICS_MAX_DAYS: int = int(os.getenv("ANALYTICS_MAX_DAYS", "366"))
+ANALYTICS_TOP_COUNTERPARTIES: int = int(os.getenv("ANALYTICS_TOP_COUNTERPARTIES", "5"))
+
+BALANCE_CACHE_SIZE: int = int(os.getenv("BALANCE_CACHE_SIZE", "100000"))
+BALANCE_CACHE_TTL_SECONDS: int = int(os.getenv("BALANCE_CACHE_TTL_SECONDS", "60"))
+BALANCE_CACHE_CHANNEL: str = os.getenv("BALANCE_CACHE_CHANNEL", "balance_cache")
+
+PROFILE_CACHE_SIZE: int = int(os.getenv("PROFILE_CACHE_SIZE", "100000"))
+PROFILE_CACHE_TTL_SECONDS: int = int(os.getenv("PROFILE_CACHE_TTL_SECONDS", "300"))
+PROFILE_CACHE_CHANNEL: str = os.getenv("PROFILE_CACHE_CHANNEL", "profile_cache")
+COUNTERPARTY_CACHE_SIZE: int = int(os.getenv("COUNTERPARTY_CACHE_SIZE", "10000"))
@@ -0,0 +1,22 @@
+import base64
+import binascii
+import json
+from typing import Any, Dict
+from app.core.exceptions import ValidationException
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    """Opaque, URL-safe pagination cursor for the given key values"""
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, ValueError, UnicodeError):
+        values = None
+    if not isinstance(values, dict):
+        raise ValidationException(message="Cursor de paginação inválido", error_code="INVALID_CURSOR")
+    return values
@@ -16,6 +16,3 @@ def get_db():
         yield db
     finally:
         db.close()
-        
-def create_tables():
-    Base.metadata.create_all(bind=engine)
@@ -1,9 +1,11 @@
-from fastapi import Request, status
+from fastapi import Request, Response, status
 from fastapi.responses import JSONResponse
+from app.core.json_response import EnvelopeJSONResponse
 from fastapi.exceptions import RequestValidationError
 from pydantic import ValidationError
 from app.core.exceptions import AppException
 from app.core.response_handler import ResponseHandler
+from app.core.static_responses import NOT_FOUND, INTERNAL_SERVER_ERROR
 import traceback
 import logging
 from starlette.exceptions import HTTPException
@@ -12,7 +14,7 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 async def app_exception_handler(request: Request, exc: AppException) -> JSONResponse:
-    return JSONResponse(
+    return EnvelopeJSONResponse(
         status_code=exc.status_code,
         content=ResponseHandler.error(
             message=exc.message,
@@ -34,7 +36,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     if first_error_msg.startswith("Value error, "):
         first_error_msg = first_error_msg[13:]
         
-    return JSONResponse(
+    return EnvelopeJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content=ResponseHandler.error(
             message=first_error_msg,
@@ -57,7 +59,7 @@ async def pydantic_validation_exception_handler(request: Request, exc: Validatio
         first_error_msg = first_error_msg[13:]
         
     
-    return JSONResponse(
+    return EnvelopeJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content=ResponseHandler.error(
             message=first_error_msg,
@@ -66,24 +68,12 @@ async def pydantic_validation_exception_handler(request: Request, exc: Validatio
         )
     )
 
-async def python_exception_handler(request: Request, exc: Exception) -> JSONResponse:
+async def python_exception_handler(request: Request, exc: Exception) -> Response:
     error_details = str(exc)
     error_traceback = traceback.format_exc()
     logger.error(f"Exceção não tratada: {error_details}\n{error_traceback}")
     
-    return JSONResponse(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        content=ResponseHandler.error(
-            message="Ocorreu um erro inesperado",
-            error_code="INTERNAL_SERVER_ERROR"
-        )
-    )
+    return INTERNAL_SERVER_ERROR()
 
-async def not_found_exception_handler(request: Request, exc: HTTPException) -> JSONResponse:
-    return JSONResponse(
-        status_code=status.HTTP_404_NOT_FOUND,
-        content=ResponseHandler.error(
-            message="Recurso não encontrado",
-            error_code="NOT_FOUND"
-        )
-    )
+async def not_found_exception_handler(request: Request, exc: HTTPException) -> Response:
+    return NOT_FOUND()
@@ -87,6 +87,20 @@ class BadRequestException(AppException):
             error_code=error_code
         )
 
+class ConcurrentUpdateException(AppException):
+    def __init__(
+        self,
+        message: str = "Registro alterado por outra operação, tente novamente",
+        data: Any = [],
+        error_code: Optional[Union[str, int]] = "CONCURRENT_UPDATE",
+    ):
+        super().__init__(
+            status_code=status.HTTP_409_CONFLICT,
+            message=message,
+            data=data,
+            error_code=error_code
+        )
+
 class DatabaseException(AppException):
     def __init__(
         self,
@@ -0,0 +1,116 @@
+import functools
+import inspect
+import orjson
+from decimal import Decimal
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+from typing import Any, Callable, Dict, Optional
+
+ENVELOPE_KEYS = frozenset(("success", "data", "message"))
+RESPONSE_PARAM = "_envelope_response"
+
+
+def _default(value: Any) -> Any:
+    # orjson handles dicts, lists, tuples, datetimes, dates and UUIDs itself;
+    # anything else gets the same treatment jsonable_encoder would give it.
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    return jsonable_encoder(value)
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def is_envelope(content: Any) -> bool:
+    """Whether ``content`` is a dict built by ResponseHandler.success/error"""
+    return isinstance(content, dict) and ENVELOPE_KEYS <= content.keys()
+
+
+class EnvelopeJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson; the application's default response class"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class StaticResponse(Response):
+    """A response whose body and headers were encoded ahead of time.
+
+    Skips Response.__init__, which would render the body and rebuild the
+    headers; only the header list is copied, since middleware may append to
+    it while sending.
+    """
+
+    def __init__(self, status_code: int, body: bytes, raw_headers: list):
+        self.status_code = status_code
+        self.body = body
+        self.raw_headers = list(raw_headers)
+        self.background = None
+
+
+class PreEncodedResponse:
+    """A fixed-body envelope encoded once, handing out a StaticResponse per request"""
+
+    def __init__(self, status_code: int, content: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+        self.status_code = status_code
+        self.body = dumps(content)
+        self.raw_headers = [
+            (b"content-length", str(len(self.body)).encode("latin-1")),
+            (b"content-type", EnvelopeJSONResponse.media_type.encode("latin-1")),
+            *((name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in (headers or {}).items())
+        ]
+
+    def __call__(self) -> StaticResponse:
+        return StaticResponse(self.status_code, self.body, self.raw_headers)
+
+
+class EnvelopeRoute(APIRoute):
+    """Route that renders ResponseHandler envelopes straight to JSON bytes.
+
+    FastAPI would first run a returned dict through the response model (or
+    jsonable_encoder) and only then encode it. Envelopes are plain dicts of
+    JSON-friendly values, so the endpoint is wrapped to encode them with
+    orjson right away; status code, headers and cookies set on the
+    ``Response`` parameter are carried over. Anything else is returned to
+    FastAPI untouched.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        super().__init__(path, _render_envelopes(endpoint, kwargs.get("status_code")), **kwargs)
+
+
+def _render_envelopes(endpoint: Callable[..., Any], status_code: Optional[int]) -> Callable[..., Any]:
+    signature = inspect.signature(endpoint)
+    parameters = list(signature.parameters.values())
+    response_param = next((p.name for p in parameters if p.annotation is Response), None)
+    injected = response_param is None
+    if injected:
+        response_param = RESPONSE_PARAM
+        parameters.append(inspect.Parameter(RESPONSE_PARAM, inspect.Parameter.KEYWORD_ONLY, annotation=Response))
+
+    def render(content: Any, response: Response) -> Any:
+        if not is_envelope(content):
+            return content
+        rendered = EnvelopeJSONResponse(content, status_code=response.status_code or status_code or 200)
+        rendered.raw_headers.extend(response.headers.raw)
+        return rendered
+
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(**kwargs: Any) -> Any:
+            response = kwargs.pop(response_param) if injected else kwargs[response_param]
+            return render(await endpoint(**kwargs), response)
+    else:
+        @functools.wraps(endpoint)
+        def wrapper(**kwargs: Any) -> Any:
+            response = kwargs.pop(response_param) if injected else kwargs[response_param]
+            return render(endpoint(**kwargs), response)
+
+    wrapper.__signature__ = signature.replace(parameters=parameters)
+    return wrapper
@@ -0,0 +1,31 @@
+from decimal import Decimal, InvalidOperation
+from typing import Any, Optional
+
+CENTS_PER_UNIT = 100
+
+
+def to_cents(value: Any) -> int:
+    """Parse a monetary amount in reais (int, float, str or Decimal) into integer cents"""
+    if isinstance(value, bool):
+        raise ValueError('Valor monetário inválido')
+
+    try:
+        amount = Decimal(str(value))
+    except (InvalidOperation, ValueError):
+        raise ValueError('Valor monetário inválido')
+
+    if not amount.is_finite():
+        raise ValueError('Valor monetário inválido')
+
+    cents = amount * CENTS_PER_UNIT
+    if cents != cents.to_integral_value():
+        raise ValueError('O valor deve ter no máximo 2 casas decimais')
+
+    return int(cents)
+
+
+def from_cents(cents: Optional[int]) -> Optional[float]:
+    """Present integer cents as a reais amount for API responses"""
+    if cents is None:
+        return None
+    return cents / CENTS_PER_UNIT
@@ -0,0 +1,33 @@
+import threading
+import time
+from typing import Optional
+
+
+class RateLimiter:
+    """Token bucket shared by threads.
+
+    ``acquire(n)`` reserves n tokens and sleeps until they would have been
+    refilled, so callers asking for more than is available queue up in
+    order instead of spinning. A ``rate`` of None or 0 disables limiting.
+    """
+
+    def __init__(self, rate: Optional[float], burst: Optional[float] = None):
+        self.rate = rate
+        self.capacity = burst if burst is not None else (rate or 0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1) -> float:
+        """Take ``tokens``, returning how long the caller was made to wait"""
+        if not self.rate:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+        return wait
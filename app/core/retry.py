@@ -0,0 +1,34 @@
+import random
+import time
+from typing import Callable, TypeVar
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+from app.core import config
+from app.core.exceptions import ConcurrentUpdateException
+
+T = TypeVar("T")
+
+
+def retry_on_conflict(
+    db: Session,
+    operation: Callable[[], T],
+    attempts: int = config.OPTIMISTIC_RETRY_ATTEMPTS,
+    backoff_ms: float = config.OPTIMISTIC_RETRY_BACKOFF_MS
+) -> T:
+    """Run ``operation`` again from fresh reads while it loses optimistic version checks.
+
+    The session is rolled back between attempts, which also expires every
+    loaded object, so the next attempt re-reads current balances. Attempts
+    back off with jitter; after the last one the conflict reaches the caller
+    as ConcurrentUpdateException.
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            return operation()
+        except (StaleDataError, ConcurrentUpdateException) as e:
+            db.rollback()
+            if attempt == attempts:
+                if isinstance(e, ConcurrentUpdateException):
+                    raise
+                raise ConcurrentUpdateException() from e
+            time.sleep(random.uniform(0, backoff_ms * 2 ** (attempt - 1)) / 1000)
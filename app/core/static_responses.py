@@ -0,0 +1,20 @@
+from fastapi import status
+from app.core.json_response import PreEncodedResponse
+from app.core.response_handler import ResponseHandler
+
+# Error responses whose body never changes, encoded once at import and
+# served from bytes on the hot paths (rejected tokens, unknown routes,
+# unhandled exceptions).
+INVALID_TOKEN = PreEncodedResponse(
+    status.HTTP_401_UNAUTHORIZED,
+    ResponseHandler.error(message="Token de autenticação inválido ou expirado", error_code="INVALID_TOKEN"),
+    headers={"WWW-Authenticate": "Bearer"}
+)
+NOT_FOUND = PreEncodedResponse(
+    status.HTTP_404_NOT_FOUND,
+    ResponseHandler.error(message="Recurso não encontrado", error_code="NOT_FOUND")
+)
+INTERNAL_SERVER_ERROR = PreEncodedResponse(
+    status.HTTP_500_INTERNAL_SERVER_ERROR,
+    ResponseHandler.error(message="Ocorreu um erro inesperado", error_code="INTERNAL_SERVER_ERROR")
+)
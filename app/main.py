@@ -5,9 +5,26 @@ from pydantic import ValidationError
 from starlette.exceptions import HTTPException
 
 from app.api.v1.routes import auth_router, transaction_router, user_router
-from app.core.database import create_tables
+from app.core.database import SessionLocal, engine
 from app.core.auth_middleware import AuthMiddleware
 from app.core.exceptions import AppException
+from app.core.json_response import EnvelopeJSONResponse
+from app.services.idempotency_service import IdempotencyService
+from app.services.transfer_pipeline import transfer_pipeline
+from app.services.balance_cache import balance_invalidation_listener
+from app.services.profile_service import profile_invalidation_listener
+from app.services.balance_shard_service import BalanceShardService
+from app.services.balance_checkpoint_service import BalanceCheckpointService
+from app.services.scheduled_transfer_executor import ScheduledTransferExecutor
+from app.services.recurring_payment_service import RecurringPaymentService
+from app.services.outbox_dispatcher import OutboxDispatcher
+from app.services.outbox_sinks import FileSink, HttpSink, OutboxHttpStub
+from app.services.statement_service import StatementService, parse_month
+from app.services.transaction_partition_service import TransactionPartitionService
+from app.services.analytics_service import AnalyticsService
+from app.core import config
+from app.core.money import from_cents
+from app.core.clock import utcnow, month_start, add_months
 from contextlib import asynccontextmanager
 from app.core.error_handlers import (
     app_exception_handler,
@@ -16,6 +33,9 @@ from app.core.error_handlers import (
     pydantic_validation_exception_handler,
     not_found_exception_handler
 )
+from typing import Optional
+from datetime import datetime, timedelta
+import time
 import typer
 import alembic.config
 import alembic.command
@@ -24,14 +44,23 @@ cli = typer.Typer()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    create_tables()
+    # The schema comes from the migrations only (``python -m main migrate``)
+    if config.TRANSFER_PIPELINE_ENABLED:
+        transfer_pipeline.start()
+    if engine.dialect.name == "postgresql":
+        balance_invalidation_listener.start()
+        profile_invalidation_listener.start()
     yield
+    transfer_pipeline.stop()
+    balance_invalidation_listener.stop()
+    profile_invalidation_listener.stop()
 
 app = FastAPI(
     title="Banking API",
     description="API for banking operations including transfers, deposits and withdrawals",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=EnvelopeJSONResponse
 )
 
 app.add_middleware(AuthMiddleware)
@@ -100,5 +129,223 @@ def show_migrations():
         typer.echo(f"❌ Error showing migrations: {str(e)}")
         raise typer.Exit(code=1)
 
+@cli.command()
+def purge_idempotency_keys(batch_size: int = 1000):
+    db = SessionLocal()
+    try:
+        deleted = IdempotencyService(db).purge_expired(batch_size)
+        typer.echo(f"✅ {deleted} expired idempotency keys removed!")
+    except Exception as e:
+        typer.echo(f"❌ Error purging idempotency keys: {str(e)}")
+        raise typer.Exit(code=1)
+    finally:
+        db.close()
+
+@cli.command()
+def shard_balance(user_id: int, shards: int):
+    db = SessionLocal()
+    try:
+        BalanceShardService(db).set_shard_count(user_id, shards)
+        typer.echo(f"✅ Balance of user {user_id} now uses {shards} shards!")
+    except Exception as e:
+        typer.echo(f"❌ Error sharding balance: {str(e)}")
+        raise typer.Exit(code=1)
+    finally:
+        db.close()
+
+@cli.command()
+def rebalance_balance_shards():
+    db = SessionLocal()
+    try:
+        moved = BalanceShardService(db).rebalance()
+        typer.echo(f"✅ {from_cents(moved)} moved from shards to main balances!")
+    except Exception as e:
+        typer.echo(f"❌ Error rebalancing balance shards: {str(e)}")
+        raise typer.Exit(code=1)
+    finally:
+        db.close()
+
+@cli.command()
+def checkpoint_balances():
+    db = SessionLocal()
+    try:
+        created = BalanceCheckpointService(db).create_checkpoints()
+        typer.echo(f"✅ {created} balance checkpoints created!")
+    except Exception as e:
+        typer.echo(f"❌ Error creating balance checkpoints: {str(e)}")
+        raise typer.Exit(code=1)
+    finally:
+        db.close()
+
+@cli.command()
+def audit_balance(user_id: int):
+    db = SessionLocal()
+    try:
+        result = BalanceCheckpointService(db).audit(user_id)
+        typer.echo(
+            f"Stored: {from_cents(result['stored_balance'])} | "
+            f"Rebuilt: {from_cents(result['rebuilt_balance'])} | "
+            f"Difference: {from_cents(result['difference'])}"
+        )
+        if result["difference"]:
+            raise typer.Exit(code=2)
+        typer.echo("✅ Balance matches its transactions!")
+    except typer.Exit:
+        raise
+    except Exception as e:
+        typer.echo(f"❌ Error auditing balance: {str(e)}")
+        raise typer.Exit(code=1)
+    finally:
+        db.close()
+
+@cli.command()
+def close_monthly_statements(month: Optional[str] = None):
+    db = SessionLocal()
+    try:
+        # Defaults to the month that just ended
+        period = parse_month(month) if month else add_months(month_start(utcnow()), -1)
+        closed = StatementService(db).close_month(period)
+        typer.echo(f"✅ {closed} statements of {period:%Y-%m} closed!")
+    except Exception as e:
+        typer.echo(f"❌ Error closing monthly statements: {str(e)}")
+        raise typer.Exit(code=1)
+    finally:
+        db.close()
+
+@cli.command()
+def create_transaction_partitions(months_ahead: int = config.TRANSACTION_PARTITION_MONTHS_AHEAD):
+    db = SessionLocal()
+    try:
+        created = TransactionPartitionService(db).create_partitions(months_ahead)
+        typer.echo(f"✅ {len(created)} transaction partitions created{': ' + ', '.join(created) if created else ''}!")
+    except Exception as e:
+        typer.echo(f"❌ Error creating transaction partitions: {str(e)}")
+        raise typer.Exit(code=1)
+    finally:
+        db.close()
+
+@cli.command()
+def archive_transaction_partitions(
+    retention_months: int = config.TRANSACTION_RETENTION_MONTHS,
+    archive_dir: str = config.TRANSACTION_ARCHIVE_DIR
+):
+    db = SessionLocal()
+    try:
+        archived = TransactionPartitionService(db).archive_partitions(retention_months, archive_dir)
+        for path in archived:
+            typer.echo(f"📦 {path}")
+        typer.echo(f"✅ {len(archived)} transaction partitions archived!")
+    except Exception as e:
+        typer.echo(f"❌ Error archiving transaction partitions: {str(e)}")
+        raise typer.Exit(code=1)
+    finally:
+        db.close()
+
+@cli.command()
+def rebuild_analytics(start: Optional[str] = None, end: Optional[str] = None):
+    db = SessionLocal()
+    try:
+        # Defaults to the day that just ended
+        yesterday = utcnow().date() - timedelta(days=1)
+        first = datetime.strptime(start, "%Y-%m-%d").date() if start else yesterday
+        last = datetime.strptime(end, "%Y-%m-%d").date() if end else max(first, yesterday)
+        days = AnalyticsService(db).rebuild_days(first, last)
+        typer.echo(f"✅ Analytics of {days} days rebuilt ({first} to {last})!")
+    except Exception as e:
+        typer.echo(f"❌ Error rebuilding analytics: {str(e)}")
+        raise typer.Exit(code=1)
+    finally:
+        db.close()
+
+@cli.command()
+def run_scheduled_transfers(
+    workers: int = config.SCHEDULED_TRANSFER_WORKERS,
+    batch_size: int = config.SCHEDULED_TRANSFER_BATCH_SIZE,
+    max_per_second: float = config.SCHEDULED_TRANSFER_MAX_PER_SECOND,
+    once: bool = False
+):
+    executor = ScheduledTransferExecutor(
+        workers=workers, batch_size=batch_size, max_per_second=max_per_second
+    )
+    try:
+        if not once:
+            typer.echo(f"⏱️ Executing scheduled transfers with {workers} workers (Ctrl+C to stop)...")
+            executor.run_forever()
+            return
+        totals = executor.run_once()
+        typer.echo(
+            f"✅ {totals['executed']} scheduled transfers executed, "
+            f"{totals['failed']} failed, {totals['retried']} left for retry!"
+        )
+    except KeyboardInterrupt:
+        executor.stop()
+    except Exception as e:
+        typer.echo(f"❌ Error running scheduled transfers: {str(e)}")
+        raise typer.Exit(code=1)
+
+@cli.command()
+def run_recurring_payments(batch_size: int = config.RECURRING_PAYMENT_BATCH_SIZE):
+    db = SessionLocal()
+    try:
+        metrics = RecurringPaymentService(db).run_due(batch_size)
+        typer.echo(
+            f"✅ {metrics['executed']} recurring payments executed, {metrics['failed']} failed, "
+            f"{metrics['skipped']} skipped, {metrics['retried']} left for retry "
+            f"in {metrics['batches']} batches ({metrics['duration_seconds']}s, "
+            f"max lag {metrics['max_lag_seconds']:.0f}s)!"
+        )
+    except Exception as e:
+        typer.echo(f"❌ Error running recurring payments: {str(e)}")
+        raise typer.Exit(code=1)
+    finally:
+        db.close()
+
+@cli.command()
+def dispatch_outbox(
+    file: Optional[str] = None,
+    url: Optional[str] = None,
+    workers: int = config.OUTBOX_WORKERS,
+    batch_size: int = config.OUTBOX_BATCH_SIZE,
+    once: bool = False
+):
+    sinks = []
+    if file:
+        sinks.append(FileSink(file))
+    if url:
+        sinks.append(HttpSink(url))
+    if not sinks:
+        typer.echo("❌ Error dispatching outbox: provide --file and/or --url")
+        raise typer.Exit(code=1)
+    
+    dispatcher = OutboxDispatcher(sinks, workers=workers, batch_size=batch_size)
+    try:
+        if not once:
+            typer.echo(f"📤 Dispatching outbox events with {workers} workers (Ctrl+C to stop)...")
+            dispatcher.run_forever()
+            return
+        delivered = dispatcher.run_once()
+        if dispatcher.failed_batches:
+            typer.echo(f"❌ Error dispatching outbox: {dispatcher.failed_batches} batches failed, {delivered} events delivered")
+            raise typer.Exit(code=1)
+        typer.echo(f"✅ {delivered} outbox events delivered!")
+    except KeyboardInterrupt:
+        dispatcher.stop()
+    except typer.Exit:
+        raise
+    except Exception as e:
+        typer.echo(f"❌ Error dispatching outbox: {str(e)}")
+        raise typer.Exit(code=1)
+
+@cli.command()
+def outbox_http_stub(host: str = "127.0.0.1", port: int = 8089):
+    stub = OutboxHttpStub(host, port).start()
+    typer.echo(f"📥 Outbox HTTP stub listening on {stub.url} (Ctrl+C to stop)...")
+    try:
+        while True:
+            time.sleep(5)
+            typer.echo(f"{len(stub.events)} events received in {stub.requests} requests")
+    except KeyboardInterrupt:
+        stub.stop()
+
 if __name__ == "__main__":
     cli()
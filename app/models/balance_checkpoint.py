@@ -0,0 +1,14 @@
+from sqlalchemy import Column, BigInteger, Integer, DateTime, ForeignKey, UniqueConstraint
+from app.models.base import BaseModel
+
+class BalanceCheckpoint(BaseModel):
+    """Balance of an account counting every transaction with id <= ``transaction_id``"""
+    __tablename__ = "balance_checkpoint"
+    __table_args__ = (
+        UniqueConstraint("account_id", "transaction_id", name="uq_balance_checkpoint_account_transaction"),
+    )
+
+    account_id = Column(Integer, ForeignKey("person.id"), nullable=False)
+    transaction_id = Column(Integer, nullable=False)
+    balance = Column(BigInteger, nullable=False)  # stored in cents
+    as_of = Column(DateTime, nullable=False)  # created_at of transaction_id
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, BigInteger, Integer, ForeignKey, UniqueConstraint
+from app.models.base import BaseModel
+
+class BalanceShard(BaseModel):
+    __tablename__ = "balance_shard"
+    __table_args__ = (
+        UniqueConstraint("person_id", "shard_index", name="uq_balance_shard_person_shard"),
+    )
+
+    person_id = Column(Integer, ForeignKey("person.id"), nullable=False)
+    shard_index = Column(Integer, nullable=False)
+    balance = Column(BigInteger, nullable=False, default=0)  # stored in cents
@@ -0,0 +1,33 @@
+from sqlalchemy import Column, BigInteger, Integer, Date, ForeignKey, UniqueConstraint
+from app.models.base import BaseModel
+
+class DailyRollup(BaseModel):
+    """Per-account totals of one UTC day, amounts in cents"""
+    __tablename__ = "daily_rollup"
+    __table_args__ = (
+        UniqueConstraint("account_id", "day", name="uq_daily_rollup_account_day"),
+    )
+
+    account_id = Column(Integer, ForeignKey("person.id"), nullable=False)
+    day = Column(Date, nullable=False)
+    deposits = Column(BigInteger, nullable=False, default=0)
+    withdrawals = Column(BigInteger, nullable=False, default=0)
+    transfers_in = Column(BigInteger, nullable=False, default=0)
+    transfers_out = Column(BigInteger, nullable=False, default=0)
+    count_in = Column(Integer, nullable=False, default=0)
+    count_out = Column(Integer, nullable=False, default=0)
+
+
+class DailyCounterpartyRollup(BaseModel):
+    """Per-account transfer totals with one counterparty on one UTC day, amounts in cents"""
+    __tablename__ = "daily_counterparty_rollup"
+    __table_args__ = (
+        UniqueConstraint("account_id", "day", "counterparty_id", name="uq_daily_counterparty_rollup_account_day_counterparty"),
+    )
+
+    account_id = Column(Integer, ForeignKey("person.id"), nullable=False)
+    day = Column(Date, nullable=False)
+    counterparty_id = Column(Integer, ForeignKey("person.id"), nullable=False)
+    amount_in = Column(BigInteger, nullable=False, default=0)
+    amount_out = Column(BigInteger, nullable=False, default=0)
+    transaction_count = Column(Integer, nullable=False, default=0)
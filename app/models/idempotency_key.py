@@ -0,0 +1,14 @@
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, JSON, UniqueConstraint
+from app.models.base import BaseModel
+
+class IdempotencyKey(BaseModel):
+    __tablename__ = "idempotency_key"
+    __table_args__ = (
+        UniqueConstraint("user_id", "key", name="uq_idempotency_key_user_key"),
+    )
+
+    key = Column(String(255), nullable=False)
+    user_id = Column(Integer, ForeignKey("person.id"), nullable=False)
+    request_hash = Column(String(64), nullable=False)
+    response = Column(JSON, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -0,0 +1,29 @@
+from sqlalchemy import Column, BigInteger, Integer, ForeignKey, Index, UniqueConstraint, text
+from app.models.base import BaseModel
+
+class LedgerEntry(BaseModel):
+    """One leg of a money movement on a single account, never updated once sequenced.
+
+    ``seq`` numbers the entries of each account without gaps and
+    ``balance_after`` is the account balance right after the entry. Credits
+    to sharded accounts are written with both unset and get sequenced later,
+    under the account lock, in id order.
+    """
+    __tablename__ = "ledger_entry"
+    __table_args__ = (
+        UniqueConstraint("account_id", "seq", name="uq_ledger_entry_account_seq"),
+        Index(
+            "ix_ledger_entry_pending",
+            "account_id",
+            postgresql_where=text("seq IS NULL"),
+            sqlite_where=text("seq IS NULL")
+        ),
+    )
+
+    account_id = Column(Integer, ForeignKey("person.id"), nullable=False)
+    seq = Column(BigInteger, nullable=True)
+    amount = Column(BigInteger, nullable=False)  # signed cents: credits > 0, debits < 0
+    balance_after = Column(BigInteger, nullable=True)  # stored in cents
+    transaction_id = Column(Integer, nullable=True)  # None for opening balances; no FK, see Transaction
+    transaction_type = Column(Integer, nullable=True)
+    counterparty_id = Column(Integer, ForeignKey("person.id"), nullable=True)  # None for deposits/withdrawals
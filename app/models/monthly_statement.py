@@ -0,0 +1,25 @@
+from sqlalchemy import Column, BigInteger, Integer, Date, DateTime, ForeignKey, UniqueConstraint
+from app.models.base import BaseModel
+
+class MonthlyStatement(BaseModel):
+    """Per-account rollup of one calendar month (UTC), amounts in cents.
+
+    Rows of the current month are updated by every movement as it is
+    written; ``close_month`` later rebuilds them from the transaction table,
+    carries quiet accounts forward and sets ``closed_at``.
+    """
+    __tablename__ = "monthly_statement"
+    __table_args__ = (
+        UniqueConstraint("account_id", "month", name="uq_monthly_statement_account_month"),
+    )
+
+    account_id = Column(Integer, ForeignKey("person.id"), nullable=False)
+    month = Column(Date, nullable=False)  # first day of the month
+    opening_balance = Column(BigInteger, nullable=False)
+    closing_balance = Column(BigInteger, nullable=False)
+    deposits = Column(BigInteger, nullable=False, default=0)
+    withdrawals = Column(BigInteger, nullable=False, default=0)
+    transfers_in = Column(BigInteger, nullable=False, default=0)
+    transfers_out = Column(BigInteger, nullable=False, default=0)
+    transaction_count = Column(Integer, nullable=False, default=0)
+    closed_at = Column(DateTime, nullable=True)
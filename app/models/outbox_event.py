@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Index, text
+from app.models.base import BaseModel
+
+class OutboxEvent(BaseModel):
+    """Event about one account, written in the same DB transaction as the change it describes"""
+    __tablename__ = "outbox_event"
+    __table_args__ = (
+        # The dispatcher reads undelivered events of one partition in id
+        # order; delivered rows (when kept) drop out of the index.
+        Index(
+            "ix_outbox_event_pending",
+            "partition",
+            "id",
+            postgresql_where=text("dispatched_at IS NULL"),
+            sqlite_where=text("dispatched_at IS NULL")
+        ),
+    )
+
+    account_id = Column(Integer, nullable=False)
+    partition = Column(Integer, nullable=False)
+    event_type = Column(String(64), nullable=False)
+    payload = Column(JSON, nullable=False)
+    dispatched_at = Column(DateTime, nullable=True)
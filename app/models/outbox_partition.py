@@ -0,0 +1,13 @@
+from sqlalchemy import Column, DateTime
+from app.models.base import BaseModel
+
+class OutboxPartition(BaseModel):
+    """Lease row per outbox partition; ``id`` is the partition number.
+
+    A dispatcher holds the row lock while it delivers a batch of the
+    partition, so each account's events are delivered by one worker at a
+    time and therefore in order.
+    """
+    __tablename__ = "outbox_partition"
+
+    last_dispatched_at = Column(DateTime, nullable=True)
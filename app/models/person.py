@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Float, DateTime, Integer, ForeignKey
+from sqlalchemy import Column, String, BigInteger, DateTime, Integer, ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.models.base import BaseModel
@@ -16,10 +16,16 @@ class Person(BaseModel):
     city = Column(String, nullable=False)
     state = Column(String, nullable=False)
     last_login = Column(DateTime, nullable=True)
-    balance = Column(Float, default=0.0)
+    balance = Column(BigInteger, nullable=False, default=0)  # stored in cents
+    balance_shards = Column(Integer, nullable=False, default=0)  # 0 = not sharded, see BalanceShard
     type = Column(Integer, nullable=False)
     cpf = Column(String, nullable=True)
     cnpj = Column(String, nullable=True)
+    version = Column(Integer, nullable=False)
     
     sent_transactions = relationship("Transaction", foreign_keys="Transaction.sender_id", back_populates="sender")
     received_transactions = relationship("Transaction", foreign_keys="Transaction.recipient_id", back_populates="recipient")
+    
+    # Every ORM UPDATE checks and bumps version (compare-and-swap), raising
+    # StaleDataError when another transaction changed the row first.
+    __mapper_args__ = {"version_id_col": version}
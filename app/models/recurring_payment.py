@@ -0,0 +1,36 @@
+from sqlalchemy import Column, BigInteger, Integer, String, Boolean, DateTime, ForeignKey, Index, text
+from app.models.base import BaseModel
+
+RECURRING_PAYMENT_ACTIVE = 1
+RECURRING_PAYMENT_FINISHED = 2
+RECURRING_PAYMENT_CANCELLED = 3
+
+RECURRENCE_DAILY = 1
+RECURRENCE_WEEKLY = 2
+RECURRENCE_MONTHLY = 3
+
+class RecurringPayment(BaseModel):
+    __tablename__ = "recurring_payment"
+    __table_args__ = (
+        # The scheduler only ever asks "which active schedules are due?", so
+        # the index holds active rows keyed by their precomputed next run.
+        Index(
+            "ix_recurring_payment_due",
+            "next_run_at",
+            postgresql_where=text(f"status = {RECURRING_PAYMENT_ACTIVE}"),
+            sqlite_where=text(f"status = {RECURRING_PAYMENT_ACTIVE}")
+        ),
+    )
+
+    sender_id = Column(Integer, ForeignKey("person.id"), nullable=False, index=True)
+    recipient_id = Column(Integer, ForeignKey("person.id"), nullable=False)
+    amount = Column(BigInteger, nullable=False)  # stored in cents
+    interval = Column(Integer, nullable=False)
+    start_at = Column(DateTime, nullable=False)
+    end_at = Column(DateTime, nullable=True)
+    catch_up = Column(Boolean, nullable=False, default=True)
+    next_run_at = Column(DateTime, nullable=False)
+    status = Column(Integer, nullable=False, default=RECURRING_PAYMENT_ACTIVE)
+    last_run_at = Column(DateTime, nullable=True)
+    last_transaction_id = Column(Integer, nullable=True)  # no FK, see Transaction
+    last_error_code = Column(String(64), nullable=True)
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, Float, DateTime
+from app.models.base import BaseModel
+
+class RecurringPaymentRun(BaseModel):
+    """Metrics of one scheduler run over the due recurring payments"""
+    __tablename__ = "recurring_payment_run"
+
+    started_at = Column(DateTime, nullable=False)
+    finished_at = Column(DateTime, nullable=False)
+    batches = Column(Integer, nullable=False, default=0)
+    executed = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    skipped = Column(Integer, nullable=False, default=0)
+    retried = Column(Integer, nullable=False, default=0)
+    finished = Column(Integer, nullable=False, default=0)
+    max_lag_seconds = Column(Float, nullable=False, default=0)
@@ -0,0 +1,29 @@
+from sqlalchemy import Column, BigInteger, Integer, String, DateTime, ForeignKey, Index, text
+from app.models.base import BaseModel
+
+SCHEDULED_TRANSFER_PENDING = 1
+SCHEDULED_TRANSFER_EXECUTED = 2
+SCHEDULED_TRANSFER_FAILED = 3
+SCHEDULED_TRANSFER_CANCELLED = 4
+
+class ScheduledTransfer(BaseModel):
+    __tablename__ = "scheduled_transfer"
+    __table_args__ = (
+        # Only pending rows are ever polled, so the executor's index stays
+        # as small as the backlog of due transfers.
+        Index(
+            "ix_scheduled_transfer_due",
+            "execute_at",
+            postgresql_where=text(f"status = {SCHEDULED_TRANSFER_PENDING}"),
+            sqlite_where=text(f"status = {SCHEDULED_TRANSFER_PENDING}")
+        ),
+    )
+
+    sender_id = Column(Integer, ForeignKey("person.id"), nullable=False, index=True)
+    recipient_id = Column(Integer, ForeignKey("person.id"), nullable=False)
+    amount = Column(BigInteger, nullable=False)  # stored in cents
+    execute_at = Column(DateTime, nullable=False)
+    status = Column(Integer, nullable=False, default=SCHEDULED_TRANSFER_PENDING)
+    transaction_id = Column(Integer, nullable=True)  # no FK, see Transaction
+    error_code = Column(String(64), nullable=True)
+    executed_at = Column(DateTime, nullable=True)
@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Float, Integer, ForeignKey
+from sqlalchemy import Column, BigInteger, Integer, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 from app.models.base import BaseModel
 
 TYPE_TRANSACTION_DEPOSIT = 1
@@ -7,12 +8,27 @@ TYPE_TRANSACTION_WITHDRAW = 2
 TYPE_TRANSACTION_TRANSFER = 3
 
 class Transaction(BaseModel):
+    """One money movement.
+
+    On PostgreSQL the table is range-partitioned by month of ``created_at``
+    (see TransactionPartitionService), so the primary key there is
+    ``(id, created_at)`` and other tables keep transaction ids without a
+    foreign key. Queries should bound ``created_at`` whenever they can, so
+    the planner only visits the matching partitions.
+    """
     __tablename__ = "transaction"
+    __table_args__ = (
+        # History reads each side of a user's transactions as an index range
+        # already in (created_at, id) order; see TransactionRepository.
+        Index("ix_transaction_sender_created", "sender_id", "created_at", "id"),
+        Index("ix_transaction_recipient_created", "recipient_id", "created_at", "id"),
+    )
 
-    amount = Column(Float, nullable=False)
+    amount = Column(BigInteger, nullable=False)  # stored in cents
     transaction_type = Column(Integer, nullable=False)
     sender_id = Column(Integer, ForeignKey("person.id"), nullable=False)
     recipient_id = Column(Integer, ForeignKey("person.id"), nullable=True)
+    created_at = Column(DateTime, nullable=False, default=func.now())  # partition key
     
     sender = relationship("Person", foreign_keys=[sender_id], back_populates="sent_transactions")
     recipient = relationship("Person", foreign_keys=[recipient_id], back_populates="received_transactions")
@@ -0,0 +1,44 @@
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+from app.models.balance_checkpoint import BalanceCheckpoint
+from app.repositories.base_repository import BaseRepository
+
+class BalanceCheckpointRepository(BaseRepository[BalanceCheckpoint]):
+    def __init__(self, db: Session):
+        super().__init__(db, BalanceCheckpoint)
+
+    def get_last_transaction_id(self) -> int:
+        return self.db.query(func.coalesce(func.max(BalanceCheckpoint.transaction_id), 0)).scalar()
+    
+    def get_latest(self, account_id: int, at: Optional[datetime] = None) -> Optional[BalanceCheckpoint]:
+        query = self.db.query(BalanceCheckpoint).filter(BalanceCheckpoint.account_id == account_id)
+        if at is not None:
+            query = query.filter(BalanceCheckpoint.as_of <= at)
+        return query.order_by(BalanceCheckpoint.transaction_id.desc()).first()
+    
+    def get_latest_balances(self, account_ids: Iterable[int]) -> Dict[int, int]:
+        account_ids = list(account_ids)
+        if not account_ids:
+            return {}
+        latest = self.db.query(
+            BalanceCheckpoint.account_id,
+            func.max(BalanceCheckpoint.transaction_id).label("transaction_id")
+        ).filter(
+            BalanceCheckpoint.account_id.in_(account_ids)
+        ).group_by(BalanceCheckpoint.account_id).subquery()
+        
+        return dict(
+            self.db.query(BalanceCheckpoint.account_id, BalanceCheckpoint.balance)
+            .join(
+                latest,
+                (BalanceCheckpoint.account_id == latest.c.account_id)
+                & (BalanceCheckpoint.transaction_id == latest.c.transaction_id)
+            )
+            .all()
+        )
+    
+    def create_checkpoints(self, rows: List[Dict[str, Any]]) -> None:
+        if rows:
+            self.db.execute(insert(BalanceCheckpoint), rows)
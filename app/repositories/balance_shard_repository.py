@@ -0,0 +1,104 @@
+import random
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+from typing import List
+from app.models.balance_shard import BalanceShard
+from app.models.person import Person
+from app.repositories.base_repository import BaseRepository
+
+class BalanceShardRepository(BaseRepository[BalanceShard]):
+    def __init__(self, db: Session):
+        super().__init__(db, BalanceShard)
+
+    def get_shards(self, person_id: int) -> List[BalanceShard]:
+        return self.db.query(BalanceShard).filter(
+            BalanceShard.person_id == person_id
+        ).order_by(BalanceShard.shard_index).all()
+    
+    def get_total(self, person_id: int) -> int:
+        return self.db.query(func.coalesce(func.sum(BalanceShard.balance), 0)).filter(
+            BalanceShard.person_id == person_id
+        ).scalar()
+    
+    def get_available_balance(self, person: Person) -> int:
+        """Main balance plus whatever is still parked in the person's shards"""
+        if not person.balance_shards:
+            return person.balance
+        return person.balance + self.get_total(person.id)
+    
+    def resize(self, person_id: int, count: int) -> int:
+        """Empty every shard and keep exactly ``count`` of them, returning the amount removed.
+
+        All shard rows are locked first, so credits in flight finish before
+        and are included, or run after and either find their shard still in
+        place or find it gone.
+        """
+        shards = self.db.query(BalanceShard).filter(
+            BalanceShard.person_id == person_id
+        ).with_for_update().all()
+        
+        removed = 0
+        existing = set()
+        for shard in shards:
+            removed += shard.balance
+            if shard.shard_index < count:
+                shard.balance = 0
+                existing.add(shard.shard_index)
+            else:
+                self.db.delete(shard)
+        for shard_index in range(count):
+            if shard_index not in existing:
+                self.db.add(BalanceShard(person_id=person_id, shard_index=shard_index, balance=0))
+        self.db.flush()
+        return removed
+    
+    def credit(self, person_id: int, amount: int, shard_count: int) -> None:
+        """Add to one random shard with a single atomic UPDATE, leaving the person row untouched.
+
+        ``shard_count`` was read without a lock; if the account was resharded
+        since and the shard is gone, StaleDataError sends the caller back to
+        retry from a fresh read.
+        """
+        result = self.db.execute(
+            update(BalanceShard)
+            .where(
+                BalanceShard.person_id == person_id,
+                BalanceShard.shard_index == random.randrange(shard_count)
+            )
+            .values(balance=BalanceShard.balance + amount)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != 1:
+            raise StaleDataError(f"Balance shard of person {person_id} no longer exists")
+    
+    def drain(self, person_id: int, amount: int) -> int:
+        """Take up to ``amount`` out of the shards, fullest first, returning what was taken"""
+        shards = self.db.query(BalanceShard).filter(
+            BalanceShard.person_id == person_id,
+            BalanceShard.balance > 0
+        ).order_by(BalanceShard.balance.desc()).with_for_update().all()
+        
+        drained = 0
+        for shard in shards:
+            if drained >= amount:
+                break
+            taken = min(shard.balance, amount - drained)
+            shard.balance -= taken
+            drained += taken
+        self.db.flush()
+        return drained
+    
+    def sweep(self, person_id: int) -> int:
+        """Zero every shard not locked by an in-flight credit, returning the amount removed"""
+        shards = self.db.query(BalanceShard).filter(
+            BalanceShard.person_id == person_id,
+            BalanceShard.balance != 0
+        ).with_for_update(skip_locked=True).all()
+        
+        swept = 0
+        for shard in shards:
+            swept += shard.balance
+            shard.balance = 0
+        self.db.flush()
+        return swept
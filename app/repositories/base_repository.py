@@ -1,7 +1,8 @@
 from sqlalchemy.orm import Session
-from typing import TypeVar, Generic, Type, List, Optional, Any, Dict, Union
+from typing import TypeVar, Generic, Type, List, Optional, Any, Dict, Tuple, Union
 from app.models.base import BaseModel
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 import logging
 
 T = TypeVar('T', bound=BaseModel)
@@ -35,6 +36,13 @@ class BaseRepository(Generic[T]):
             logger.error(f"Error creating {self.model.__name__}: {e}")
             raise
     
+    def add(self, **kwargs) -> T:
+        """Add a new entity to the current transaction without committing"""
+        entity = self.model(**kwargs)
+        self.db.add(entity)
+        self.db.flush()
+        return entity
+    
     def update(self, entity_id: int, **kwargs) -> Optional[T]:
         """Update an entity by its ID"""
         try:
@@ -77,11 +85,70 @@ class BaseRepository(Generic[T]):
         """Count all entities"""
         return self.db.query(self.model).count()
     
+    def increment_or_create(
+        self,
+        key_columns: List[str],
+        rows: List[Tuple[Dict[str, Any], Dict[str, int], Dict[str, Any]]]
+    ) -> None:
+        """Add counters to existing rows, inserting the ones that do not exist yet, without committing.
+
+        Each row is ``(key, increments, new_row)``: ``increments`` are added
+        to the row matching ``key``, or ``key`` plus ``new_row`` is inserted
+        when there is none. Every row must increment the same columns. An
+        insert that loses a race with another transaction falls back to the
+        update. Rows are taken in key order so concurrent writers lock them
+        in the same order.
+        """
+        if not rows:
+            return
+        table = self.model.__table__
+        def key_of(row):
+            return tuple(row[0][column] for column in key_columns)
+        
+        rows = sorted(rows, key=key_of)
+        existing = set(self.db.execute(
+            select(*(table.c[column] for column in key_columns)).where(*(
+                table.c[column].in_({row[0][column] for row in rows}) for column in key_columns
+            ))
+        ).all())
+        self._increment(key_columns, [row for row in rows if key_of(row) in existing])
+        
+        for row in rows:
+            if key_of(row) in existing:
+                continue
+            key, _, new_row = row
+            try:
+                with self.db.begin_nested():
+                    self.db.execute(insert(table).values(**key, **new_row))
+            except IntegrityError:
+                self._increment(key_columns, [row])
+    
+    def _increment(self, key_columns: List[str], rows: List[Tuple[Dict[str, Any], Dict[str, int], Dict[str, Any]]]) -> None:
+        if not rows:
+            return
+        table = self.model.__table__
+        statement = update(table).where(
+            *(table.c[column] == bindparam(f"key_{column}") for column in key_columns)
+        ).values({
+            column: table.c[column] + bindparam(f"add_{column}") for column in rows[0][1]
+        })
+        self.db.connection().execute(statement, [
+            {
+                **{f"key_{column}": value for column, value in key.items()},
+                **{f"add_{column}": value for column, value in increments.items()}
+            }
+            for key, increments, _ in rows
+        ])
+    
     # Transaction management methods
     def begin_transaction(self) -> None:
         """Begin a nested transaction (savepoint)"""
         self.db.begin_nested()
     
+    def flush(self) -> None:
+        """Flush pending changes to the current transaction"""
+        self.db.flush()
+    
     def commit(self) -> None:
         """Commit the current transaction"""
         self.db.commit()
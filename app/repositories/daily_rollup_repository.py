@@ -0,0 +1,69 @@
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+from datetime import date
+from typing import Any, Dict, List, Tuple
+from app.models.daily_rollup import DailyRollup, DailyCounterpartyRollup
+from app.repositories.base_repository import BaseRepository
+
+ROLLUP_COLUMNS = ["deposits", "withdrawals", "transfers_in", "transfers_out", "count_in", "count_out"]
+COUNTERPARTY_COLUMNS = ["amount_in", "amount_out", "transaction_count"]
+
+class DailyRollupRepository(BaseRepository[DailyRollup]):
+    def __init__(self, db: Session):
+        super().__init__(db, DailyRollup)
+
+    def add_movements(self, day: date, movements: Dict[int, Dict[str, int]]) -> None:
+        """Add each account's ROLLUP_COLUMNS increments to its row of ``day``"""
+        self.increment_or_create(["account_id", "day"], [
+            ({"account_id": account_id, "day": day}, movement, movement)
+            for account_id, movement in movements.items()
+        ])
+
+    def get_days(self, account_id: int, start: date, end: date) -> List[DailyRollup]:
+        """Rows of the days in [start, end]"""
+        return self.db.query(DailyRollup).filter(
+            DailyRollup.account_id == account_id,
+            DailyRollup.day >= start,
+            DailyRollup.day <= end
+        ).order_by(DailyRollup.day).all()
+
+    def replace_day(self, day: date, rows: List[Dict[str, Any]]) -> None:
+        self.db.query(DailyRollup).filter(DailyRollup.day == day).delete(synchronize_session=False)
+        if rows:
+            self.db.execute(insert(DailyRollup), [{**row, "day": day} for row in rows])
+
+
+class DailyCounterpartyRollupRepository(BaseRepository[DailyCounterpartyRollup]):
+    def __init__(self, db: Session):
+        super().__init__(db, DailyCounterpartyRollup)
+
+    def add_movements(self, day: date, movements: Dict[Tuple[int, int], Dict[str, int]]) -> None:
+        """Add each (account, counterparty) pair's COUNTERPARTY_COLUMNS increments to its row of ``day``"""
+        self.increment_or_create(["account_id", "day", "counterparty_id"], [
+            ({"account_id": account_id, "day": day, "counterparty_id": counterparty_id}, movement, movement)
+            for (account_id, counterparty_id), movement in movements.items()
+        ])
+
+    def get_top(self, account_id: int, start: date, end: date, limit: int) -> List[Tuple[int, int, int, int]]:
+        """``(counterparty_id, amount_in, amount_out, transaction_count)`` of the largest counterparties in [start, end]"""
+        amount_in = func.sum(DailyCounterpartyRollup.amount_in)
+        amount_out = func.sum(DailyCounterpartyRollup.amount_out)
+        return self.db.query(
+            DailyCounterpartyRollup.counterparty_id,
+            amount_in,
+            amount_out,
+            func.sum(DailyCounterpartyRollup.transaction_count)
+        ).filter(
+            DailyCounterpartyRollup.account_id == account_id,
+            DailyCounterpartyRollup.day >= start,
+            DailyCounterpartyRollup.day <= end
+        ).group_by(
+            DailyCounterpartyRollup.counterparty_id
+        ).order_by(
+            (amount_in + amount_out).desc(), DailyCounterpartyRollup.counterparty_id
+        ).limit(limit).all()
+
+    def replace_day(self, day: date, rows: List[Dict[str, Any]]) -> None:
+        self.db.query(DailyCounterpartyRollup).filter(DailyCounterpartyRollup.day == day).delete(synchronize_session=False)
+        if rows:
+            self.db.execute(insert(DailyCounterpartyRollup), [{**row, "day": day} for row in rows])
@@ -0,0 +1,39 @@
+from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Any, Dict, Optional
+from app.models.idempotency_key import IdempotencyKey
+from app.repositories.base_repository import BaseRepository
+
+class IdempotencyRepository(BaseRepository[IdempotencyKey]):
+    def __init__(self, db: Session):
+        super().__init__(db, IdempotencyKey)
+
+    def get_by_key(self, user_id: int, key: str) -> Optional[IdempotencyKey]:
+        return self.db.query(IdempotencyKey).filter(
+            IdempotencyKey.user_id == user_id,
+            IdempotencyKey.key == key
+        ).first()
+    
+    def create_record(self, user_id: int, key: str, request_hash: str, response: Dict[str, Any], expires_at: datetime):
+        return self.add(
+            user_id=user_id,
+            key=key,
+            request_hash=request_hash,
+            response=response,
+            expires_at=expires_at
+        )
+    
+    def delete_record(self, record: IdempotencyKey) -> None:
+        self.db.delete(record)
+        self.db.flush()
+    
+    def delete_expired(self, now: datetime, limit: int = 1000) -> int:
+        expired_ids = self.db.query(IdempotencyKey.id).filter(
+            IdempotencyKey.expires_at <= now
+        ).limit(limit).subquery()
+        
+        deleted = self.db.query(IdempotencyKey).filter(
+            IdempotencyKey.id.in_(expired_ids.select())
+        ).delete(synchronize_session=False)
+        self.db.commit()
+        return deleted
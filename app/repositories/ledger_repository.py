@@ -0,0 +1,75 @@
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+from typing import Any, Dict, Iterable, List, Optional
+from app.models.ledger_entry import LedgerEntry
+from app.repositories.base_repository import BaseRepository
+
+class LedgerRepository(BaseRepository[LedgerEntry]):
+    def __init__(self, db: Session):
+        super().__init__(db, LedgerEntry)
+
+    def post_entries(self, entries: List[Dict[str, Any]]) -> None:
+        """Append entries in one INSERT, numbering each account's entries after its last seq.
+
+        Entries with ``balance_after`` set must come from accounts whose row is
+        already locked by this transaction; the others are left pending. A
+        ``created_at`` in the entries is written as is.
+        """
+        sequenced = [entry for entry in entries if entry.get("balance_after") is not None]
+        next_seqs = self.get_next_seqs({entry["account_id"] for entry in sequenced})
+        rows = []
+        for entry in entries:
+            seq = None
+            if entry.get("balance_after") is not None:
+                seq = next_seqs[entry["account_id"]]
+                next_seqs[entry["account_id"]] += 1
+            rows.append({
+                "account_id": entry["account_id"],
+                "seq": seq,
+                "amount": entry["amount"],
+                "balance_after": entry.get("balance_after"),
+                "transaction_id": entry.get("transaction_id"),
+                "transaction_type": entry.get("transaction_type"),
+                "counterparty_id": entry.get("counterparty_id"),
+                **({"created_at": entry["created_at"]} if "created_at" in entry else {})
+            })
+        if rows:
+            self.db.execute(insert(LedgerEntry), rows)
+    
+    def get_next_seqs(self, account_ids: Iterable[int]) -> Dict[int, int]:
+        account_ids = list(account_ids)
+        if not account_ids:
+            return {}
+        last_seqs = dict(
+            self.db.query(LedgerEntry.account_id, func.max(LedgerEntry.seq))
+            .filter(LedgerEntry.account_id.in_(account_ids))
+            .group_by(LedgerEntry.account_id)
+            .all()
+        )
+        return {account_id: (last_seqs.get(account_id) or 0) + 1 for account_id in account_ids}
+    
+    def get_last_entry(self, account_id: int) -> Optional[LedgerEntry]:
+        return self.db.query(LedgerEntry).filter(
+            LedgerEntry.account_id == account_id,
+            LedgerEntry.seq.isnot(None)
+        ).order_by(LedgerEntry.seq.desc()).first()
+    
+    def sequence_pending(self, account_id: int) -> List[LedgerEntry]:
+        """Give pending entries of an account (locked by the caller) their seq and running balance, returning them"""
+        pending = self.db.query(LedgerEntry).filter(
+            LedgerEntry.account_id == account_id,
+            LedgerEntry.seq.is_(None)
+        ).order_by(LedgerEntry.id).all()
+        if not pending:
+            return pending
+        
+        last = self.get_last_entry(account_id)
+        seq = last.seq if last else 0
+        balance = last.balance_after if last else 0
+        for entry in pending:
+            seq += 1
+            balance += entry.amount
+            entry.seq = seq
+            entry.balance_after = balance
+        self.db.flush()
+        return pending
@@ -0,0 +1,57 @@
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from datetime import date
+from typing import Any, Dict, List, Optional
+from app.models.monthly_statement import MonthlyStatement
+from app.repositories.base_repository import BaseRepository
+
+TOTAL_COLUMNS = ["deposits", "withdrawals", "transfers_in", "transfers_out", "transaction_count"]
+
+class MonthlyStatementRepository(BaseRepository[MonthlyStatement]):
+    def __init__(self, db: Session):
+        super().__init__(db, MonthlyStatement)
+
+    def get_statement(self, account_id: int, month: date) -> Optional[MonthlyStatement]:
+        return self.db.query(MonthlyStatement).filter(
+            MonthlyStatement.account_id == account_id,
+            MonthlyStatement.month == month
+        ).first()
+
+    def get_latest_before(self, account_id: int, month: date) -> Optional[MonthlyStatement]:
+        return self.db.query(MonthlyStatement).filter(
+            MonthlyStatement.account_id == account_id,
+            MonthlyStatement.month < month
+        ).order_by(MonthlyStatement.month.desc()).first()
+
+    def get_closing_balances(self, month: date) -> Dict[int, int]:
+        return dict(
+            self.db.query(MonthlyStatement.account_id, MonthlyStatement.closing_balance)
+            .filter(MonthlyStatement.month == month)
+            .all()
+        )
+
+    def add_movements(self, month: date, movements: Dict[int, Dict[str, int]]) -> None:
+        """Add each account's totals to its row of ``month``, creating missing rows.
+
+        ``movements`` maps account ids to the TOTAL_COLUMNS increments plus
+        ``net`` (the signed balance change) and ``balance`` (the balance
+        right after them), used as closing balance of a new row.
+        """
+        self.increment_or_create(["account_id", "month"], [
+            (
+                {"account_id": account_id, "month": month},
+                {**{column: movement[column] for column in TOTAL_COLUMNS}, "closing_balance": movement["net"]},
+                {
+                    **{column: movement[column] for column in TOTAL_COLUMNS},
+                    "opening_balance": movement["balance"] - movement["net"],
+                    "closing_balance": movement["balance"]
+                }
+            )
+            for account_id, movement in movements.items()
+        ])
+
+    def replace_month(self, month: date, rows: List[Dict[str, Any]]) -> None:
+        """Swap every row of ``month`` for ``rows``"""
+        self.db.query(MonthlyStatement).filter(MonthlyStatement.month == month).delete(synchronize_session=False)
+        if rows:
+            self.db.execute(insert(MonthlyStatement), [{**row, "month": month} for row in rows])
@@ -0,0 +1,65 @@
+from sqlalchemy import insert, update, exists
+from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from app.models.outbox_event import OutboxEvent
+from app.models.outbox_partition import OutboxPartition
+from app.repositories.base_repository import BaseRepository
+
+class OutboxRepository(BaseRepository[OutboxEvent]):
+    def __init__(self, db: Session):
+        super().__init__(db, OutboxEvent)
+
+    def add_events(self, events: List[Dict[str, Any]], partitions: int) -> None:
+        """Insert events in one statement, routing each account to its partition"""
+        if not events:
+            return
+        self.db.execute(insert(OutboxEvent), [
+            {**event, "partition": event["account_id"] % partitions}
+            for event in events
+        ])
+    
+    def ensure_partitions(self, partitions: int) -> None:
+        existing = {partition_id for (partition_id,) in self.db.query(OutboxPartition.id)}
+        missing = [{"id": partition_id} for partition_id in range(partitions) if partition_id not in existing]
+        if missing:
+            self.db.execute(insert(OutboxPartition), missing)
+        self.db.commit()
+    
+    def claim_partition(self, partitions: int) -> Optional[int]:
+        """Lock the least recently served partition that has pending events, skipping locked ones"""
+        has_pending = exists().where(
+            OutboxEvent.partition == OutboxPartition.id,
+            OutboxEvent.dispatched_at.is_(None)
+        )
+        row = self.db.query(OutboxPartition.id).filter(
+            OutboxPartition.id < partitions,
+            has_pending
+        ).order_by(
+            OutboxPartition.last_dispatched_at.asc().nullsfirst(), OutboxPartition.id
+        ).limit(1).with_for_update(skip_locked=True).first()
+        return row[0] if row else None
+    
+    def get_pending(self, partition: int, limit: int) -> List[OutboxEvent]:
+        return self.db.query(OutboxEvent).filter(
+            OutboxEvent.partition == partition,
+            OutboxEvent.dispatched_at.is_(None)
+        ).order_by(OutboxEvent.id).limit(limit).all()
+    
+    def delete_events(self, event_ids: List[int]) -> None:
+        self.db.query(OutboxEvent).filter(
+            OutboxEvent.id.in_(event_ids)
+        ).delete(synchronize_session=False)
+    
+    def mark_dispatched(self, event_ids: List[int], now: datetime) -> None:
+        self.db.execute(
+            update(OutboxEvent).where(OutboxEvent.id.in_(event_ids)).values(dispatched_at=now)
+        )
+    
+    def touch_partition(self, partition: int, now: datetime) -> None:
+        self.db.execute(
+            update(OutboxPartition).where(OutboxPartition.id == partition).values(last_dispatched_at=now)
+        )
+    
+    def count_pending(self) -> int:
+        return self.db.query(OutboxEvent).filter(OutboxEvent.dispatched_at.is_(None)).count()
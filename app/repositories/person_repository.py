@@ -1,4 +1,6 @@
+from sqlalchemy import Row, update, case
 from sqlalchemy.orm import Session
+from typing import Dict, Iterable, List
 from app.models.person import Person, TYPE_LEGAL_PERSON, TYPE_NATURAL_PERSON
 from app.core.security import get_password_hash
 from datetime import datetime, timezone
@@ -14,6 +16,26 @@ class PersonRepository(BaseRepository[Person]):
     def get_by_id(self, user_id: int):
         return self.db.query(Person).filter(Person.id == user_id).first()
     
+    def get_loaded(self, user_id: int):
+        """The person already loaded in this session (refreshed if expired), else a fresh read"""
+        return self.db.get(Person, user_id)
+    
+    def get_counterparties(self, user_ids: Iterable[int]) -> List[Row]:
+        """Only the columns other users may see, for many people in one query"""
+        return self.db.query(
+            Person.id, Person.name, Person.type, Person.cpf, Person.cnpj
+        ).filter(Person.id.in_(list(user_ids))).all()
+    
+    def get_for_update(self, user_id: int):
+        """Load the person row locked until the end of the transaction, with fresh values"""
+        return self.db.query(Person).filter(Person.id == user_id).with_for_update().populate_existing().first()
+    
+    def get_by_ids(self, user_ids: Iterable[int]) -> List[Person]:
+        return self.db.query(Person).filter(Person.id.in_(list(user_ids))).all()
+    
+    def get_sharded_accounts(self) -> List[Person]:
+        return self.db.query(Person).filter(Person.balance_shards > 0).all()
+    
     def get_natural_person_by_id(self, user_id: int):
         return self.db.query(Person).filter(Person.id == user_id, Person.type == TYPE_NATURAL_PERSON).first()
     
@@ -49,14 +71,28 @@ class PersonRepository(BaseRepository[Person]):
     def update_last_login(self, user_id: int):
         return self.update(user_id, last_login=datetime.now(timezone.utc))
     
-    def update_balance(self, user_id: int, amount: float):
+    def update_balance(self, user_id: int, amount: int):
         user = self.get_by_id(user_id)
         if user:
             user.balance += amount
-            self.db.commit()
-            self.db.refresh(user)
+            self.db.flush()
             return user
         return None
 
+    def credit_balances(self, amounts: Dict[int, int]) -> None:
+        """Add each amount to its person's balance with a single UPDATE.
+
+        Bulk updates bypass the ORM version check, so the version is bumped
+        here to invalidate concurrent optimistic readers of these rows.
+        """
+        if not amounts:
+            return
+        self.db.execute(
+            update(Person)
+            .where(Person.id.in_(list(amounts)))
+            .values(balance=Person.balance + case(amounts, value=Person.id), version=Person.version + 1)
+            .execution_options(synchronize_session="fetch")
+        )
+
     def get_profile_by_id(self, user_id: int):
         return self.get_by_id(user_id)
@@ -0,0 +1,61 @@
+from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import List, Optional
+from app.models.recurring_payment import RecurringPayment, RECURRING_PAYMENT_ACTIVE
+from app.models.recurring_payment_run import RecurringPaymentRun
+from app.repositories.base_repository import BaseRepository
+
+class RecurringPaymentRepository(BaseRepository[RecurringPayment]):
+    def __init__(self, db: Session):
+        super().__init__(db, RecurringPayment)
+
+    def create_recurring_payment(
+        self,
+        sender_id: int,
+        recipient_id: int,
+        amount: int,
+        interval: int,
+        start_at: datetime,
+        end_at: Optional[datetime],
+        catch_up: bool
+    ) -> RecurringPayment:
+        return self.add(
+            sender_id=sender_id,
+            recipient_id=recipient_id,
+            amount=amount,
+            interval=interval,
+            start_at=start_at,
+            end_at=end_at,
+            catch_up=catch_up,
+            next_run_at=start_at,
+            status=RECURRING_PAYMENT_ACTIVE
+        )
+    
+    def get_user_recurring_payments(self, user_id: int) -> List[RecurringPayment]:
+        return self.db.query(RecurringPayment).filter(
+            RecurringPayment.sender_id == user_id
+        ).order_by(RecurringPayment.id).all()
+    
+    def get_user_recurring_payment(self, recurring_id: int, user_id: int) -> Optional[RecurringPayment]:
+        return self.db.query(RecurringPayment).filter(
+            RecurringPayment.id == recurring_id,
+            RecurringPayment.sender_id == user_id
+        ).with_for_update().first()
+    
+    def claim_due(self, now: datetime, limit: int) -> List[RecurringPayment]:
+        """Lock up to ``limit`` due active schedules, skipping rows another scheduler holds"""
+        return self.db.query(RecurringPayment).filter(
+            RecurringPayment.status == RECURRING_PAYMENT_ACTIVE,
+            RecurringPayment.next_run_at <= now
+        ).order_by(
+            RecurringPayment.next_run_at, RecurringPayment.id
+        ).limit(limit).with_for_update(skip_locked=True).all()
+    
+    def add_run(self, **metrics) -> RecurringPaymentRun:
+        run = RecurringPaymentRun(**metrics)
+        self.db.add(run)
+        self.db.flush()
+        return run
+    
+    def get_last_runs(self, limit: int = 10) -> List[RecurringPaymentRun]:
+        return self.db.query(RecurringPaymentRun).order_by(RecurringPaymentRun.id.desc()).limit(limit).all()
@@ -0,0 +1,38 @@
+from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import List, Optional
+from app.models.scheduled_transfer import ScheduledTransfer, SCHEDULED_TRANSFER_PENDING
+from app.repositories.base_repository import BaseRepository
+
+class ScheduledTransferRepository(BaseRepository[ScheduledTransfer]):
+    def __init__(self, db: Session):
+        super().__init__(db, ScheduledTransfer)
+
+    def create_scheduled_transfer(self, sender_id: int, recipient_id: int, amount: int, execute_at: datetime) -> ScheduledTransfer:
+        return self.add(
+            sender_id=sender_id,
+            recipient_id=recipient_id,
+            amount=amount,
+            execute_at=execute_at,
+            status=SCHEDULED_TRANSFER_PENDING
+        )
+    
+    def get_user_scheduled_transfers(self, user_id: int) -> List[ScheduledTransfer]:
+        return self.db.query(ScheduledTransfer).filter(
+            ScheduledTransfer.sender_id == user_id
+        ).order_by(ScheduledTransfer.execute_at, ScheduledTransfer.id).all()
+    
+    def get_user_scheduled_transfer(self, scheduled_id: int, user_id: int) -> Optional[ScheduledTransfer]:
+        return self.db.query(ScheduledTransfer).filter(
+            ScheduledTransfer.id == scheduled_id,
+            ScheduledTransfer.sender_id == user_id
+        ).with_for_update().first()
+    
+    def claim_due(self, now: datetime, limit: int) -> List[ScheduledTransfer]:
+        """Lock up to ``limit`` due pending transfers, skipping rows another executor holds"""
+        return self.db.query(ScheduledTransfer).filter(
+            ScheduledTransfer.status == SCHEDULED_TRANSFER_PENDING,
+            ScheduledTransfer.execute_at <= now
+        ).order_by(
+            ScheduledTransfer.execute_at, ScheduledTransfer.id
+        ).limit(limit).with_for_update(skip_locked=True).all()
@@ -1,20 +1,309 @@
+from sqlalchemy import Row, Select, case, exists, false, func, insert, literal, select, text, tuple_, union_all
 from sqlalchemy.orm import Session
-from app.models.transaction import Transaction
+from collections import defaultdict
+from datetime import datetime
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple
+from app.models.transaction import Transaction, TYPE_TRANSACTION_DEPOSIT, TYPE_TRANSACTION_WITHDRAW, TYPE_TRANSACTION_TRANSFER
+from app.models.ledger_entry import LedgerEntry
 from app.repositories.base_repository import BaseRepository
 
+HISTORY_COLUMNS = (
+    Transaction.id,
+    Transaction.amount,
+    Transaction.created_at,
+    Transaction.transaction_type
+)
+# Sent side: deposits are the only incoming movement a user originates.
+SENT_COLUMNS = (
+    case((Transaction.transaction_type == TYPE_TRANSACTION_DEPOSIT, literal("in")), else_=literal("out")).label("direction"),
+    case(
+        (Transaction.transaction_type == TYPE_TRANSACTION_DEPOSIT, literal("deposit")),
+        (Transaction.transaction_type == TYPE_TRANSACTION_WITHDRAW, literal("withdraw")),
+        else_=literal("transfer_sent")
+    ).label("description_key"),
+    Transaction.recipient_id.label("counterparty_id")
+)
+RECEIVED_COLUMNS = (
+    literal("in").label("direction"),
+    literal("transfer_received").label("description_key"),
+    Transaction.sender_id.label("counterparty_id")
+)
+
+PERIOD_TOTALS = ("deposits", "withdrawals", "transfers_in", "transfers_out", "count_in", "count_out", "transaction_count")
+
 class TransactionRepository(BaseRepository[Transaction]):
     def __init__(self, db: Session):
         super().__init__(db, Transaction)
 
-    def create_transaction(self, amount: float, transaction_type: int, sender_id: int, recipient_id: int = None):
-        return self.create(
+    def create_transaction(
+        self,
+        amount: int,
+        transaction_type: int,
+        sender_id: int,
+        recipient_id: int = None,
+        created_at: Optional[datetime] = None
+    ):
+        values = {"created_at": created_at} if created_at is not None else {}
+        return self.add(
             amount=amount,
             transaction_type=transaction_type,
             sender_id=sender_id,
-            recipient_id=recipient_id
+            recipient_id=recipient_id,
+            **values
+        )
+    
+    def create_transactions(self, rows: List[Dict[str, Any]]) -> List[int]:
+        """Insert many transactions in one statement, returning ids in input order"""
+        result = self.db.execute(
+            insert(Transaction).returning(Transaction.id, sort_by_parameter_order=True),
+            rows
         )
+        return result.scalars().all()
+    
+    def get_user_transactions_page(
+        self,
+        user_id: int,
+        limit: int,
+        before: Optional[Tuple[datetime, int]] = None,
+        **filters
+    ) -> List[Row]:
+        """Newest-first history rows of a user, seeking past the ``(created_at, id)`` of the previous page.
+
+        ``filters`` are the keyword filters of ``_user_history``.
+        """
+        return self.db.execute(self._user_history(user_id, before, limit, **filters)).all()
+    
+    def stream_user_transactions(self, user_id: int, chunk_size: int, **filters) -> Iterator[Row]:
+        """Newest-first history rows fetched ``chunk_size`` at a time (server-side cursor on Postgres)"""
+        result = self.db.execute(self._user_history(user_id, **filters).execution_options(yield_per=chunk_size))
+        return iter(result)
+    
+    def _user_history(
+        self,
+        user_id: int,
+        before: Optional[Tuple[datetime, int]] = None,
+        limit: Optional[int] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        transaction_type: Optional[int] = None,
+        direction: Optional[str] = None,
+        min_amount: Optional[int] = None,
+        max_amount: Optional[int] = None
+    ) -> Select:
+        """UNION ALL of the sent and received sides instead of ``sender_id = x OR recipient_id = x``.
+
+        Each side is a backward range scan on its (user, created_at, id)
+        index, cut at ``limit``; the outer query merges the two ordered
+        streams and keeps the first ``limit`` rows. Self-transfers are
+        rejected, and the received side excludes them anyway so no row can
+        appear twice.
+
+        Filters are applied inside each side: the date range narrows the
+        index range, and ``transaction_type``/``direction`` drop a side
+        entirely when it cannot match (only transfers are ever received;
+        on the sent side only deposits are incoming).
+
+        Rows are plain tuples, not ORM objects: ``direction``, the
+        ``description_key`` of HISTORY_DESCRIPTIONS and the
+        ``counterparty_id`` are computed by each side in SQL.
+        """
+        common = []
+        if before is not None:
+            # The plain bound is redundant with the row comparison but lets
+            # PostgreSQL prune the monthly partitions newer than the cursor.
+            common.extend([
+                Transaction.created_at <= before[0],
+                tuple_(Transaction.created_at, Transaction.id) < tuple_(*before)
+            ])
+        if created_from is not None:
+            common.append(Transaction.created_at >= created_from)
+        if created_to is not None:
+            common.append(Transaction.created_at <= created_to)
+        if transaction_type is not None:
+            common.append(Transaction.transaction_type == transaction_type)
+        if min_amount is not None:
+            common.append(Transaction.amount >= min_amount)
+        if max_amount is not None:
+            common.append(Transaction.amount <= max_amount)
+        
+        sent = [Transaction.sender_id == user_id]
+        if direction == "in":
+            sent.append(Transaction.transaction_type == TYPE_TRANSACTION_DEPOSIT)
+        elif direction == "out":
+            sent.append(Transaction.transaction_type != TYPE_TRANSACTION_DEPOSIT)
+        conditions = []
+        if not (direction == "in" and transaction_type not in (None, TYPE_TRANSACTION_DEPOSIT)):
+            conditions.append((SENT_COLUMNS, sent))
+        if direction != "out" and transaction_type in (None, TYPE_TRANSACTION_TRANSFER):
+            conditions.append((RECEIVED_COLUMNS, [Transaction.recipient_id == user_id, Transaction.sender_id != user_id]))
+        if not conditions:
+            return select(*HISTORY_COLUMNS, *SENT_COLUMNS).where(false())
+        
+        sides = []
+        for columns, condition in conditions:
+            side = select(*HISTORY_COLUMNS, *columns).where(*condition, *common)
+            side = side.order_by(Transaction.created_at.desc(), Transaction.id.desc())
+            if limit is not None:
+                side = side.limit(limit)
+            # Wrapped so each side keeps its own ORDER BY/LIMIT on every dialect.
+            sides.append(select(side.subquery()))
+        
+        merged = (union_all(*sides) if len(sides) > 1 else sides[0]).subquery()
+        query = select(merged).order_by(merged.c.created_at.desc(), merged.c.id.desc())
+        if limit is not None:
+            query = query.limit(limit)
+        return query
+    
+    def get_latest_before(self, created_before: datetime) -> Optional[Tuple[int, datetime]]:
+        """Id and created_at of the newest transaction created before the given time"""
+        return self.db.query(Transaction.id, Transaction.created_at).filter(
+            Transaction.created_at < created_before
+        ).order_by(Transaction.id.desc()).first()
+    
+    def get_balance_deltas(
+        self,
+        after_id: int,
+        until_id: Optional[int] = None,
+        until: Optional[datetime] = None,
+        account_id: Optional[int] = None
+    ) -> Dict[int, int]:
+        """Net effect on each account of the transactions with id in (after_id, until_id]"""
+        filters = [Transaction.id > after_id]
+        if until_id is not None:
+            filters.append(Transaction.id <= until_id)
+        if until is not None:
+            filters.append(Transaction.created_at <= until)
+        
+        # The sender side covers deposits (+), withdrawals and outgoing
+        # transfers (-); incoming transfers are summed by recipient.
+        sent = self.db.query(
+            Transaction.sender_id,
+            func.sum(case(
+                (Transaction.transaction_type == TYPE_TRANSACTION_DEPOSIT, Transaction.amount),
+                else_=-Transaction.amount
+            ))
+        ).filter(*filters)
+        received = self.db.query(
+            Transaction.recipient_id,
+            func.sum(Transaction.amount)
+        ).filter(*filters, Transaction.recipient_id.isnot(None))
+        if account_id is not None:
+            sent = sent.filter(Transaction.sender_id == account_id)
+            received = received.filter(Transaction.recipient_id == account_id)
+        
+        deltas = defaultdict(int)
+        for query, column in ((sent, Transaction.sender_id), (received, Transaction.recipient_id)):
+            for account, amount in query.group_by(column).all():
+                deltas[account] += amount
+        return dict(deltas)
+    
+    def get_period_totals(self, start: datetime, end: datetime) -> Dict[int, Dict[str, int]]:
+        """Per-account totals (in cents) and movement counts of the transactions created in [start, end).
+
+        Credits still pending in the ledger are left out, like the rollups
+        do until the credits are sequenced.
+        """
+        period = [Transaction.created_at >= start, Transaction.created_at < end]
+        sent = self.db.query(
+            Transaction.sender_id,
+            Transaction.transaction_type,
+            func.sum(Transaction.amount),
+            func.count()
+        ).filter(*period, self._sequenced(Transaction.sender_id)).group_by(Transaction.sender_id, Transaction.transaction_type)
+        received = self.db.query(
+            Transaction.recipient_id,
+            func.sum(Transaction.amount),
+            func.count()
+        ).filter(
+            *period, Transaction.recipient_id.isnot(None), self._sequenced(Transaction.recipient_id)
+        ).group_by(Transaction.recipient_id)
+        
+        columns = {
+            TYPE_TRANSACTION_DEPOSIT: ("deposits", "count_in"),
+            TYPE_TRANSACTION_WITHDRAW: ("withdrawals", "count_out"),
+            TYPE_TRANSACTION_TRANSFER: ("transfers_out", "count_out")
+        }
+        totals = defaultdict(lambda: dict.fromkeys(PERIOD_TOTALS, 0))
+        for account_id, transaction_type, amount, count in sent.all():
+            column, count_column = columns[transaction_type]
+            totals[account_id][column] += amount
+            totals[account_id][count_column] += count
+            totals[account_id]["transaction_count"] += count
+        for account_id, amount, count in received.all():
+            totals[account_id]["transfers_in"] += amount
+            totals[account_id]["count_in"] += count
+            totals[account_id]["transaction_count"] += count
+        return dict(totals)
+    
+    def get_period_counterparty_totals(self, start: datetime, end: datetime) -> Dict[Tuple[int, int], Dict[str, int]]:
+        """Transfer totals (in cents) and counts per (account, counterparty) pair for [start, end), pending credits left out"""
+        def pairs(*criteria):
+            return self.db.query(
+                Transaction.sender_id,
+                Transaction.recipient_id,
+                func.sum(Transaction.amount),
+                func.count()
+            ).filter(
+                Transaction.created_at >= start,
+                Transaction.created_at < end,
+                Transaction.transaction_type == TYPE_TRANSACTION_TRANSFER,
+                *criteria
+            ).group_by(Transaction.sender_id, Transaction.recipient_id).all()
+        
+        totals = defaultdict(lambda: {"amount_in": 0, "amount_out": 0, "transaction_count": 0})
+        for sender_id, recipient_id, amount, count in pairs():
+            totals[(sender_id, recipient_id)]["amount_out"] += amount
+            totals[(sender_id, recipient_id)]["transaction_count"] += count
+        for sender_id, recipient_id, amount, count in pairs(self._sequenced(Transaction.recipient_id)):
+            totals[(recipient_id, sender_id)]["amount_in"] += amount
+            totals[(recipient_id, sender_id)]["transaction_count"] += count
+        return dict(totals)
+    
+    def _sequenced(self, account_id):
+        """The transaction's ledger entry on ``account_id`` is not pending"""
+        return ~exists().where(
+            LedgerEntry.transaction_id == Transaction.id,
+            LedgerEntry.account_id == account_id,
+            LedgerEntry.seq.is_(None)
+        )
+    
+    # Partition maintenance (PostgreSQL only), see TransactionPartitionService
+    
+    def is_partitioned(self) -> bool:
+        return bool(self.db.execute(text(
+            "SELECT count(*) FROM pg_partitioned_table pt "
+            "JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = 'transaction'"
+        )).scalar())
+    
+    def get_partitions(self, prefix: str) -> Dict[str, bool]:
+        """Tables named ``prefix*`` mapped to whether they are still attached to ``transaction``"""
+        rows = self.db.execute(text(
+            "SELECT c.relname, EXISTS ("
+            "  SELECT 1 FROM pg_inherits i JOIN pg_class p ON p.oid = i.inhparent"
+            "  WHERE i.inhrelid = c.oid AND p.relname = 'transaction'"
+            ") FROM pg_class c WHERE c.relkind IN ('r', 'p') AND c.relname LIKE :prefix"
+        ), {"prefix": prefix.replace("_", "\\_") + "%"})
+        return dict(rows.all())
+    
+    def create_partition(self, name: str, start: datetime, end: datetime) -> None:
+        self.db.execute(text(
+            f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "transaction" '
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        ))
+    
+    def get_partition_max_id(self, name: str) -> Optional[int]:
+        return self.db.execute(text(f'SELECT max(id) FROM "{name}"')).scalar()
+    
+    def detach_partition(self, name: str) -> None:
+        self.db.execute(text(f'ALTER TABLE "transaction" DETACH PARTITION "{name}"'))
+    
+    def copy_partition(self, name: str, file: IO[str]) -> None:
+        """Write a (detached) partition to ``file`` as CSV with a header"""
+        cursor = self.db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(f'COPY "{name}" TO STDOUT WITH (FORMAT csv, HEADER)', file)
+        finally:
+            cursor.close()
     
-    def get_user_transactions(self, user_id: int):
-        return self.db.query(Transaction).filter(
-            (Transaction.sender_id == user_id) | (Transaction.recipient_id == user_id)
-        ).all()
+    def drop_partition(self, name: str) -> None:
+        self.db.execute(text(f'DROP TABLE "{name}"'))
@@ -1,16 +1,118 @@
-from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional
-from datetime import datetime
+from pydantic import BaseModel, Field, ConfigDict, field_validator, model_validator
+from typing import Optional, List, Literal
+from datetime import datetime, timezone
+from app.core import config
+from app.core.clock import utcnow
+from app.core.money import to_cents
 
-class TransferRequest(BaseModel):
+BATCH_MODE_ALL_OR_NOTHING = "all_or_nothing"
+BATCH_MODE_BEST_EFFORT = "best_effort"
+
+def _to_naive_utc(v: datetime) -> datetime:
+    if v.tzinfo is not None:
+        v = v.astimezone(timezone.utc).replace(tzinfo=None)
+    return v
+
+class AmountRequest(BaseModel):
+    amount: int = Field(..., gt=0, description="Valor em reais, armazenado em centavos")
+
+    @field_validator('amount', mode='before')
+    @classmethod
+    def parse_amount(cls, v):
+        return to_cents(v)
+
+class TransferRequest(AmountRequest):
     recipient_id: int = Field(..., gt=0, description="ID do destinatário da transferência")
-    amount: float = Field(..., gt=0, description="Valor da transferência")
+    amount: int = Field(..., gt=0, description="Valor da transferência")
+
+class ScheduledTransferRequest(TransferRequest):
+    execute_at: datetime = Field(..., description="Data e hora (ISO 8601) em que a transferência deve ser executada")
+
+    @field_validator('execute_at')
+    @classmethod
+    def validate_execute_at(cls, v):
+        v = _to_naive_utc(v)
+        if v <= utcnow():
+            raise ValueError('A data de execução deve estar no futuro')
+        return v
+
+class RecurringPaymentRequest(TransferRequest):
+    interval: Literal["daily", "weekly", "monthly"] = Field(..., description="Periodicidade do pagamento")
+    start_at: datetime = Field(..., description="Data e hora (ISO 8601) da primeira execução")
+    end_at: Optional[datetime] = Field(None, description="Data e hora (ISO 8601) após a qual o pagamento é encerrado")
+    catch_up: bool = Field(
+        True,
+        description="Após uma indisponibilidade, executa todas as ocorrências perdidas (true) ou apenas uma (false)"
+    )
+
+    @field_validator('start_at')
+    @classmethod
+    def validate_start_at(cls, v):
+        v = _to_naive_utc(v)
+        if v <= utcnow():
+            raise ValueError('A data da primeira execução deve estar no futuro')
+        return v
+
+    @field_validator('end_at')
+    @classmethod
+    def validate_end_at(cls, v, info):
+        if v is None:
+            return v
+        v = _to_naive_utc(v)
+        start_at = info.data.get('start_at')
+        if start_at is not None and v < start_at:
+            raise ValueError('A data de encerramento deve ser posterior à primeira execução')
+        return v
+
+class BatchTransferItem(AmountRequest):
+    recipient_id: int = Field(..., gt=0, description="ID do destinatário")
+    amount: int = Field(..., gt=0, description="Valor a transferir para o destinatário")
+
+class BatchTransferRequest(BaseModel):
+    items: List[BatchTransferItem] = Field(
+        ...,
+        min_length=1,
+        max_length=config.BATCH_TRANSFER_MAX_ITEMS,
+        description="Destinatários e valores do lote"
+    )
+    mode: Literal["all_or_nothing", "best_effort"] = Field(
+        BATCH_MODE_ALL_OR_NOTHING,
+        description="all_or_nothing rejeita o lote inteiro se algum item falhar; best_effort processa os itens válidos"
+    )
+
+class DepositRequest(AmountRequest):
+    amount: int = Field(..., gt=0, description="Valor do depósito")
+
+class WithdrawRequest(AmountRequest):
+    amount: int = Field(..., gt=0, description="Valor do saque")
+
+class HistoryFilters(BaseModel):
+    created_from: Optional[datetime] = Field(None, alias="from", description="Data e hora (ISO 8601) inicial, inclusiva")
+    created_to: Optional[datetime] = Field(None, alias="to", description="Data e hora (ISO 8601) final, inclusiva")
+    type: Optional[Literal["deposit", "withdraw", "transfer"]] = Field(None, description="Tipo da transação")
+    direction: Optional[Literal["in", "out"]] = Field(None, description="Entradas (in) ou saídas (out)")
+    min_amount: Optional[int] = Field(None, ge=0, description="Valor mínimo em reais, inclusivo")
+    max_amount: Optional[int] = Field(None, ge=0, description="Valor máximo em reais, inclusivo")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    @field_validator('created_from', 'created_to')
+    @classmethod
+    def normalize_dates(cls, v):
+        return _to_naive_utc(v) if v is not None else v
 
-class DepositRequest(BaseModel):
-    amount: float = Field(..., gt=0, description="Valor do depósito")
+    @field_validator('min_amount', 'max_amount', mode='before')
+    @classmethod
+    def parse_amounts(cls, v):
+        return to_cents(v) if v is not None else v
 
-class WithdrawRequest(BaseModel):
-    amount: float = Field(..., gt=0, description="Valor do saque")
+    @model_validator(mode='after')
+    def validate_ranges(self):
+        if self.created_from and self.created_to and self.created_from > self.created_to:
+            raise ValueError('A data inicial deve ser anterior à data final')
+        if self.min_amount is not None and self.max_amount is not None and self.min_amount > self.max_amount:
+            raise ValueError('O valor mínimo deve ser menor ou igual ao valor máximo')
+        return self
 
 class TransactionResponse(BaseModel):
     id: int
@@ -0,0 +1,180 @@
+from datetime import date, datetime, timedelta
+from sqlalchemy.orm import Session
+from typing import Any, Dict, Iterable, Optional, Tuple
+from app.core import config
+from app.core.clock import utcnow
+from app.core.money import from_cents
+from app.core.response_handler import ResponseHandler
+from app.core.exceptions import AppException, ValidationException, DatabaseException
+from app.models.transaction import TYPE_TRANSACTION_DEPOSIT, TYPE_TRANSACTION_WITHDRAW
+from app.repositories.daily_rollup_repository import (
+    DailyRollupRepository,
+    DailyCounterpartyRollupRepository,
+    ROLLUP_COLUMNS,
+    COUNTERPARTY_COLUMNS
+)
+from app.repositories.transaction_repository import TransactionRepository
+
+GRANULARITY_DAY = "day"
+GRANULARITY_WEEK = "week"
+
+
+class AnalyticsService:
+    """Spending analytics read from the daily rollup tables.
+
+    ``record_entries`` runs in the transaction of every movement (see
+    TransactionService._post_entries), so a dashboard reads at most one
+    row per day plus the counterparty rows of the period, never the
+    transaction table. Credits to sharded accounts are caught up when
+    BalanceShardService sequences them, so they never queue on these rows. ``rebuild_days`` recomputes finished days from the
+    transaction table, for backfills and to repair drift.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.rollup_repository = DailyRollupRepository(db)
+        self.counterparty_repository = DailyCounterpartyRollupRepository(db)
+        self.transaction_repository = TransactionRepository(db)
+        self.response = ResponseHandler()
+
+    def get_analytics(
+        self,
+        user_id: int,
+        granularity: str = GRANULARITY_DAY,
+        start: Optional[date] = None,
+        end: Optional[date] = None
+    ) -> Dict[str, Any]:
+        try:
+            end = end or utcnow().date()
+            start = start or end - timedelta(days=config.ANALYTICS_DEFAULT_DAYS - 1)
+            if start > end or (end - start).days >= config.ANALYTICS_MAX_DAYS:
+                raise ValidationException(
+                    message=f"Período inválido: 'from' deve ser anterior a 'to' e cobrir no máximo {config.ANALYTICS_MAX_DAYS} dias",
+                    error_code="INVALID_PERIOD"
+                )
+
+            rows = {row.day: row for row in self.rollup_repository.get_days(user_id, start, end)}
+            buckets: Dict[date, Dict[str, int]] = {}
+            day = start
+            while day <= end:
+                bucket = day - timedelta(days=day.weekday()) if granularity == GRANULARITY_WEEK else day
+                totals = buckets.setdefault(bucket, dict.fromkeys(ROLLUP_COLUMNS, 0))
+                row = rows.get(day)
+                if row is not None:
+                    for column in ROLLUP_COLUMNS:
+                        totals[column] += getattr(row, column)
+                day += timedelta(days=1)
+
+            overall = dict.fromkeys(ROLLUP_COLUMNS, 0)
+            for totals in buckets.values():
+                for column in ROLLUP_COLUMNS:
+                    overall[column] += totals[column]
+
+            top = self.counterparty_repository.get_top(user_id, start, end, config.ANALYTICS_TOP_COUNTERPARTIES)
+            return self.response.success(
+                data={
+                    "from": start,
+                    "to": end,
+                    "granularity": granularity,
+                    "series": [
+                        {"period": bucket, **self._format_totals(totals)}
+                        for bucket, totals in buckets.items()
+                    ],
+                    "totals": self._format_totals(overall),
+                    "average_ticket": {
+                        "in": self._average(overall["deposits"] + overall["transfers_in"], overall["count_in"]),
+                        "out": self._average(overall["withdrawals"] + overall["transfers_out"], overall["count_out"])
+                    },
+                    "top_counterparties": [
+                        {
+                            "counterparty_id": counterparty_id,
+                            "total_in": from_cents(amount_in),
+                            "total_out": from_cents(amount_out),
+                            "transaction_count": count
+                        }
+                        for counterparty_id, amount_in, amount_out, count in top
+                    ]
+                },
+                message="Análise de gastos recuperada com sucesso"
+            )
+        except AppException:
+            raise
+        except Exception as e:
+            raise DatabaseException(message=f"Erro ao recuperar análise de gastos: {str(e)}")
+
+    def record_entries(self, entries: Iterable[Dict[str, Any]]) -> None:
+        """Add sequenced ledger entries to the rollups of the day of their ``created_at``, without committing; pending ones are skipped"""
+        movements: Dict[Tuple[date, int], Dict[str, int]] = {}
+        counterparties: Dict[Tuple[date, int, int], Dict[str, int]] = {}
+        for entry in entries:
+            if entry.get("balance_after") is None:
+                continue
+            day = entry["created_at"].date()
+            movement = movements.setdefault((day, entry["account_id"]), dict.fromkeys(ROLLUP_COLUMNS, 0))
+            amount = entry["amount"]
+            if entry["transaction_type"] == TYPE_TRANSACTION_DEPOSIT:
+                movement["deposits"] += amount
+            elif entry["transaction_type"] == TYPE_TRANSACTION_WITHDRAW:
+                movement["withdrawals"] -= amount
+            elif amount > 0:
+                movement["transfers_in"] += amount
+            else:
+                movement["transfers_out"] -= amount
+            movement["count_in" if amount > 0 else "count_out"] += 1
+
+            if entry.get("counterparty_id") is not None:
+                pair = counterparties.setdefault(
+                    (day, entry["account_id"], entry["counterparty_id"]), dict.fromkeys(COUNTERPARTY_COLUMNS, 0)
+                )
+                pair["amount_in" if amount > 0 else "amount_out"] += abs(amount)
+                pair["transaction_count"] += 1
+
+        for day in sorted({day for day, _ in movements}):
+            self.rollup_repository.add_movements(day, {
+                account_id: movement for (movement_day, account_id), movement in movements.items() if movement_day == day
+            })
+            self.counterparty_repository.add_movements(day, {
+                (account_id, counterparty_id): pair
+                for (pair_day, account_id, counterparty_id), pair in counterparties.items() if pair_day == day
+            })
+
+    def rebuild_days(self, start: date, end: date, now: Optional[datetime] = None) -> int:
+        """Recompute the rollups of the finished days in [start, end] from the transaction table, returning how many days"""
+        if end >= (now or utcnow()).date():
+            raise ValidationException(message="Só é possível recalcular dias já encerrados", error_code="DAY_NOT_FINISHED")
+
+        day = start
+        while day <= end:
+            day_start = datetime.combine(day, datetime.min.time())
+            day_end = day_start + timedelta(days=1)
+            try:
+                totals = self.transaction_repository.get_period_totals(day_start, day_end)
+                pairs = self.transaction_repository.get_period_counterparty_totals(day_start, day_end)
+                self.rollup_repository.replace_day(day, [
+                    {"account_id": account_id, **{column: row[column] for column in ROLLUP_COLUMNS}}
+                    for account_id, row in totals.items()
+                ])
+                self.counterparty_repository.replace_day(day, [
+                    {"account_id": account_id, "counterparty_id": counterparty_id, **row}
+                    for (account_id, counterparty_id), row in pairs.items()
+                ])
+                self.rollup_repository.commit()
+            except Exception:
+                self.rollup_repository.rollback()
+                raise
+            day += timedelta(days=1)
+        return (end - start).days + 1 if end >= start else 0
+
+    def _format_totals(self, totals: Dict[str, int]) -> Dict[str, Any]:
+        return {
+            "deposits": from_cents(totals["deposits"]),
+            "withdrawals": from_cents(totals["withdrawals"]),
+            "transfers_in": from_cents(totals["transfers_in"]),
+            "transfers_out": from_cents(totals["transfers_out"]),
+            "total_in": from_cents(totals["deposits"] + totals["transfers_in"]),
+            "total_out": from_cents(totals["withdrawals"] + totals["transfers_out"]),
+            "transaction_count": totals["count_in"] + totals["count_out"]
+        }
+
+    def _average(self, total: int, count: int) -> Optional[float]:
+        return from_cents(round(total / count)) if count else None
@@ -5,6 +5,7 @@ from app.core.security import verify_password, create_access_token
 from app.schemas.person import NaturalPersonCreate, LegalPersonCreate, LoginRequest, PersonCreate
 from datetime import timedelta
 from app.core import config
+from app.core.retry import retry_on_conflict
 from app.models.person import Person, TYPE_NATURAL_PERSON, TYPE_LEGAL_PERSON
 from app.core.response_handler import ResponseHandler
 from app.core.exceptions import (
@@ -19,6 +20,7 @@ from typing import Dict, Any, Tuple
 
 class AuthService:
     def __init__(self, db: Session):
+        self.db = db
         self.person_repository = PersonRepository(db)
         self.response = ResponseHandler()
 
@@ -97,7 +99,8 @@ class AuthService:
                 raise UnauthorizedException(
                     message="Email ou senha incorretos", error_code="INVALID_CREDENTIALS")
 
-            self.person_repository.update_last_login(user.id)
+            # A balance change committed since the read above bumps the version
+            retry_on_conflict(self.db, lambda: self.person_repository.update_last_login(user.id))
 
             access_token_expires = timedelta(
                 minutes=config.ACCESS_TOKEN_EXPIRE_MINUTES)
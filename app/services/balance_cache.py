@@ -0,0 +1,194 @@
+import logging
+import select
+import threading
+import uuid
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, SessionTransaction
+from typing import Any, Dict, Optional, Tuple
+from app.core import config
+from app.core.cache import LRUCache
+from app.core.database import engine
+
+logger = logging.getLogger(__name__)
+
+# Shared by every request in the process: account id -> (version, balance in
+# cents). A ``None`` balance is a tombstone: the account is known to be at
+# least at that version, so older values read elsewhere are refused.
+_entries = LRUCache(maxsize=config.BALANCE_CACHE_SIZE, ttl=config.BALANCE_CACHE_TTL_SECONDS)
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "writes": 0, "stale_writes": 0, "invalidations": 0}
+
+# Identifies this process in invalidation messages, so it skips its own
+WORKER_ID = uuid.uuid4().hex
+STAGED_WRITES = "balance_cache_writes"
+NOTIFY_BATCH = 400
+
+Staged = Dict[int, Tuple[int, Optional[int]]]
+
+
+def cached_balance(account_id: int) -> Optional[int]:
+    entry = _entries.get(account_id)
+    with _lock:
+        if entry is None or entry[1] is None:
+            _stats["misses"] += 1
+            return None
+        _stats["hits"] += 1
+        return entry[1]
+
+
+def store_balance(account_id: int, version: int, balance: Optional[int]) -> bool:
+    """Cache ``balance`` as of ``version`` unless a newer version is already known"""
+    with _lock:
+        current = _entries.get(account_id)
+        if current is not None and (current[0] > version or (current[0] == version and current[1] is not None)):
+            if current[0] > version:
+                _stats["stale_writes"] += 1
+            return False
+        _entries.set(account_id, (version, balance))
+        _stats["writes" if balance is not None else "invalidations"] += 1
+        return True
+
+
+def invalidate_balance(account_id: int, version: Optional[int] = None) -> None:
+    """Forget an account's balance; with ``version``, also refuse anything older from now on"""
+    if version is None:
+        with _lock:
+            _entries.delete(account_id)
+            _stats["invalidations"] += 1
+        return
+    store_balance(account_id, version, None)
+
+
+def balance_cache_stats() -> Dict[str, Any]:
+    with _lock:
+        reads = _stats["hits"] + _stats["misses"]
+        return {
+            **_stats,
+            "hit_rate": round(_stats["hits"] / reads, 4) if reads else None,
+            "size": len(_entries)
+        }
+
+
+def clear_balance_cache() -> None:
+    with _lock:
+        _entries.clear()
+        for name in _stats:
+            _stats[name] = 0
+
+
+def stage_balances(db: Session, balances: Staged) -> None:
+    """Write ``{account_id: (version, balance)}`` through to the cache once ``db`` commits.
+
+    A ``None`` balance invalidates the account instead. On PostgreSQL the
+    accounts are also announced on ``BALANCE_CACHE_CHANNEL`` in the same
+    transaction, so the other workers drop them exactly when it commits.
+    """
+    if not balances:
+        return
+    staged: Staged = db.info.setdefault(STAGED_WRITES, {})
+    for account_id, (version, balance) in balances.items():
+        if account_id not in staged or staged[account_id][0] <= version:
+            staged[account_id] = (version, balance)
+
+    if db.get_bind().dialect.name == "postgresql":
+        items = [f"{account_id}.{version}" for account_id, (version, _) in balances.items()]
+        for start in range(0, len(items), NOTIFY_BATCH):
+            db.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": config.BALANCE_CACHE_CHANNEL, "payload": f"{WORKER_ID}:{','.join(items[start:start + NOTIFY_BATCH])}"}
+            )
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_staged(session: Session) -> None:
+    for account_id, (version, balance) in session.info.pop(STAGED_WRITES, {}).items():
+        store_balance(account_id, version, balance)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_staged(session: Session, previous_transaction: SessionTransaction) -> None:
+    staged: Optional[Staged] = session.info.get(STAGED_WRITES)
+    if not staged:
+        return
+    if not previous_transaction.nested:
+        session.info.pop(STAGED_WRITES, None)
+        return
+    # A savepoint was rolled back and some of these balances may have gone
+    # with it; their versions are still safe to use as tombstones.
+    for account_id, (version, _) in staged.items():
+        staged[account_id] = (version, None)
+
+
+class BalanceInvalidationListener:
+    """Drop the accounts other workers announce on ``BALANCE_CACHE_CHANNEL`` (PostgreSQL only).
+
+    Runs LISTEN on a dedicated connection. Messages sent while it is not
+    connected are lost, so the whole cache is cleared on every (re)connect.
+    """
+
+    thread_name = "balance-cache-listener"
+
+    def __init__(self, engine: Engine, channel: str = config.BALANCE_CACHE_CHANNEL, poll_seconds: float = 1.0):
+        self.engine = engine
+        self.channel = channel
+        self.poll_seconds = poll_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.is_running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=self.thread_name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        if not self.is_running:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self._listen()
+            except Exception as e:
+                logger.error(f"Cache listener on {self.channel} disconnected: {e}")
+                self._stop.wait(self.poll_seconds)
+
+    def _listen(self) -> None:
+        connection = self.engine.raw_connection()
+        try:
+            dbapi_connection = connection.dbapi_connection
+            dbapi_connection.autocommit = True
+            with dbapi_connection.cursor() as cursor:
+                cursor.execute(f'LISTEN "{self.channel}"')
+            self.on_connect()
+            while not self._stop.is_set():
+                if select.select([dbapi_connection], [], [], self.poll_seconds) == ([], [], []):
+                    continue
+                dbapi_connection.poll()
+                while dbapi_connection.notifies:
+                    self.handle(dbapi_connection.notifies.pop(0).payload)
+        finally:
+            connection.invalidate()
+
+    def on_connect(self) -> None:
+        _entries.clear()
+
+    def handle(self, payload: str) -> None:
+        worker_id, _, items = payload.partition(":")
+        if worker_id == WORKER_ID:
+            return
+        for item in items.split(","):
+            account_id, _, version = item.partition(".")
+            invalidate_balance(int(account_id), int(version))
+
+
+balance_invalidation_listener = BalanceInvalidationListener(engine)
@@ -0,0 +1,83 @@
+from sqlalchemy.orm import Session
+from app.repositories.person_repository import PersonRepository
+from app.repositories.balance_shard_repository import BalanceShardRepository
+from app.repositories.ledger_repository import LedgerRepository
+from app.services.balance_cache import stage_balances
+from app.services.statement_service import StatementService
+from app.services.analytics_service import AnalyticsService
+from app.core.exceptions import NotFoundException, ValidationException
+
+class BalanceShardService:
+    """Manage hot accounts whose incoming credits are spread across BalanceShard rows.
+
+    Credits to a sharded account land on a random shard, so concurrent
+    transfers to it no longer queue on its ``person`` row. Debits use the
+    main balance first and drain shards only when it is not enough.
+    ``rebalance`` periodically sweeps the shards back into the main balance
+    and sequences the ledger entries those credits left pending, adding
+    them to the rollups only then.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.person_repository = PersonRepository(db)
+        self.balance_shard_repository = BalanceShardRepository(db)
+        self.ledger_repository = LedgerRepository(db)
+        self.statement_service = StatementService(db)
+        self.analytics_service = AnalyticsService(db)
+
+    def set_shard_count(self, user_id: int, shard_count: int) -> None:
+        """Shard an account's balance into ``shard_count`` rows, or unshard it with 0"""
+        if shard_count < 0:
+            raise ValidationException(message="Quantidade de shards inválida", error_code="INVALID_SHARD_COUNT")
+        
+        user = self.person_repository.get_for_update(user_id)
+        if not user:
+            raise NotFoundException(message="Usuário não encontrado", error_code="USER_NOT_FOUND")
+        
+        try:
+            self.sequence_pending(user.id)
+            user.balance_shards = shard_count
+            # Shards below the new count are kept (emptied) so credits already
+            # aimed at them still land; credits to removed ones are retried.
+            moved = self.balance_shard_repository.resize(user.id, shard_count)
+            if moved:
+                self.person_repository.update_balance(user.id, moved)
+            stage_balances(self.db, {user.id: (user.version, None)})
+            self.person_repository.commit()
+        except Exception:
+            self.person_repository.rollback()
+            raise
+
+    def rebalance(self) -> int:
+        """Move shard balances into each sharded account's main balance, returning the total moved"""
+        total = 0
+        for user in self.person_repository.get_sharded_accounts():
+            try:
+                self.person_repository.get_for_update(user.id)
+                self.sequence_pending(user.id)
+                swept = self.balance_shard_repository.sweep(user.id)
+                if swept:
+                    self.person_repository.update_balance(user.id, swept)
+                self.person_repository.commit()
+                total += swept
+            except Exception:
+                self.person_repository.rollback()
+                raise
+        return total
+
+    def sequence_pending(self, user_id: int) -> None:
+        """Sequence the credits the account (locked by the caller) has pending and add them to the rollups"""
+        entries = [
+            {
+                "account_id": entry.account_id,
+                "amount": entry.amount,
+                "balance_after": entry.balance_after,
+                "transaction_type": entry.transaction_type,
+                "counterparty_id": entry.counterparty_id,
+                "created_at": entry.created_at
+            }
+            for entry in self.ledger_repository.sequence_pending(user_id)
+        ]
+        self.statement_service.record_entries(entries)
+        self.analytics_service.record_entries(entries)
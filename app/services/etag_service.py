@@ -0,0 +1,41 @@
+from typing import Any, Dict, Iterable, Tuple
+from sqlalchemy.orm import Session
+from app.models.person import Person
+from app.repositories.balance_shard_repository import BalanceShardRepository
+from app.core.etag import make_etag
+
+
+class EtagService:
+    """ETags for the per-account reads (balance, history and profile).
+
+    Every change to a person row bumps ``Person.version`` (the ORM version
+    check, or ``credit_balances`` explicitly), and that row is already
+    loaded by the auth middleware, so for most accounts the tag costs no
+    query at all. Credits to sharded accounts only touch shard rows; they
+    always raise the shard total while any debit bumps the version, so
+    adding that total (one indexed read) covers them too.
+
+    History pages also show each counterparty's name and masked document,
+    which change with the counterparty's row, not the caller's, so their
+    tag adds the counterparties of the page as rendered.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.balance_shard_repository = BalanceShardRepository(db)
+
+    def get_account_etag(self, person: Person) -> str:
+        return make_etag(*self._account_state(person))
+
+    def get_history_etag(self, person: Person, transactions: Iterable[Dict[str, Any]]) -> str:
+        counterparties = {
+            (counterparty["id"], counterparty["name"], counterparty["document"])
+            for counterparty in (transaction["counterparty"] for transaction in transactions)
+            if counterparty is not None
+        }
+        return make_etag(*self._account_state(person), *sorted(counterparties))
+
+    def _account_state(self, person: Person) -> Tuple[int, ...]:
+        if not person.balance_shards:
+            return (person.id, person.version)
+        return (person.id, person.version, self.balance_shard_repository.get_total(person.id))
@@ -0,0 +1,122 @@
+import hashlib
+import json
+from datetime import timedelta
+from sqlalchemy.orm import Session
+from typing import Any, Callable, Dict, Optional, Tuple
+from app.core import config
+from app.core.cache import LRUCache
+from app.core.clock import utcnow
+from app.core.single_flight import SingleFlight
+from app.core.exceptions import ValidationException
+from app.repositories.idempotency_repository import IdempotencyRepository
+
+Remember = Callable[[Dict[str, Any]], None]
+
+# Shared by every request in the process: recently stored responses and the
+# executions currently in progress, keyed by (user_id, idempotency key).
+_response_cache = LRUCache(
+    maxsize=config.IDEMPOTENCY_CACHE_SIZE,
+    ttl=config.IDEMPOTENCY_KEY_TTL_SECONDS
+)
+_in_flight = SingleFlight()
+
+
+def clear_idempotency_cache() -> None:
+    _response_cache.clear()
+
+
+class IdempotencyService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.idempotency_repository = IdempotencyRepository(db)
+
+    def execute(
+        self,
+        user_id: int,
+        key: Optional[str],
+        endpoint: str,
+        payload: Dict[str, Any],
+        operation: Callable[[Remember], Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Run a write operation at most once per (user, Idempotency-Key).
+
+        The operation receives a ``remember`` callback that must be called with
+        the response right before its commit, so the stored envelope commits
+        atomically with the transaction it describes.
+        """
+        if not key:
+            return operation(lambda response: None)
+
+        request_hash = self._fingerprint(endpoint, payload)
+        stored_hash, response = _in_flight.do(
+            (user_id, key),
+            lambda: self._execute_once(user_id, key, request_hash, operation)
+        )
+
+        if stored_hash != request_hash:
+            raise ValidationException(
+                message="Chave de idempotência já utilizada com dados diferentes",
+                error_code="IDEMPOTENCY_KEY_MISMATCH"
+            )
+        return response
+
+    def purge_expired(self, batch_size: int = 1000) -> int:
+        total = 0
+        while True:
+            deleted = self.idempotency_repository.delete_expired(utcnow(), batch_size)
+            total += deleted
+            if deleted < batch_size:
+                return total
+
+    def _execute_once(
+        self,
+        user_id: int,
+        key: str,
+        request_hash: str,
+        operation: Callable[[Remember], Dict[str, Any]]
+    ) -> Tuple[str, Dict[str, Any]]:
+        cache_key = (user_id, key)
+        cached = _response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        record = self.idempotency_repository.get_by_key(user_id, key)
+        if record is not None:
+            if record.expires_at > utcnow():
+                return self._cache_record(record)
+            self.idempotency_repository.delete_record(record)
+
+        def remember(response: Dict[str, Any]) -> None:
+            self.idempotency_repository.create_record(
+                user_id=user_id,
+                key=key,
+                request_hash=request_hash,
+                response=response,
+                expires_at=utcnow() + timedelta(seconds=config.IDEMPOTENCY_KEY_TTL_SECONDS)
+            )
+
+        try:
+            response = operation(remember)
+        except Exception:
+            # Another worker may have committed the same key first, in which
+            # case our insert lost the race and its stored response wins.
+            self.db.rollback()
+            record = self.idempotency_repository.get_by_key(user_id, key)
+            if record is None or record.expires_at <= utcnow():
+                raise
+            return self._cache_record(record)
+
+        result = (request_hash, response)
+        _response_cache.set(cache_key, result)
+        return result
+
+    def _cache_record(self, record) -> Tuple[str, Dict[str, Any]]:
+        result = (record.request_hash, record.response)
+        ttl = (record.expires_at - utcnow()).total_seconds()
+        _response_cache.set((record.user_id, record.key), result, ttl=max(ttl, 0))
+        return result
+
+    @staticmethod
+    def _fingerprint(endpoint: str, payload: Dict[str, Any]) -> str:
+        canonical = json.dumps({"endpoint": endpoint, "payload": payload}, sort_keys=True, default=str)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
@@ -0,0 +1,141 @@
+import logging
+import threading
+from typing import Callable, Dict, List, Optional
+from sqlalchemy.orm import Session
+from app.core import config
+from app.core.clock import utcnow
+from app.core.database import SessionLocal
+from app.models.outbox_event import OutboxEvent
+from app.repositories.outbox_repository import OutboxRepository
+from app.services.outbox_sinks import OutboxSink
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxDispatcher:
+    """Deliver outbox events to sinks in batches.
+
+    Events are spread over ``partitions`` by account. A worker locks one
+    partition row with ``FOR UPDATE SKIP LOCKED``, reads up to
+    ``batch_size`` of its undelivered events in id order, hands them to
+    every sink and deletes (or marks) them in the same commit that releases
+    the partition. Workers on any node therefore share the load by
+    partition while each account's events keep their order. A sink failure
+    rolls the batch back, so delivery is at-least-once.
+    """
+
+    def __init__(
+        self,
+        sinks: List[OutboxSink],
+        session_factory: Callable[[], Session] = SessionLocal,
+        workers: int = config.OUTBOX_WORKERS,
+        batch_size: int = config.OUTBOX_BATCH_SIZE,
+        partitions: int = config.OUTBOX_PARTITIONS,
+        poll_seconds: float = config.OUTBOX_POLL_SECONDS,
+        delete_dispatched: bool = config.OUTBOX_DELETE_DISPATCHED
+    ):
+        self.sinks = sinks
+        self.session_factory = session_factory
+        self.workers = max(1, workers)
+        self.batch_size = batch_size
+        self.partitions = partitions
+        self.poll_seconds = poll_seconds
+        self.delete_dispatched = delete_dispatched
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self.dispatched = 0
+        self.failed_batches = 0
+
+    def dispatch_batch(self) -> int:
+        """Deliver one batch of one partition, returning how many events were delivered"""
+        db = self.session_factory()
+        repository = OutboxRepository(db)
+        try:
+            partition = repository.claim_partition(self.partitions)
+            if partition is None:
+                db.rollback()
+                return 0
+            
+            events = repository.get_pending(partition, self.batch_size)
+            messages = [self._message(event) for event in events]
+            for sink in self.sinks:
+                sink.deliver(messages)
+            
+            event_ids = [event.id for event in events]
+            now = utcnow()
+            if self.delete_dispatched:
+                repository.delete_events(event_ids)
+            else:
+                repository.mark_dispatched(event_ids, now)
+            repository.touch_partition(partition, now)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        
+        with self._lock:
+            self.dispatched += len(events)
+        return len(events)
+
+    def run_once(self) -> int:
+        """Deliver until nothing is pending, returning the number of events delivered"""
+        self._prepare()
+        before = self.dispatched
+        self._run_workers(stop_when_idle=True)
+        return self.dispatched - before
+
+    def run_forever(self) -> None:
+        self._prepare()
+        self._stop.clear()
+        self._run_workers(stop_when_idle=False)
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _prepare(self) -> None:
+        db = self.session_factory()
+        try:
+            OutboxRepository(db).ensure_partitions(self.partitions)
+        finally:
+            db.close()
+
+    def _run_workers(self, stop_when_idle: bool) -> None:
+        threads = [
+            threading.Thread(target=self._work, args=(stop_when_idle,), name=f"outbox-dispatcher-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def _work(self, stop_when_idle: bool) -> None:
+        while not self._stop.is_set():
+            try:
+                delivered = self.dispatch_batch()
+            except Exception as e:
+                logger.error(f"Outbox batch failed: {e}")
+                with self._lock:
+                    self.failed_batches += 1
+                if stop_when_idle:
+                    return
+                self._stop.wait(self.poll_seconds)
+                continue
+            
+            # Nothing unlocked is pending: either idle or every partition
+            # with events is being served by another worker.
+            if not delivered:
+                if stop_when_idle:
+                    return
+                self._stop.wait(self.poll_seconds)
+
+    def _message(self, event: OutboxEvent) -> Dict:
+        return {
+            "id": event.id,
+            "event_type": event.event_type,
+            "account_id": event.account_id,
+            "created_at": event.created_at.isoformat() if event.created_at else None,
+            **event.payload
+        }
@@ -0,0 +1,114 @@
+import json
+import os
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+
+Event = Dict[str, Any]
+
+
+class OutboxSink:
+    """Destination of dispatched outbox events.
+
+    ``deliver`` receives a batch in delivery order and must raise if the
+    batch was not accepted; the dispatcher then keeps the events and
+    retries the whole batch later (at-least-once delivery).
+    """
+
+    def deliver(self, events: List[Event]) -> None:
+        raise NotImplementedError
+
+
+class CallbackSink(OutboxSink):
+    """Hand batches to an in-process callable"""
+
+    def __init__(self, callback: Callable[[List[Event]], Any]):
+        self.callback = callback
+
+    def deliver(self, events: List[Event]) -> None:
+        self.callback(events)
+
+
+class FileSink(OutboxSink):
+    """Append events as JSON lines, fsynced once per batch"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def deliver(self, events: List[Event]) -> None:
+        lines = "".join(json.dumps(event, separators=(",", ":")) + "\n" for event in events)
+        with self._lock, open(self.path, "a", encoding="utf-8") as file:
+            file.write(lines)
+            file.flush()
+            os.fsync(file.fileno())
+
+
+class HttpSink(OutboxSink):
+    """POST each batch as ``{"events": [...]}``; any non-2xx status fails the batch"""
+
+    def __init__(self, url: str, timeout: float = 5.0, headers: Optional[Dict[str, str]] = None):
+        self.url = url
+        self.timeout = timeout
+        self.headers = {"Content-Type": "application/json", **(headers or {})}
+
+    def deliver(self, events: List[Event]) -> None:
+        body = json.dumps({"events": events}, separators=(",", ":")).encode("utf-8")
+        request = urllib.request.Request(self.url, data=body, headers=self.headers, method="POST")
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            if not 200 <= response.status < 300:
+                raise RuntimeError(f"Outbox HTTP sink returned {response.status}")
+
+
+class OutboxHttpStub:
+    """Local HTTP receiver for HttpSink, for development and tests.
+
+    Keeps every received event in ``events``; ``fail_next`` makes the next
+    N requests answer 503 to exercise retries.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        stub = self
+        self.events: List[Event] = []
+        self.requests = 0
+        self.fail_next = 0
+        self._lock = threading.Lock()
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                with stub._lock:
+                    stub.requests += 1
+                    failing = stub.fail_next > 0
+                    if failing:
+                        stub.fail_next -= 1
+                    else:
+                        stub.events.extend(body.get("events", []))
+                self.send_response(503 if failing else 200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/events"
+
+    def start(self) -> "OutboxHttpStub":
+        self._thread = threading.Thread(target=self.server.serve_forever, name="outbox-http-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
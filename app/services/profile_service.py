@@ -1,47 +1,201 @@
-from sqlalchemy.orm import Session
+import threading
+from sqlalchemy import event, inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, SessionTransaction
+from app.core import config
+from app.core.cache import LRUCache
+from app.core.database import engine
+from app.models.person import Person, TYPE_NATURAL_PERSON, TYPE_LEGAL_PERSON
 from app.repositories.person_repository import PersonRepository
+from app.repositories.balance_shard_repository import BalanceShardRepository
+from app.services.balance_cache import WORKER_ID, BalanceInvalidationListener, cached_balance, store_balance
 from app.core.response_handler import ResponseHandler
+from app.core.money import from_cents
 from app.core.exceptions import NotFoundException, DatabaseException
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, Optional
+
+# Only changes to these columns invalidate a cached profile; balance,
+# version and last_login move all the time and are not part of it.
+PROFILE_FIELDS = ("name", "email", "address", "city", "state", "type", "cpf", "cnpj")
+STAGED_INVALIDATIONS = "profile_cache_invalidations"
+
+# Shared by every request in the process, by user id: the profile document
+# without the balance, and the public name/document shown to counterparties.
+# The epoch moves on every invalidation, so an entry read before one is
+# never cached after it.
+_profile_cache = LRUCache(maxsize=config.PROFILE_CACHE_SIZE, ttl=config.PROFILE_CACHE_TTL_SECONDS)
+_counterparty_cache = LRUCache(maxsize=config.COUNTERPARTY_CACHE_SIZE, ttl=config.PROFILE_CACHE_TTL_SECONDS)
+_lock = threading.Lock()
+_epoch = 0
+
+
+def clear_profile_cache() -> None:
+    _profile_cache.clear()
+    _counterparty_cache.clear()
+
+
+def invalidate_profile(user_id: int) -> None:
+    global _epoch
+    with _lock:
+        _epoch += 1
+        _profile_cache.delete(user_id)
+        _counterparty_cache.delete(user_id)
+
+
+def mask_document(person_type: int, cpf: Optional[str], cnpj: Optional[str]) -> Optional[str]:
+    """CPF/CNPJ as shown to other users: only the middle digits of a CPF, only the root of a CNPJ"""
+    if person_type == TYPE_NATURAL_PERSON and cpf and len(cpf) == 11:
+        return f"***.{cpf[3:6]}.{cpf[6:9]}-**"
+    if person_type == TYPE_LEGAL_PERSON and cnpj and len(cnpj) == 14:
+        return f"{cnpj[:2]}.{cnpj[2:5]}.{cnpj[5:8]}/****-**"
+    return None
+
+
+@event.listens_for(Session, "before_flush")
+def _stage_profile_changes(session: Session, flush_context, instances) -> None:
+    changed = {
+        person.id for person in session.dirty
+        if isinstance(person, Person) and any(inspect(person).attrs[field].history.has_changes() for field in PROFILE_FIELDS)
+    }
+    changed |= {person.id for person in session.deleted if isinstance(person, Person)}
+    for user_id in changed:
+        # Dropped now and again on commit: readers in between still see the old row
+        invalidate_profile(user_id)
+        session.info.setdefault(STAGED_INVALIDATIONS, set()).add(user_id)
+    # Other workers drop them when this transaction commits (PostgreSQL only)
+    if changed and session.get_bind().dialect.name == "postgresql":
+        session.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": config.PROFILE_CACHE_CHANNEL, "payload": f"{WORKER_ID}:{','.join(map(str, sorted(changed)))}"}
+        )
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_profile_changes(session: Session) -> None:
+    for user_id in session.info.pop(STAGED_INVALIDATIONS, ()):
+        invalidate_profile(user_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_profile_changes(session: Session, previous_transaction: SessionTransaction) -> None:
+    if not previous_transaction.nested:
+        session.info.pop(STAGED_INVALIDATIONS, None)
+
+
+class ProfileInvalidationListener(BalanceInvalidationListener):
+    """Drop the profiles other workers announce on ``PROFILE_CACHE_CHANNEL`` (PostgreSQL only)"""
+
+    thread_name = "profile-cache-listener"
+
+    def __init__(self, engine: Engine, channel: str = config.PROFILE_CACHE_CHANNEL, poll_seconds: float = 1.0):
+        super().__init__(engine, channel, poll_seconds)
+
+    def on_connect(self) -> None:
+        clear_profile_cache()
+
+    def handle(self, payload: str) -> None:
+        worker_id, _, user_ids = payload.partition(":")
+        if worker_id == WORKER_ID:
+            return
+        for user_id in user_ids.split(","):
+            invalidate_profile(int(user_id))
+
+
+profile_invalidation_listener = ProfileInvalidationListener(engine)
+
 
 class ProfileService:
     def __init__(self, db: Session):
         self.db = db
         self.person_repository = PersonRepository(db)
+        self.balance_shard_repository = BalanceShardRepository(db)
         self.response = ResponseHandler()
-    
+
     def get_profile(self, user_id: int) -> Dict[str, Any]:
         try:
-            user = self.person_repository.get_profile_by_id(user_id)
-            
-            if not user:
-                raise NotFoundException(
-                    message="Usuário não encontrado", 
-                    error_code="USER_NOT_FOUND"
-                )
-            
-            profile_data = {
-                "id": user.id,
-                "name": user.name,
-                "email": user.email,
-                "address": user.address,
-                "city": user.city,
-                "state": user.state,
-                "balance": user.balance,
-                "type": user.type,
-            }
-            
-            if user.type == 1: 
-                profile_data["cpf"] = user.cpf
-            elif user.type == 2:
-                profile_data["cnpj"] = user.cnpj
-                
+            user = None
+            document = _profile_cache.get(user_id)
+            if document is None:
+                epoch = _epoch
+                user = self._get_user(user_id)
+                document = self._profile_document(user)
+                with _lock:
+                    if epoch == _epoch:
+                        _profile_cache.set(user_id, document)
+
+            profile_data = dict(document)
+            profile_data["balance"] = from_cents(self._balance(user_id, user))
             return self.response.success(
                 data=profile_data,
                 message="Dados do perfil recuperados com sucesso"
             )
-            
+
         except Exception as e:
             if not isinstance(e, NotFoundException):
                 raise DatabaseException(message=f"Erro ao recuperar perfil: {str(e)}")
             raise
+
+    def get_counterparties(self, user_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        """Public name and masked document of each user, cached, with one query for the misses"""
+        counterparties = {}
+        missing = []
+        for user_id in set(user_ids):
+            counterparty = _counterparty_cache.get(user_id)
+            if counterparty is None:
+                missing.append(user_id)
+            else:
+                counterparties[user_id] = counterparty
+        if not missing:
+            return counterparties
+
+        epoch = _epoch
+        fetched = {
+            row.id: {"id": row.id, "name": row.name, "document": mask_document(row.type, row.cpf, row.cnpj)}
+            for row in self.person_repository.get_counterparties(missing)
+        }
+        with _lock:
+            if epoch == _epoch:
+                for user_id, counterparty in fetched.items():
+                    _counterparty_cache.set(user_id, counterparty)
+        counterparties.update(fetched)
+        return counterparties
+
+    def _get_user(self, user_id: int) -> Person:
+        user = self.person_repository.get_profile_by_id(user_id)
+        if not user:
+            raise NotFoundException(
+                message="Usuário não encontrado",
+                error_code="USER_NOT_FOUND"
+            )
+        return user
+
+    def _profile_document(self, user: Person) -> Dict[str, Any]:
+        document = {
+            "id": user.id,
+            "name": user.name,
+            "email": user.email,
+            "address": user.address,
+            "city": user.city,
+            "state": user.state,
+            "balance": None,
+            "type": user.type,
+        }
+
+        if user.type == 1:
+            document["cpf"] = user.cpf
+        elif user.type == 2:
+            document["cnpj"] = user.cnpj
+        return document
+
+    def _balance(self, user_id: int, user: Optional[Person]) -> int:
+        # Fastest first: the balance cache, then the row already loaded for
+        # the document, then a fresh read.
+        if user is None:
+            balance = cached_balance(user_id)
+            if balance is not None:
+                return balance
+            user = self._get_user(user_id)
+
+        if not user.balance_shards:
+            store_balance(user.id, user.version, user.balance)
+        return self.balance_shard_repository.get_available_balance(user)
@@ -0,0 +1,254 @@
+import calendar
+import logging
+import time
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+from app.repositories.person_repository import PersonRepository
+from app.repositories.recurring_payment_repository import RecurringPaymentRepository
+from app.services.transaction_service import TransactionService
+from app.models.person import Person
+from app.models.recurring_payment import (
+    RecurringPayment,
+    RECURRING_PAYMENT_ACTIVE,
+    RECURRING_PAYMENT_FINISHED,
+    RECURRING_PAYMENT_CANCELLED,
+    RECURRENCE_DAILY,
+    RECURRENCE_WEEKLY,
+    RECURRENCE_MONTHLY
+)
+from app.schemas.transaction import RecurringPaymentRequest
+from app.core import config
+from app.core.response_handler import ResponseHandler
+from app.core.money import from_cents
+from app.core.clock import utcnow
+from app.core.exceptions import (
+    AppException,
+    BadRequestException,
+    DatabaseException,
+    NotFoundException
+)
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+INTERVALS = {
+    "daily": RECURRENCE_DAILY,
+    "weekly": RECURRENCE_WEEKLY,
+    "monthly": RECURRENCE_MONTHLY
+}
+INTERVAL_NAMES = {value: name for name, value in INTERVALS.items()}
+STATUS_NAMES = {
+    RECURRING_PAYMENT_ACTIVE: "active",
+    RECURRING_PAYMENT_FINISHED: "finished",
+    RECURRING_PAYMENT_CANCELLED: "cancelled"
+}
+
+def next_occurrence(interval: int, start_at: datetime, current: datetime) -> datetime:
+    """Occurrence after ``current``; monthly runs keep the start day, clamped to short months"""
+    if interval == RECURRENCE_DAILY:
+        return current + timedelta(days=1)
+    if interval == RECURRENCE_WEEKLY:
+        return current + timedelta(weeks=1)
+    year, month = divmod(current.month, 12)
+    year, month = current.year + year, month + 1
+    day = min(start_at.day, calendar.monthrange(year, month)[1])
+    return current.replace(year=year, month=month, day=day)
+
+class RecurringPaymentService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.person_repository = PersonRepository(db)
+        self.recurring_payment_repository = RecurringPaymentRepository(db)
+        self.response = ResponseHandler()
+
+    def create(self, data: RecurringPaymentRequest, current_user: Person) -> Dict[str, Any]:
+        try:
+            if data.recipient_id == current_user.id:
+                raise BadRequestException(message="Não é possível transferir para você mesmo", error_code="INVALID_RECIPIENT")
+            if not self.person_repository.get_by_id(data.recipient_id):
+                raise BadRequestException(message="Destinatário não encontrado", error_code="USER_NOT_FOUND")
+            
+            try:
+                recurring = self.recurring_payment_repository.create_recurring_payment(
+                    sender_id=current_user.id,
+                    recipient_id=data.recipient_id,
+                    amount=data.amount,
+                    interval=INTERVALS[data.interval],
+                    start_at=data.start_at,
+                    end_at=data.end_at,
+                    catch_up=data.catch_up
+                )
+                self.recurring_payment_repository.commit()
+            except Exception as e:
+                self.recurring_payment_repository.rollback()
+                raise DatabaseException(message=f"Falha ao criar pagamento recorrente: {str(e)}")
+            
+            return self.response.success(
+                data=self._serialize(recurring),
+                message="Pagamento recorrente criado com sucesso"
+            )
+        except AppException:
+            raise
+        except Exception as e:
+            raise DatabaseException(message=f"Erro ao criar pagamento recorrente: {str(e)}")
+
+    def get_recurring_payments(self, user_id: int) -> Dict[str, Any]:
+        try:
+            recurring = self.recurring_payment_repository.get_user_recurring_payments(user_id)
+            return self.response.success(
+                data={"recurring_payments": [self._serialize(item) for item in recurring]},
+                message="Pagamentos recorrentes recuperados com sucesso"
+            )
+        except Exception as e:
+            raise DatabaseException(message=f"Erro ao recuperar pagamentos recorrentes: {str(e)}")
+
+    def cancel(self, recurring_id: int, current_user: Person) -> Dict[str, Any]:
+        try:
+            recurring = self.recurring_payment_repository.get_user_recurring_payment(recurring_id, current_user.id)
+            if not recurring:
+                raise NotFoundException(message="Pagamento recorrente não encontrado", error_code="RECURRING_PAYMENT_NOT_FOUND")
+            if recurring.status != RECURRING_PAYMENT_ACTIVE:
+                self.recurring_payment_repository.rollback()
+                raise BadRequestException(
+                    message="Pagamento recorrente não está ativo",
+                    error_code="RECURRING_PAYMENT_NOT_ACTIVE"
+                )
+            
+            try:
+                recurring.status = RECURRING_PAYMENT_CANCELLED
+                self.recurring_payment_repository.commit()
+            except Exception as e:
+                self.recurring_payment_repository.rollback()
+                raise DatabaseException(message=f"Falha ao cancelar pagamento recorrente: {str(e)}")
+            
+            return self.response.success(
+                data=self._serialize(recurring),
+                message="Pagamento recorrente cancelado com sucesso"
+            )
+        except AppException:
+            raise
+        except Exception as e:
+            raise DatabaseException(message=f"Erro ao cancelar pagamento recorrente: {str(e)}")
+
+    def run_due(self, batch_size: int = config.RECURRING_PAYMENT_BATCH_SIZE, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Execute every schedule due at ``now`` in batches, one commit per batch.
+
+        Each claimed schedule runs one occurrence and advances ``next_run_at``.
+        After downtime a ``catch_up`` schedule is still due, so a later batch
+        of the same run claims it again until it has caught up; the others
+        run once and jump to their first future occurrence, counting the
+        occurrences passed over as ``skipped``. The run's metrics are stored
+        as a RecurringPaymentRun row and returned.
+        """
+        now = now or utcnow()
+        started = time.perf_counter()
+        metrics = {
+            "batches": 0, "executed": 0, "failed": 0, "skipped": 0,
+            "retried": 0, "finished": 0, "max_lag_seconds": 0.0
+        }
+        
+        while True:
+            try:
+                claimed = self.recurring_payment_repository.claim_due(now, batch_size)
+                if not claimed:
+                    break
+                progressed = self._run_batch(claimed, now, metrics)
+                self.recurring_payment_repository.commit()
+            except Exception:
+                self.recurring_payment_repository.rollback()
+                raise
+            metrics["batches"] += 1
+            # Every row left due by a concurrent balance change; try next run.
+            if not progressed:
+                break
+        
+        try:
+            self.recurring_payment_repository.add_run(
+                started_at=now,
+                finished_at=utcnow(),
+                **metrics
+            )
+            self.recurring_payment_repository.commit()
+        except Exception:
+            self.recurring_payment_repository.rollback()
+            raise
+        
+        metrics["duration_seconds"] = round(time.perf_counter() - started, 3)
+        logger.info(f"Recurring payment run: {metrics}")
+        return metrics
+
+    def _run_batch(self, claimed, now: datetime, metrics: Dict[str, Any]) -> int:
+        transaction_service = TransactionService(self.db)
+        progressed = 0
+        
+        for recurring in claimed:
+            occurrence = recurring.next_run_at
+            metrics["max_lag_seconds"] = max(metrics["max_lag_seconds"], (now - occurrence).total_seconds())
+            
+            savepoint = self.db.begin_nested()
+            try:
+                result = transaction_service.execute_transfer(
+                    recurring.sender_id, recurring.recipient_id, recurring.amount
+                )
+                savepoint.commit()
+                recurring.last_transaction_id = result["data"]["transaction_id"]
+                recurring.last_error_code = None
+                metrics["executed"] += 1
+            except StaleDataError:
+                savepoint.rollback()
+                metrics["retried"] += 1
+                continue
+            except AppException as e:
+                savepoint.rollback()
+                recurring.last_error_code = e.error_code
+                metrics["failed"] += 1
+            except Exception:
+                # Anything else fails this occurrence only; escaping would roll
+                # back the batch and leave this row first in line forever.
+                savepoint.rollback()
+                logger.exception(f"Recurring payment {recurring.id} failed")
+                recurring.last_error_code = "EXECUTION_ERROR"
+                metrics["failed"] += 1
+            
+            recurring.last_run_at = now
+            try:
+                self._advance(recurring, occurrence, now, metrics)
+            except Exception:
+                # Without a next occurrence the schedule would be claimed
+                # again right away, so it is taken out of the rotation.
+                logger.exception(f"Recurring payment {recurring.id} could not be advanced")
+                recurring.status = RECURRING_PAYMENT_CANCELLED
+                recurring.last_error_code = "EXECUTION_ERROR"
+            progressed += 1
+        
+        return progressed
+
+    def _advance(self, recurring: RecurringPayment, occurrence: datetime, now: datetime, metrics: Dict[str, Any]) -> None:
+        following = next_occurrence(recurring.interval, recurring.start_at, occurrence)
+        skipped = 0
+        if not recurring.catch_up:
+            while following <= now:
+                following = next_occurrence(recurring.interval, recurring.start_at, following)
+                skipped += 1
+        recurring.next_run_at = following
+        metrics["skipped"] += skipped
+        if recurring.end_at is not None and following > recurring.end_at:
+            recurring.status = RECURRING_PAYMENT_FINISHED
+            metrics["finished"] += 1
+
+    def _serialize(self, recurring: RecurringPayment) -> Dict[str, Any]:
+        return {
+            "id": recurring.id,
+            "recipient_id": recurring.recipient_id,
+            "amount": from_cents(recurring.amount),
+            "interval": INTERVAL_NAMES[recurring.interval],
+            "start_at": recurring.start_at,
+            "end_at": recurring.end_at,
+            "catch_up": recurring.catch_up,
+            "next_run_at": recurring.next_run_at,
+            "status": STATUS_NAMES[recurring.status],
+            "last_run_at": recurring.last_run_at,
+            "last_transaction_id": recurring.last_transaction_id,
+            "last_error_code": recurring.last_error_code
+        }
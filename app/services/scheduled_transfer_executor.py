@@ -0,0 +1,95 @@
+import logging
+import threading
+from typing import Callable, Dict, List, Optional
+from sqlalchemy.orm import Session
+from app.core import config
+from app.core.database import SessionLocal
+from app.core.rate_limiter import RateLimiter
+from app.services.scheduled_transfer_service import ScheduledTransferService
+
+logger = logging.getLogger(__name__)
+
+
+class ScheduledTransferExecutor:
+    """Drain due scheduled transfers with a pool of worker threads.
+
+    Each worker claims a batch with ``FOR UPDATE SKIP LOCKED`` in its own
+    session, so workers (and executors on other nodes) never pick the same
+    row. A shared token bucket caps transfers per second so a midnight
+    backlog is spread out instead of saturating the database that serves
+    live traffic; ``batch_size`` also bounds how long balance rows stay
+    locked by one commit.
+
+    Running several workers relies on PostgreSQL's row locks; on SQLite
+    ``SKIP LOCKED`` is a no-op, so use a single worker there.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        workers: int = config.SCHEDULED_TRANSFER_WORKERS,
+        batch_size: int = config.SCHEDULED_TRANSFER_BATCH_SIZE,
+        max_per_second: Optional[float] = config.SCHEDULED_TRANSFER_MAX_PER_SECOND,
+        poll_seconds: float = config.SCHEDULED_TRANSFER_POLL_SECONDS
+    ):
+        self.session_factory = session_factory
+        self.workers = max(1, workers)
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self.rate_limiter = RateLimiter(max_per_second, burst=max(batch_size, max_per_second or 0))
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self.totals = {"claimed": 0, "executed": 0, "failed": 0, "retried": 0}
+
+    def run_once(self) -> Dict[str, int]:
+        """Run the workers until no due transfer is left, returning the totals of this run"""
+        before = dict(self.totals)
+        self._run_workers(stop_when_idle=True)
+        return {key: self.totals[key] - before[key] for key in self.totals}
+
+    def run_forever(self) -> None:
+        self._stop.clear()
+        self._run_workers(stop_when_idle=False)
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run_workers(self, stop_when_idle: bool) -> None:
+        threads: List[threading.Thread] = [
+            threading.Thread(
+                target=self._work, args=(stop_when_idle,), name=f"scheduled-transfer-{i}", daemon=True
+            )
+            for i in range(self.workers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def _work(self, stop_when_idle: bool) -> None:
+        while not self._stop.is_set():
+            self.rate_limiter.acquire(self.batch_size)
+            try:
+                counts = self._execute_batch()
+            except Exception as e:
+                logger.error(f"Scheduled transfer batch failed: {e}")
+                counts = None
+            
+            if counts:
+                with self._lock:
+                    for key, value in counts.items():
+                        self.totals[key] += value
+            
+            # A short batch means the backlog is drained (or only rows held
+            # by other workers are left); wait before polling again.
+            if counts is None or counts["claimed"] < self.batch_size:
+                if stop_when_idle:
+                    return
+                self._stop.wait(self.poll_seconds)
+
+    def _execute_batch(self) -> Dict[str, int]:
+        db = self.session_factory()
+        try:
+            return ScheduledTransferService(db).execute_due(self.batch_size)
+        finally:
+            db.close()
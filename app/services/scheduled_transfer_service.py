@@ -0,0 +1,172 @@
+import logging
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+from app.repositories.person_repository import PersonRepository
+from app.repositories.scheduled_transfer_repository import ScheduledTransferRepository
+from app.services.transaction_service import TransactionService
+from app.models.person import Person
+from app.models.scheduled_transfer import (
+    ScheduledTransfer,
+    SCHEDULED_TRANSFER_PENDING,
+    SCHEDULED_TRANSFER_EXECUTED,
+    SCHEDULED_TRANSFER_FAILED,
+    SCHEDULED_TRANSFER_CANCELLED
+)
+from app.schemas.transaction import ScheduledTransferRequest
+from app.core.response_handler import ResponseHandler
+from app.core.money import from_cents
+from app.core.clock import utcnow
+from app.core.exceptions import (
+    AppException,
+    BadRequestException,
+    DatabaseException,
+    NotFoundException
+)
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+STATUS_NAMES = {
+    SCHEDULED_TRANSFER_PENDING: "pending",
+    SCHEDULED_TRANSFER_EXECUTED: "executed",
+    SCHEDULED_TRANSFER_FAILED: "failed",
+    SCHEDULED_TRANSFER_CANCELLED: "cancelled"
+}
+
+class ScheduledTransferService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.person_repository = PersonRepository(db)
+        self.scheduled_transfer_repository = ScheduledTransferRepository(db)
+        self.response = ResponseHandler()
+
+    def schedule(self, data: ScheduledTransferRequest, current_user: Person) -> Dict[str, Any]:
+        try:
+            if data.recipient_id == current_user.id:
+                raise BadRequestException(message="Não é possível transferir para você mesmo", error_code="INVALID_RECIPIENT")
+            if not self.person_repository.get_by_id(data.recipient_id):
+                raise BadRequestException(message="Destinatário não encontrado", error_code="USER_NOT_FOUND")
+            
+            try:
+                scheduled = self.scheduled_transfer_repository.create_scheduled_transfer(
+                    sender_id=current_user.id,
+                    recipient_id=data.recipient_id,
+                    amount=data.amount,
+                    execute_at=data.execute_at
+                )
+                self.scheduled_transfer_repository.commit()
+            except Exception as e:
+                self.scheduled_transfer_repository.rollback()
+                raise DatabaseException(message=f"Falha no agendamento: {str(e)}")
+            
+            return self.response.success(
+                data=self._serialize(scheduled),
+                message="Transferência agendada com sucesso"
+            )
+        except AppException:
+            raise
+        except Exception as e:
+            raise DatabaseException(message=f"Erro no agendamento: {str(e)}")
+
+    def get_scheduled_transfers(self, user_id: int) -> Dict[str, Any]:
+        try:
+            scheduled = self.scheduled_transfer_repository.get_user_scheduled_transfers(user_id)
+            return self.response.success(
+                data={"scheduled_transfers": [self._serialize(item) for item in scheduled]},
+                message="Transferências agendadas recuperadas com sucesso"
+            )
+        except Exception as e:
+            raise DatabaseException(message=f"Erro ao recuperar transferências agendadas: {str(e)}")
+
+    def cancel(self, scheduled_id: int, current_user: Person) -> Dict[str, Any]:
+        try:
+            # Row lock: an executor that already claimed it makes us wait for
+            # its outcome instead of cancelling a transfer being executed.
+            scheduled = self.scheduled_transfer_repository.get_user_scheduled_transfer(scheduled_id, current_user.id)
+            if not scheduled:
+                raise NotFoundException(message="Transferência agendada não encontrada", error_code="SCHEDULED_TRANSFER_NOT_FOUND")
+            if scheduled.status != SCHEDULED_TRANSFER_PENDING:
+                self.scheduled_transfer_repository.rollback()
+                raise BadRequestException(
+                    message="Transferência agendada não está pendente",
+                    error_code="SCHEDULED_TRANSFER_NOT_PENDING"
+                )
+            
+            try:
+                scheduled.status = SCHEDULED_TRANSFER_CANCELLED
+                self.scheduled_transfer_repository.commit()
+            except Exception as e:
+                self.scheduled_transfer_repository.rollback()
+                raise DatabaseException(message=f"Falha ao cancelar agendamento: {str(e)}")
+            
+            return self.response.success(
+                data=self._serialize(scheduled),
+                message="Transferência agendada cancelada com sucesso"
+            )
+        except AppException:
+            raise
+        except Exception as e:
+            raise DatabaseException(message=f"Erro ao cancelar agendamento: {str(e)}")
+
+    def execute_due(self, limit: int, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Claim up to ``limit`` due transfers and execute them, committing once.
+
+        Rows are claimed with ``FOR UPDATE SKIP LOCKED`` so concurrent
+        executors split the backlog instead of running a transfer twice.
+        Each transfer runs in its own savepoint: business failures
+        (insufficient funds, deleted recipient) mark it failed, a concurrent
+        balance change leaves it pending for the next round. Any other error
+        is logged and marks only that transfer failed (EXECUTION_ERROR), so
+        one bad row cannot roll back the batch and be claimed again forever.
+        """
+        counts = {"claimed": 0, "executed": 0, "failed": 0, "retried": 0}
+        try:
+            claimed = self.scheduled_transfer_repository.claim_due(now or utcnow(), limit)
+            counts["claimed"] = len(claimed)
+            transaction_service = TransactionService(self.db)
+            
+            for scheduled in claimed:
+                savepoint = self.db.begin_nested()
+                try:
+                    result = transaction_service.execute_transfer(
+                        scheduled.sender_id, scheduled.recipient_id, scheduled.amount
+                    )
+                    savepoint.commit()
+                    scheduled.status = SCHEDULED_TRANSFER_EXECUTED
+                    scheduled.transaction_id = result["data"]["transaction_id"]
+                    counts["executed"] += 1
+                except StaleDataError:
+                    savepoint.rollback()
+                    counts["retried"] += 1
+                    continue
+                except AppException as e:
+                    savepoint.rollback()
+                    scheduled.status = SCHEDULED_TRANSFER_FAILED
+                    scheduled.error_code = e.error_code
+                    counts["failed"] += 1
+                except Exception:
+                    savepoint.rollback()
+                    logger.exception(f"Scheduled transfer {scheduled.id} failed")
+                    scheduled.status = SCHEDULED_TRANSFER_FAILED
+                    scheduled.error_code = "EXECUTION_ERROR"
+                    counts["failed"] += 1
+                scheduled.executed_at = utcnow()
+            
+            self.scheduled_transfer_repository.commit()
+            return counts
+        except Exception:
+            self.scheduled_transfer_repository.rollback()
+            raise
+
+    def _serialize(self, scheduled: ScheduledTransfer) -> Dict[str, Any]:
+        return {
+            "id": scheduled.id,
+            "recipient_id": scheduled.recipient_id,
+            "amount": from_cents(scheduled.amount),
+            "execute_at": scheduled.execute_at,
+            "status": STATUS_NAMES[scheduled.status],
+            "transaction_id": scheduled.transaction_id,
+            "error_code": scheduled.error_code,
+            "executed_at": scheduled.executed_at
+        }
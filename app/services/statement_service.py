@@ -0,0 +1,150 @@
+from datetime import date, datetime, timedelta
+from sqlalchemy.orm import Session
+from typing import Any, Dict, Iterable, Optional
+from app.core.clock import utcnow, month_start, add_months
+from app.core.money import from_cents
+from app.core.response_handler import ResponseHandler
+from app.core.exceptions import AppException, NotFoundException, ValidationException, DatabaseException
+from app.models.monthly_statement import MonthlyStatement
+from app.models.transaction import TYPE_TRANSACTION_DEPOSIT, TYPE_TRANSACTION_WITHDRAW
+from app.repositories.monthly_statement_repository import MonthlyStatementRepository, TOTAL_COLUMNS
+from app.repositories.transaction_repository import TransactionRepository
+from app.services.balance_checkpoint_service import BalanceCheckpointService
+
+
+def parse_month(value: str) -> date:
+    """``yyyy-mm`` to the first day of that month"""
+    try:
+        return datetime.strptime(value, "%Y-%m").date()
+    except ValueError:
+        raise ValidationException(message="Mês inválido, use o formato AAAA-MM", error_code="INVALID_MONTH")
+
+
+class StatementService:
+    """Monthly statements read from the ``monthly_statement`` rollup.
+
+    TransactionService calls ``record_entries`` with the ledger entries of
+    every movement, in the same transaction, so the current month's rows
+    are always up to date and a statement is a single-row read. Credits to
+    sharded accounts are the exception: they are left pending in the
+    ledger so they do not queue on the account's row here either, and are
+    added when BalanceShardService sequences them (next debit or rebalance).
+    ``close_month`` rebuilds a finished month from the transaction table,
+    carries accounts without movements forward from the previous month and
+    marks the rows closed; running it for past months backfills them.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.statement_repository = MonthlyStatementRepository(db)
+        self.transaction_repository = TransactionRepository(db)
+        self.response = ResponseHandler()
+
+    def get_statement(self, user_id: int, month: str) -> Dict[str, Any]:
+        try:
+            period = parse_month(month)
+            if period > month_start(utcnow()):
+                raise NotFoundException(message="Extrato ainda não disponível para este mês", error_code="STATEMENT_NOT_FOUND")
+
+            statement = self.statement_repository.get_statement(user_id, period)
+            if statement is not None:
+                return self._statement_response(period, statement)
+
+            # No movement this month: the balance is the last known closing
+            # balance, or rebuilt from checkpoints for accounts without rows.
+            previous = self.statement_repository.get_latest_before(user_id, period)
+            if previous is not None:
+                balance = previous.closing_balance
+            else:
+                until = min(datetime.combine(add_months(period, 1), datetime.min.time()), utcnow()) - timedelta(microseconds=1)
+                balance = BalanceCheckpointService(self.db).get_balance_at(user_id, until)
+            return self._statement_response(period, MonthlyStatement(
+                opening_balance=balance,
+                closing_balance=balance,
+                **dict.fromkeys(TOTAL_COLUMNS, 0)
+            ))
+        except AppException:
+            raise
+        except Exception as e:
+            raise DatabaseException(message=f"Erro ao recuperar extrato mensal: {str(e)}")
+
+    def record_entries(self, entries: Iterable[Dict[str, Any]]) -> None:
+        """Add sequenced ledger entries to the month of their ``created_at``, without committing; pending ones are skipped"""
+        months: Dict[date, Dict[int, Dict[str, int]]] = {}
+        for entry in entries:
+            if entry.get("balance_after") is None:
+                continue
+            movements = months.setdefault(month_start(entry["created_at"]), {})
+            movement = movements.setdefault(entry["account_id"], dict.fromkeys((*TOTAL_COLUMNS, "net"), 0))
+            amount = entry["amount"]
+            if entry["transaction_type"] == TYPE_TRANSACTION_DEPOSIT:
+                movement["deposits"] += amount
+            elif entry["transaction_type"] == TYPE_TRANSACTION_WITHDRAW:
+                movement["withdrawals"] -= amount
+            elif amount > 0:
+                movement["transfers_in"] += amount
+            else:
+                movement["transfers_out"] -= amount
+            movement["transaction_count"] += 1
+            movement["net"] += amount
+            movement["balance"] = entry.get("balance_after")
+
+        for month, movements in sorted(months.items()):
+            self.statement_repository.add_movements(month, movements)
+
+    def close_month(self, month: date, now: Optional[datetime] = None) -> int:
+        """Rebuild and close every statement of a finished month, returning how many"""
+        now = now or utcnow()
+        end = add_months(month, 1)
+        if end > now.date():
+            raise ValidationException(message="O mês ainda não terminou", error_code="MONTH_NOT_FINISHED")
+
+        start_at = datetime.combine(month, datetime.min.time())
+        end_at = datetime.combine(end, datetime.min.time())
+        try:
+            totals = self.transaction_repository.get_period_totals(start_at, end_at)
+            previous = self.statement_repository.get_closing_balances(add_months(month, -1))
+            checkpoints = BalanceCheckpointService(self.db)
+
+            rows = []
+            for account_id in sorted(set(totals) | set(previous)):
+                opening = previous.get(account_id)
+                if opening is None:
+                    opening = checkpoints.get_balance_at(account_id, start_at - timedelta(microseconds=1))
+                period_totals = totals.get(account_id)
+                row = {column: period_totals[column] if period_totals else 0 for column in TOTAL_COLUMNS}
+                rows.append({
+                    "account_id": account_id,
+                    "opening_balance": opening,
+                    "closing_balance": (
+                        opening + row["deposits"] + row["transfers_in"] - row["withdrawals"] - row["transfers_out"]
+                    ),
+                    **row,
+                    "closed_at": now
+                })
+            self.statement_repository.replace_month(month, rows)
+            self.statement_repository.commit()
+        except Exception:
+            self.statement_repository.rollback()
+            raise
+        return len(rows)
+
+    def _statement_response(self, month: date, statement: MonthlyStatement) -> Dict[str, Any]:
+        total_in = statement.deposits + statement.transfers_in
+        total_out = statement.withdrawals + statement.transfers_out
+        return self.response.success(
+            data={
+                "month": month.strftime("%Y-%m"),
+                "opening_balance": from_cents(statement.opening_balance),
+                "closing_balance": from_cents(statement.closing_balance),
+                "total_in": from_cents(total_in),
+                "total_out": from_cents(total_out),
+                "deposits": from_cents(statement.deposits),
+                "withdrawals": from_cents(statement.withdrawals),
+                "transfers_in": from_cents(statement.transfers_in),
+                "transfers_out": from_cents(statement.transfers_out),
+                "transaction_count": statement.transaction_count,
+                "closed": statement.closed_at is not None
+            },
+            message="Extrato mensal recuperado com sucesso"
+        )
@@ -0,0 +1,133 @@
+import gzip
+import os
+import re
+from datetime import date, datetime
+from sqlalchemy.orm import Session
+from typing import List, Optional, Tuple
+from app.core import config
+from app.core.clock import utcnow, month_start, add_months
+from app.core.exceptions import BadRequestException
+from app.repositories.transaction_repository import TransactionRepository
+from app.services.balance_checkpoint_service import BalanceCheckpointService
+
+PARTITION_PREFIX = "transaction_y"
+PARTITION_NAME = re.compile(r"^transaction_y(\d{4})m(\d{2})$")
+
+
+def partition_name(month: date) -> str:
+    return f"{PARTITION_PREFIX}{month.year:04d}m{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[date]:
+    match = PARTITION_NAME.match(name)
+    return date(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+
+def partition_bounds(month: date) -> Tuple[datetime, datetime]:
+    """``[start, end)`` of a month's partition"""
+    return (
+        datetime.combine(month, datetime.min.time()),
+        datetime.combine(add_months(month, 1), datetime.min.time())
+    )
+
+
+class TransactionPartitionService:
+    """Monthly range partitions of ``transaction`` on PostgreSQL.
+
+    ``create_partitions`` keeps partitions ready for the coming months (new
+    rows that find none land in ``transaction_default``, and a month cannot
+    get its partition once the default holds rows for it). ``archive_partitions``
+    detaches the months older than the retention window, writes each one
+    to a gzipped CSV file and only then drops the table, so an interrupted
+    run is resumed by running it again. A partition is only archived once
+    balance checkpoints cover all of its rows, since balances are rebuilt
+    from the latest checkpoint plus the transactions after it; balances at
+    times inside archived months are no longer exact.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.transaction_repository = TransactionRepository(db)
+        self.checkpoint_service = BalanceCheckpointService(db)
+
+    def create_partitions(self, months_ahead: int = config.TRANSACTION_PARTITION_MONTHS_AHEAD, now: Optional[datetime] = None) -> List[str]:
+        """Create the partitions of the current and next ``months_ahead`` months, returning the new ones"""
+        self._require_partitioned()
+        current = month_start(now or utcnow())
+        existing = self.transaction_repository.get_partitions(PARTITION_PREFIX)
+        created = []
+        try:
+            for offset in range(months_ahead + 1):
+                month = add_months(current, offset)
+                name = partition_name(month)
+                if name in existing:
+                    continue
+                self.transaction_repository.create_partition(name, *partition_bounds(month))
+                created.append(name)
+            self.transaction_repository.commit()
+        except Exception:
+            self.transaction_repository.rollback()
+            raise
+        return created
+
+    def archive_partitions(
+        self,
+        retention_months: int = config.TRANSACTION_RETENTION_MONTHS,
+        archive_dir: str = config.TRANSACTION_ARCHIVE_DIR,
+        now: Optional[datetime] = None
+    ) -> List[str]:
+        """Move every partition older than ``retention_months`` to ``archive_dir``, returning the archive paths"""
+        self._require_partitioned()
+        cutoff = add_months(month_start(now or utcnow()), -retention_months)
+        os.makedirs(archive_dir, exist_ok=True)
+
+        archived = []
+        partitions = self.transaction_repository.get_partitions(PARTITION_PREFIX)
+        for name, attached in sorted(partitions.items()):
+            month = partition_month(name)
+            if month is None or month >= cutoff:
+                continue
+            try:
+                self._require_checkpoints(name)
+                if attached:
+                    self.transaction_repository.detach_partition(name)
+                    self.transaction_repository.commit()
+
+                path = os.path.join(archive_dir, f"{name}.csv.gz")
+                partial = f"{path}.partial"
+                with open(partial, "wb") as raw:
+                    with gzip.open(raw, "wt", encoding="utf-8", newline="") as file:
+                        self.transaction_repository.copy_partition(name, file)
+                    # The rows only exist in this file once the table is dropped
+                    raw.flush()
+                    os.fsync(raw.fileno())
+                os.replace(partial, path)
+
+                self.transaction_repository.drop_partition(name)
+                self.transaction_repository.commit()
+            except Exception:
+                self.transaction_repository.rollback()
+                raise
+            archived.append(path)
+        return archived
+
+    def _require_checkpoints(self, name: str) -> None:
+        """Checkpoint up to the partition's last row, refusing to go on if that is not possible yet"""
+        max_id = self.transaction_repository.get_partition_max_id(name)
+        if max_id is None:
+            return
+        checkpoints = self.checkpoint_service.checkpoint_repository
+        if checkpoints.get_last_transaction_id() < max_id:
+            self.checkpoint_service.create_checkpoints()
+        if checkpoints.get_last_transaction_id() < max_id:
+            raise BadRequestException(
+                message=f"Os checkpoints de saldo ainda não cobrem a partição {name}; tente novamente mais tarde",
+                error_code="CHECKPOINTS_BEHIND"
+            )
+
+    def _require_partitioned(self) -> None:
+        if self.db.get_bind().dialect.name != "postgresql" or not self.transaction_repository.is_partitioned():
+            raise BadRequestException(
+                message="A tabela transaction não é particionada; aplique as migrações no PostgreSQL",
+                error_code="TRANSACTION_NOT_PARTITIONED"
+            )
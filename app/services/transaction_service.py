@@ -1,86 +1,367 @@
+from sqlalchemy import Row
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
 from app.repositories.person_repository import PersonRepository
 from app.repositories.transaction_repository import TransactionRepository
+from app.repositories.balance_shard_repository import BalanceShardRepository
+from app.repositories.ledger_repository import LedgerRepository
+from app.repositories.outbox_repository import OutboxRepository
+from app.services.idempotency_service import IdempotencyService, Remember
+from app.services.transfer_pipeline import transfer_pipeline
+from app.services.balance_checkpoint_service import BalanceCheckpointService
+from app.services.balance_shard_service import BalanceShardService
+from app.services.statement_service import StatementService
+from app.services.analytics_service import AnalyticsService
+from app.services.balance_cache import cached_balance, store_balance, stage_balances
+from app.services.profile_service import ProfileService
 from app.models.person import Person, TYPE_NATURAL_PERSON
-from app.schemas.transaction import TransferRequest, DepositRequest, WithdrawRequest
+from app.schemas.transaction import (
+    TransferRequest,
+    DepositRequest,
+    WithdrawRequest,
+    BatchTransferRequest,
+    BatchTransferItem,
+    HistoryFilters,
+    BATCH_MODE_ALL_OR_NOTHING
+)
 from app.models.transaction import TYPE_TRANSACTION_DEPOSIT, TYPE_TRANSACTION_WITHDRAW, TYPE_TRANSACTION_TRANSFER
-from typing import Dict, Any
+from typing import Dict, Any, Optional, List, Tuple, Iterable, Iterator
+from collections import defaultdict
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from app.core import config
 from app.core.response_handler import ResponseHandler
+from app.core.money import from_cents
+from app.core.clock import utcnow
+from app.core.cursor import encode_cursor, decode_cursor
+from app.core.retry import retry_on_conflict
 from app.core.exceptions import (
     BadRequestException,
+    ConcurrentUpdateException,
     DatabaseException,
     AppException,
-    NotFoundException
+    NotFoundException,
+    ValidationException
 )
 
+OUTBOX_EVENT_TYPES = {
+    TYPE_TRANSACTION_DEPOSIT: "transaction.deposit",
+    TYPE_TRANSACTION_WITHDRAW: "transaction.withdraw",
+    TYPE_TRANSACTION_TRANSFER: "transaction.transfer"
+}
+
+HISTORY_TRANSACTION_TYPES = {
+    "deposit": TYPE_TRANSACTION_DEPOSIT,
+    "withdraw": TYPE_TRANSACTION_WITHDRAW,
+    "transfer": TYPE_TRANSACTION_TRANSFER
+}
+
+# Keyed by the description_key TransactionRepository computes in SQL
+HISTORY_DESCRIPTIONS = {
+    "deposit": "Depósito",
+    "withdraw": "Saque",
+    "transfer_sent": "Transferência enviada para ID {counterparty_id}",
+    "transfer_received": "Transferência recebida de ID {counterparty_id}"
+}
+
+HISTORY_EXPORT_CSV = "csv"
+HISTORY_EXPORT_NDJSON = "ndjson"
+HISTORY_EXPORT_FIELDS = ["id", "created_at", "type", "direction", "amount", "description"]
+
 class TransactionService:
     def __init__(self, db: Session):
         self.db = db
         self.person_repository = PersonRepository(db)
         self.transaction_repository = TransactionRepository(db)
+        self.balance_shard_repository = BalanceShardRepository(db)
+        self.ledger_repository = LedgerRepository(db)
+        self.outbox_repository = OutboxRepository(db)
+        self.balance_shard_service = BalanceShardService(db)
+        self.idempotency_service = IdempotencyService(db)
+        self.statement_service = StatementService(db)
+        self.analytics_service = AnalyticsService(db)
+        self.profile_service = ProfileService(db)
         self.response = ResponseHandler()
     
-    def transfer(self, data: TransferRequest, current_user: Person) -> Dict[str, Any]:
+    def transfer(self, data: TransferRequest, current_user: Person, idempotency_key: Optional[str] = None) -> Dict[str, Any]:
+        # Keyed requests stay on the direct path so the idempotency record
+        # commits in the same transaction as the transfer.
+        if idempotency_key is None and transfer_pipeline.is_running:
+            return self._transfer_via_pipeline(data, current_user)
+        
+        return self.idempotency_service.execute(
+            user_id=current_user.id,
+            key=idempotency_key,
+            endpoint="transfer",
+            payload=data.model_dump(),
+            operation=lambda remember: retry_on_conflict(
+                self.db, lambda: self._transfer(data, current_user, remember)
+            )
+        )
+    
+    def batch_transfer(self, data: BatchTransferRequest, current_user: Person, idempotency_key: Optional[str] = None) -> Dict[str, Any]:
+        return self.idempotency_service.execute(
+            user_id=current_user.id,
+            key=idempotency_key,
+            endpoint="transfer_batch",
+            payload=data.model_dump(),
+            operation=lambda remember: retry_on_conflict(
+                self.db, lambda: self._batch_transfer(data, current_user, remember)
+            )
+        )
+    
+    def deposit(self, data: DepositRequest, current_user: Person, idempotency_key: Optional[str] = None) -> Dict[str, Any]:
+        return self.idempotency_service.execute(
+            user_id=current_user.id,
+            key=idempotency_key,
+            endpoint="deposit",
+            payload=data.model_dump(),
+            operation=lambda remember: retry_on_conflict(
+                self.db, lambda: self._deposit(data, current_user, remember)
+            )
+        )
+    
+    def withdraw(self, data: WithdrawRequest, current_user: Person, idempotency_key: Optional[str] = None) -> Dict[str, Any]:
+        return self.idempotency_service.execute(
+            user_id=current_user.id,
+            key=idempotency_key,
+            endpoint="withdraw",
+            payload=data.model_dump(),
+            operation=lambda remember: retry_on_conflict(
+                self.db, lambda: self._withdraw(data, current_user, remember)
+            )
+        )
+    
+    def execute_transfer(self, sender_id: int, recipient_id: int, amount: int) -> Dict[str, Any]:
+        """Validate and write a transfer in the current DB transaction without committing"""
+        sender = self._validate_sender(sender_id)
+        recipient = self._validate_recipient(recipient_id, sender.id)
+        
+        if self._available_balance(sender) < amount:
+            raise BadRequestException(message="Saldo insuficiente", error_code="INSUFFICIENT_FUNDS")
+        
+        return self._apply_transfer(sender, recipient, amount)
+    
+    def _transfer(self, data: TransferRequest, current_user: Person, remember: Remember) -> Dict[str, Any]:
         try:
             sender = self._validate_sender(current_user.id)
             recipient = self._validate_recipient(data.recipient_id, sender.id)
             
-            if sender.balance < data.amount:
+            if self._available_balance(sender) < data.amount:
                 raise BadRequestException(message="Saldo insuficiente", error_code="INSUFFICIENT_FUNDS")
             
             try:
-                self.person_repository.begin_transaction()
-                
-                self.person_repository.update_balance(sender.id, -data.amount)
-                self.person_repository.update_balance(recipient.id, data.amount)
+                result = self._apply_transfer(sender, recipient, data.amount)
+                remember(result)
+                self.person_repository.commit()
                 
-                transaction = self.transaction_repository.create_transaction(
-                    amount=data.amount,
-                    transaction_type=TYPE_TRANSACTION_TRANSFER,
-                    sender_id=sender.id,
-                    recipient_id=recipient.id
+                return result
+            except StaleDataError:
+                self.person_repository.rollback()
+                raise ConcurrentUpdateException()
+            except Exception as e:
+                self.person_repository.rollback()
+                raise DatabaseException(message=f"Falha na transferência: {str(e)}")
+        
+        except AppException:
+            raise
+        except Exception as e:
+            raise DatabaseException(message=f"Erro na transferência: {str(e)}")
+    
+    def _transfer_via_pipeline(self, data: TransferRequest, current_user: Person) -> Dict[str, Any]:
+        sender_id = current_user.id
+        
+        def submit() -> Dict[str, Any]:
+            return transfer_pipeline.submit(
+                lambda db: TransactionService(db).execute_transfer(sender_id, data.recipient_id, data.amount)
+            ).result()
+        
+        try:
+            return retry_on_conflict(self.db, submit)
+        except AppException:
+            raise
+        except Exception as e:
+            raise DatabaseException(message=f"Falha na transferência: {str(e)}")
+    
+    def _apply_transfer(self, sender: Person, recipient: Person, amount: int) -> Dict[str, Any]:
+        updated_sender = self._debit(sender, amount)
+        self._credit(recipient, amount)
+        
+        created_at = utcnow()
+        transaction = self.transaction_repository.create_transaction(
+            amount=amount,
+            transaction_type=TYPE_TRANSACTION_TRANSFER,
+            sender_id=sender.id,
+            recipient_id=recipient.id,
+            created_at=created_at
+        )
+        new_balance = self._available_balance(updated_sender)
+        self._post_entries([
+            self._ledger_entry(
+                sender, -amount, transaction.id, TYPE_TRANSACTION_TRANSFER, recipient.id,
+                self._balance_after_debit(updated_sender, amount)
+            ),
+            self._ledger_entry(recipient, amount, transaction.id, TYPE_TRANSACTION_TRANSFER, sender.id)
+        ], created_at)
+        
+        return self.response.success(
+            data={
+                "transaction_id": transaction.id,
+                "amount": from_cents(amount),
+                "new_balance": from_cents(new_balance)
+            },
+            message="Transferência concluída com sucesso"
+        )
+    
+    def _batch_transfer(self, data: BatchTransferRequest, current_user: Person, remember: Remember) -> Dict[str, Any]:
+        try:
+            sender = self._validate_sender(current_user.id)
+            recipients = {
+                recipient.id: recipient
+                for recipient in self.person_repository.get_by_ids({item.recipient_id for item in data.items})
+            }
+            
+            items = []
+            accepted = []
+            available = self._available_balance(sender)
+            for index, item in enumerate(data.items):
+                error = self._batch_item_error(item, sender.id, recipients, available)
+                item_result = {
+                    "index": index,
+                    "recipient_id": item.recipient_id,
+                    "amount": from_cents(item.amount),
+                    "status": "failed" if error else "success",
+                }
+                if error:
+                    item_result.update(error)
+                else:
+                    available -= item.amount
+                    accepted.append((item_result, item))
+                items.append(item_result)
+            
+            failed_count = len(items) - len(accepted)
+            if not accepted or (failed_count and data.mode == BATCH_MODE_ALL_OR_NOTHING):
+                raise BadRequestException(
+                    message="Lote de transferências rejeitado",
+                    data={"items": items},
+                    error_code="BATCH_REJECTED"
                 )
+            
+            try:
+                total = sum(item.amount for _, item in accepted)
+                updated_sender = self._debit(sender, total)
                 
-                self.person_repository.commit()
+                credits = defaultdict(int)
+                for _, item in accepted:
+                    credits[item.recipient_id] += item.amount
+                for recipient_id, amount in credits.items():
+                    if recipients[recipient_id].balance_shards:
+                        self._credit(recipients[recipient_id], amount)
+                self.person_repository.credit_balances({
+                    recipient_id: amount
+                    for recipient_id, amount in credits.items()
+                    if not recipients[recipient_id].balance_shards
+                })
                 
-                return self.response.success(
+                created_at = utcnow()
+                transaction_ids = self.transaction_repository.create_transactions([
+                    {
+                        "amount": item.amount,
+                        "transaction_type": TYPE_TRANSACTION_TRANSFER,
+                        "sender_id": sender.id,
+                        "recipient_id": item.recipient_id,
+                        "created_at": created_at
+                    }
+                    for _, item in accepted
+                ])
+                for (item_result, _), transaction_id in zip(accepted, transaction_ids):
+                    item_result["transaction_id"] = transaction_id
+                
+                # Running balances per leg: the sender goes down from its balance
+                # before the batch, each recipient goes up to its balance after it.
+                new_balance = self._available_balance(updated_sender)
+                running = {sender.id: self._balance_after_debit(updated_sender, total) + total}
+                for recipient_id, amount in credits.items():
+                    if not recipients[recipient_id].balance_shards:
+                        running[recipient_id] = recipients[recipient_id].balance - amount
+                entries = []
+                for (_, item), transaction_id in zip(accepted, transaction_ids):
+                    running[sender.id] -= item.amount
+                    entries.append(self._ledger_entry(
+                        sender, -item.amount, transaction_id, TYPE_TRANSACTION_TRANSFER, item.recipient_id, running[sender.id]
+                    ))
+                    recipient_balance = None
+                    if item.recipient_id in running:
+                        running[item.recipient_id] += item.amount
+                        recipient_balance = running[item.recipient_id]
+                    entries.append(self._ledger_entry(
+                        recipients[item.recipient_id], item.amount, transaction_id, TYPE_TRANSACTION_TRANSFER, sender.id, recipient_balance
+                    ))
+                self._post_entries(entries, created_at)
+                
+                result = self.response.success(
                     data={
-                        "transaction_id": transaction.id,
-                        "amount": data.amount,
-                        "new_balance": sender.balance - data.amount
+                        "mode": data.mode,
+                        "total_amount": from_cents(total),
+                        "new_balance": from_cents(new_balance),
+                        "succeeded": len(accepted),
+                        "failed": failed_count,
+                        "items": items
                     },
-                    message="Transferência concluída com sucesso"
+                    message="Lote de transferências processado com sucesso"
                 )
+                remember(result)
+                self.person_repository.commit()
+                
+                return result
+            except StaleDataError:
+                self.person_repository.rollback()
+                raise ConcurrentUpdateException()
             except Exception as e:
                 self.person_repository.rollback()
-                raise DatabaseException(message=f"Falha na transferência: {str(e)}")
+                raise DatabaseException(message=f"Falha no lote de transferências: {str(e)}")
         
         except AppException:
             raise
         except Exception as e:
-            raise DatabaseException(message=f"Erro na transferência: {str(e)}")
+            raise DatabaseException(message=f"Erro no lote de transferências: {str(e)}")
     
-    def deposit(self, data: DepositRequest, current_user: Person) -> Dict[str, Any]:
+    def _deposit(self, data: DepositRequest, current_user: Person, remember: Remember) -> Dict[str, Any]:
         try:
             user = self._validate_natural_person(current_user.id)
             
             try:
-                updated_user = self.person_repository.update_balance(user.id, data.amount)
+                updated_user = self._credit(user, data.amount)
                 
+                created_at = utcnow()
                 transaction = self.transaction_repository.create_transaction(
                     amount=data.amount,
                     transaction_type=TYPE_TRANSACTION_DEPOSIT,
-                    sender_id=user.id
+                    sender_id=user.id,
+                    created_at=created_at
                 )
+                self._post_entries([
+                    self._ledger_entry(updated_user, data.amount, transaction.id, TYPE_TRANSACTION_DEPOSIT)
+                ], created_at)
                 
-                return self.response.success(
+                result = self.response.success(
                     data={
                         "transaction_id": transaction.id,
-                        "amount": data.amount,
-                        "new_balance": updated_user.balance
+                        "amount": from_cents(data.amount),
+                        "new_balance": from_cents(self._available_balance(updated_user))
                     },
                     message="Depósito realizado com sucesso"
                 )
+                remember(result)
+                self.person_repository.commit()
+                
+                return result
+            except StaleDataError:
+                self.person_repository.rollback()
+                raise ConcurrentUpdateException()
             except Exception as e:
                 self.person_repository.rollback()
                 raise DatabaseException(message=f"Falha no depósito: {str(e)}")
@@ -90,30 +371,46 @@ class TransactionService:
         except Exception as e:
             raise DatabaseException(message=f"Erro no depósito: {str(e)}")
     
-    def withdraw(self, data: WithdrawRequest, current_user: Person) -> Dict[str, Any]:
+    def _withdraw(self, data: WithdrawRequest, current_user: Person, remember: Remember) -> Dict[str, Any]:
         try:
             user = self._validate_natural_person(current_user.id)
             
-            if user.balance < data.amount:
+            if self._available_balance(user) < data.amount:
                 raise BadRequestException(message="Saldo insuficiente", error_code="INSUFFICIENT_FUNDS")
             
             try:
-                updated_user = self.person_repository.update_balance(user.id, -data.amount)
+                updated_user = self._debit(user, data.amount)
                 
+                created_at = utcnow()
                 transaction = self.transaction_repository.create_transaction(
                     amount=data.amount,
                     transaction_type=TYPE_TRANSACTION_WITHDRAW,
-                    sender_id=user.id
+                    sender_id=user.id,
+                    created_at=created_at
                 )
+                new_balance = self._available_balance(updated_user)
+                self._post_entries([
+                    self._ledger_entry(
+                        updated_user, -data.amount, transaction.id, TYPE_TRANSACTION_WITHDRAW,
+                        balance_after=self._balance_after_debit(updated_user, data.amount)
+                    )
+                ], created_at)
                 
-                return self.response.success(
+                result = self.response.success(
                     data={
                         "transaction_id": transaction.id,
-                        "amount": data.amount,
-                        "new_balance": updated_user.balance
+                        "amount": from_cents(data.amount),
+                        "new_balance": from_cents(new_balance)
                     },
                     message="Saque realizado com sucesso"
                 )
+                remember(result)
+                self.person_repository.commit()
+                
+                return result
+            except StaleDataError:
+                self.person_repository.rollback()
+                raise ConcurrentUpdateException()
             except Exception as e:
                 self.person_repository.rollback()
                 raise DatabaseException(message=f"Falha no saque: {str(e)}")
@@ -123,53 +420,149 @@ class TransactionService:
         except Exception as e:
             raise DatabaseException(message=f"Erro no saque: {str(e)}")
 
-    def get_transaction_history(self, user_id: int) -> Dict[str, Any]:
+    def get_transaction_history(
+        self,
+        user_id: int,
+        limit: int = config.HISTORY_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        filters: Optional[HistoryFilters] = None
+    ) -> Dict[str, Any]:
         try:
             user = self.person_repository.get_by_id(user_id)
             if not user:
                 raise NotFoundException(message="Usuário não encontrado", error_code="USER_NOT_FOUND")
-                
-            transactions = self.transaction_repository.get_user_transactions(user_id)
-            
-            formatted_transactions = []
-            for transaction in transactions:
-                transaction_data = {
-                    "id": transaction.id,
-                    "amount": transaction.amount,
-                    "created_at": transaction.created_at,
-                    "type": transaction.transaction_type
-                }
-                
-                if transaction.transaction_type == TYPE_TRANSACTION_TRANSFER:
-                    if transaction.sender_id == user_id:
-                        transaction_data["description"] = f"Transferência enviada para ID {transaction.recipient_id}"
-                        transaction_data["direction"] = "out"
-                    else:
-                        transaction_data["description"] = f"Transferência recebida de ID {transaction.sender_id}"
-                        transaction_data["direction"] = "in"
-                elif transaction.transaction_type == TYPE_TRANSACTION_DEPOSIT:
-                    transaction_data["description"] = "Depósito"
-                    transaction_data["direction"] = "in"
-                elif transaction.transaction_type == TYPE_TRANSACTION_WITHDRAW:
-                    transaction_data["description"] = "Saque"
-                    transaction_data["direction"] = "out"
-                
-                formatted_transactions.append(transaction_data)
+            
+            # One extra row tells whether another page exists.
+            transactions = self.transaction_repository.get_user_transactions_page(
+                user_id, limit=limit + 1, before=self._decode_history_cursor(cursor), **self._history_filters(filters)
+            )
+            next_cursor = None
+            if len(transactions) > limit:
+                transactions = transactions[:limit]
+                last = transactions[-1]
+                next_cursor = encode_cursor({"created_at": last.created_at.isoformat(), "id": last.id})
+            
+            # Names for the whole page in one batched lookup, not one request per row
+            counterparties = self.profile_service.get_counterparties(
+                {row.counterparty_id for row in transactions if row.counterparty_id is not None}
+            )
+            formatted_transactions = [
+                {**self._format_history_row(row), "counterparty": counterparties.get(row.counterparty_id)}
+                for row in transactions
+            ]
             
             return self.response.success(
                 data={
-                    "transactions": formatted_transactions
+                    "transactions": formatted_transactions,
+                    "next_cursor": next_cursor
                 },
                 message="Extrato de transações recuperado com sucesso"
             )
         
+        except AppException:
+            raise
         except Exception as e:
-            if not isinstance(e, NotFoundException):
-                raise DatabaseException(message=f"Erro ao recuperar extrato: {str(e)}")
+            raise DatabaseException(message=f"Erro ao recuperar extrato: {str(e)}")
+    
+    def export_transaction_history(
+        self,
+        user_id: int,
+        export_format: str,
+        filters: Optional[HistoryFilters] = None,
+        compress: bool = False
+    ) -> Iterator[bytes]:
+        """Whole history as CSV or NDJSON chunks, read through a server-side cursor.
+
+        Validation happens here, before the first chunk, so errors still get
+        a proper status; the returned generator then keeps at most one
+        chunk of ``HISTORY_EXPORT_CHUNK_ROWS`` rows in memory.
+        """
+        try:
+            user = self.person_repository.get_by_id(user_id)
+            if not user:
+                raise NotFoundException(message="Usuário não encontrado", error_code="USER_NOT_FOUND")
+        except AppException:
             raise
+        except Exception as e:
+            raise DatabaseException(message=f"Erro ao exportar extrato: {str(e)}")
+        
+        transactions = self.transaction_repository.stream_user_transactions(
+            user_id, config.HISTORY_EXPORT_CHUNK_ROWS, **self._history_filters(filters)
+        )
+        rows = (self._format_history_row(row) for row in transactions)
+        encode = self._encode_csv if export_format == HISTORY_EXPORT_CSV else self._encode_ndjson
+        chunks = encode(rows)
+        return self._gzip(chunks) if compress else chunks
+    
+    def _format_history_row(self, row: Row) -> Dict[str, Any]:
+        return {
+            "id": row.id,
+            "amount": from_cents(row.amount),
+            "created_at": row.created_at,
+            "type": row.transaction_type,
+            "description": HISTORY_DESCRIPTIONS[row.description_key].format(counterparty_id=row.counterparty_id),
+            "direction": row.direction
+        }
+    
+    def _encode_csv(self, rows: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=HISTORY_EXPORT_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        for count, row in enumerate(rows, 1):
+            writer.writerow({**row, "created_at": row["created_at"].isoformat()})
+            if count % config.HISTORY_EXPORT_CHUNK_ROWS == 0:
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue().encode("utf-8")
+    
+    def _encode_ndjson(self, rows: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+        lines = []
+        for row in rows:
+            lines.append(json.dumps(
+                {**row, "created_at": row["created_at"].isoformat()}, ensure_ascii=False, separators=(",", ":")
+            ))
+            if len(lines) == config.HISTORY_EXPORT_CHUNK_ROWS:
+                yield ("\n".join(lines) + "\n").encode("utf-8")
+                lines = []
+        if lines:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+    
+    def _gzip(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        compressor = zlib.compressobj(wbits=31)  # 31: gzip header and trailer
+        for chunk in chunks:
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
+    
+    def _history_filters(self, filters: Optional[HistoryFilters]) -> Dict[str, Any]:
+        if filters is None:
+            return {}
+        values = filters.model_dump(exclude_none=True, exclude={"type"})
+        if filters.type is not None:
+            values["transaction_type"] = HISTORY_TRANSACTION_TYPES[filters.type]
+        return values
+    
+    def _decode_history_cursor(self, cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+        if cursor is None:
+            return None
+        values = decode_cursor(cursor)
+        try:
+            return datetime.fromisoformat(values["created_at"]), int(values["id"])
+        except (KeyError, TypeError, ValueError):
+            raise ValidationException(message="Cursor de paginação inválido", error_code="INVALID_CURSOR")
         
-    def get_balance(self, user_id: int) -> Dict[str, Any]:
+    def get_balance(self, user_id: int, at: Optional[datetime] = None) -> Dict[str, Any]:
         try:
+            if at is None:
+                balance = cached_balance(user_id)
+                if balance is not None:
+                    return self.response.success(
+                        data={"balance": from_cents(balance)},
+                        message="Saldo recuperado com sucesso"
+                    )
+            
             user = self.person_repository.get_by_id(user_id)
             
             if not user:
@@ -178,8 +571,17 @@ class TransactionService:
                     error_code="USER_NOT_FOUND"
                 )
             
+            if at is not None:
+                balance = BalanceCheckpointService(self.db).get_balance_at(user.id, at)
+                return self.response.success(
+                    data={"balance": from_cents(balance), "at": at},
+                    message="Saldo recuperado com sucesso"
+                )
+            
+            if not user.balance_shards:
+                store_balance(user.id, user.version, user.balance)
             return self.response.success(
-                data={"balance": user.balance},
+                data={"balance": from_cents(self._available_balance(user))},
                 message="Saldo recuperado com sucesso"
             )
             
@@ -189,6 +591,105 @@ class TransactionService:
             raise
 
 
+    def _available_balance(self, person: Person) -> int:
+        return self.balance_shard_repository.get_available_balance(person)
+    
+    def _credit(self, person: Person, amount: int) -> Person:
+        # Sharded (hot) accounts take credits on a shard row so concurrent
+        # transfers to them do not all wait on the same person row.
+        if person.balance_shards:
+            self.balance_shard_repository.credit(person.id, amount, person.balance_shards)
+            return person
+        return self.person_repository.update_balance(person.id, amount)
+    
+    def _debit(self, person: Person, amount: int) -> Person:
+        if person.balance_shards:
+            # Shard credits wait in the ledger without a seq; number them
+            # before this debit's entry, under the account lock.
+            person = self.person_repository.get_for_update(person.id)
+            self.balance_shard_service.sequence_pending(person.id)
+            if person.balance < amount:
+                drained = self.balance_shard_repository.drain(person.id, amount - person.balance)
+                return self.person_repository.update_balance(person.id, drained - amount)
+        return self.person_repository.update_balance(person.id, -amount)
+    
+    def _balance_after_debit(self, person: Person, amount: int) -> int:
+        # Running balance for the ledger entry of a debit ``_debit`` just applied.
+        # A sharded account's live total may already include shard credits
+        # committed after ``_debit`` sequenced the pending ones; those are still
+        # pending and will be sequenced on top of this entry, so only the
+        # sequenced prefix counts here. It cannot move while the row is locked.
+        if not person.balance_shards:
+            return self._available_balance(person)
+        last = self.ledger_repository.get_last_entry(person.id)
+        return (last.balance_after if last else 0) - amount
+    
+    def _ledger_entry(
+        self,
+        account: Person,
+        amount: int,
+        transaction_id: int,
+        transaction_type: int,
+        counterparty_id: Optional[int] = None,
+        balance_after: Optional[int] = None
+    ) -> Dict[str, Any]:
+        # Credits to sharded accounts do not lock the account, so they are
+        # posted pending and sequenced later.
+        if balance_after is None and not (account.balance_shards and amount > 0):
+            balance_after = self._available_balance(account)
+        return {
+            "account_id": account.id,
+            "amount": amount,
+            "balance_after": balance_after,
+            "transaction_id": transaction_id,
+            "transaction_type": transaction_type,
+            "counterparty_id": counterparty_id
+        }
+    
+    def _post_entries(self, entries: List[Dict[str, Any]], created_at: datetime) -> None:
+        # The outbox rows and the monthly and daily rollups commit or roll back
+        # together with the ledger, so every committed movement is counted exactly once.
+        # ``created_at`` is the one written to the transaction rows, so the
+        # rollups bucket the entries exactly like a rebuild from that table.
+        for entry in entries:
+            entry["created_at"] = created_at
+        self.ledger_repository.post_entries(entries)
+        self.statement_service.record_entries(entries)
+        self.analytics_service.record_entries(entries)
+        self._stage_balances(entries)
+        self.outbox_repository.add_events(
+            [self._outbox_event(entry) for entry in entries],
+            config.OUTBOX_PARTITIONS
+        )
+    
+    def _stage_balances(self, entries: List[Dict[str, Any]]) -> None:
+        # Written through to the balance cache on commit. Sharded accounts are
+        # only invalidated: their credits change the balance without a version bump.
+        balances = {}
+        for entry in entries:
+            if entry["balance_after"] is not None:
+                account = self.person_repository.get_loaded(entry["account_id"])
+                balances[account.id] = (account.version, None if account.balance_shards else entry["balance_after"])
+        stage_balances(self.db, balances)
+    
+    def _outbox_event(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        direction = "in" if entry["amount"] > 0 else "out"
+        event_type = OUTBOX_EVENT_TYPES[entry["transaction_type"]]
+        if entry["transaction_type"] == TYPE_TRANSACTION_TRANSFER:
+            event_type += ".received" if direction == "in" else ".sent"
+        balance_after = entry.get("balance_after")
+        return {
+            "account_id": entry["account_id"],
+            "event_type": event_type,
+            "payload": {
+                "transaction_id": entry["transaction_id"],
+                "amount": from_cents(abs(entry["amount"])),
+                "direction": direction,
+                "counterparty_id": entry.get("counterparty_id"),
+                "balance": from_cents(balance_after) if balance_after is not None else None
+            }
+        }
+    
     def _validate_sender(self, sender_id: int) -> Person:
         sender = self.person_repository.get_by_id(sender_id)
         if not sender:
@@ -205,6 +706,15 @@ class TransactionService:
             
         return recipient
     
+    def _batch_item_error(self, item: BatchTransferItem, sender_id: int, recipients: Dict[int, Person], available: int) -> Optional[Dict[str, str]]:
+        if item.recipient_id == sender_id:
+            return {"error_code": "INVALID_RECIPIENT", "message": "Não é possível transferir para você mesmo"}
+        if item.recipient_id not in recipients:
+            return {"error_code": "USER_NOT_FOUND", "message": "Destinatário não encontrado"}
+        if available < item.amount:
+            return {"error_code": "INSUFFICIENT_FUNDS", "message": "Saldo insuficiente"}
+        return None
+    
     def _validate_natural_person(self, user_id: int) -> Person:
         user = self.person_repository.get_natural_person_by_id(user_id)
         if not user:
@@ -0,0 +1,128 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.core import config
+from app.core.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+Operation = Callable[[Session], Any]
+
+_STOP = object()
+
+
+class TransferPipeline:
+    """Group-commit pipeline for transfers.
+
+    Callers submit operations that write to a session without committing.
+    A single worker thread drains the queue in micro-batches (bounded by
+    ``batch_size`` and ``linger_ms``), runs each operation in its own
+    savepoint and commits the whole batch once, so concurrent transfers
+    share one commit/fsync. Each caller's future resolves with its own
+    result or exception only after the batch commits.
+
+    Operations run strictly in submission order on one thread, which keeps
+    the transfers of every account ordered within the process.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        batch_size: int = config.TRANSFER_PIPELINE_BATCH_SIZE,
+        linger_ms: float = config.TRANSFER_PIPELINE_LINGER_MS
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.linger_ms = linger_ms
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self.committed_batches = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.is_running:
+            return
+        self._thread = threading.Thread(target=self._run, name="transfer-pipeline", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the worker after the operations already queued are applied"""
+        if not self.is_running:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def submit(self, operation: Operation) -> Future:
+        future: Future = Future()
+        self._queue.put((operation, future))
+        return future
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch, stopping = self._next_batch()
+            if not batch:
+                continue
+            try:
+                self._apply(batch)
+            except Exception as e:
+                logger.error(f"Transfer pipeline batch of {len(batch)} failed: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _next_batch(self) -> Tuple[List[Tuple[Operation, Future]], bool]:
+        first = self._queue.get()
+        if first is _STOP:
+            return [], True
+
+        batch = [first]
+        deadline = time.monotonic() + self.linger_ms / 1000
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _apply(self, batch: List[Tuple[Operation, Future]]) -> None:
+        db = self.session_factory()
+        outcomes = []
+        try:
+            for operation, future in batch:
+                savepoint = db.begin_nested()
+                try:
+                    result = operation(db)
+                    savepoint.commit()
+                    outcomes.append((future, result, None))
+                except Exception as e:
+                    savepoint.rollback()
+                    outcomes.append((future, None, e))
+            db.commit()
+            self.committed_batches += 1
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        for future, result, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+
+transfer_pipeline = TransferPipeline()
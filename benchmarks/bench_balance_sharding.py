@@ -0,0 +1,65 @@
+"""Throughput of concurrent transfers into one hot account by shard count.
+
+Usage:
+    python -m benchmarks.bench_balance_sharding --database-url postgresql://... --shards 0 4 16
+
+Every transfer credits the same recipient. Unsharded, each one waits for the
+row lock on that recipient's ``person`` row until the previous transfer
+commits; sharded, the credits are spread over N shard rows instead. Whether
+that buys throughput depends on the database and on what else each transfer
+locks, so no speedup is claimed until this has been measured on Postgres.
+SQLite serializes all writers on the database file and shows no difference
+between shard counts.
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from benchmarks.common import make_session_factory, measure, seed_accounts
+from app.core.retry import retry_on_conflict
+from app.services.balance_shard_service import BalanceShardService
+from app.services.transaction_service import TransactionService
+
+INITIAL_BALANCE = 10_000_000
+
+
+def run(session_factory, senders, recipient_id, transfers, threads):
+    def transfer(index):
+        db = session_factory()
+
+        def attempt():
+            TransactionService(db).execute_transfer(senders[index % len(senders)], recipient_id, 100)
+            db.commit()
+
+        try:
+            retry_on_conflict(db, attempt, attempts=50)
+        finally:
+            db.close()
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(transfer, range(transfers)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--transfers", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--shards", type=int, nargs="+", default=[0, 4, 16])
+    args = parser.parse_args()
+
+    for shard_count in args.shards:
+        session_factory = make_session_factory(args.database_url)
+        # One sender per thread, so concurrent transfers rarely share a sender row.
+        recipient_id, *senders = seed_accounts(session_factory, args.threads + 1, INITIAL_BALANCE)
+        db = session_factory()
+        BalanceShardService(db).set_shard_count(recipient_id, shard_count)
+        db.close()
+
+        measure(
+            f"shards={shard_count}",
+            lambda: run(session_factory, senders, recipient_id, args.transfers, args.threads),
+            args.transfers
+        )
+
+
+if __name__ == "__main__":
+    main()
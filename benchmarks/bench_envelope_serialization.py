@@ -0,0 +1,80 @@
+"""Envelope serialization: jsonable_encoder + json vs. the response model vs. orjson.
+
+Usage:
+    python -m benchmarks.bench_envelope_serialization --items 10000 --rounds 20
+
+Builds one history page of ``--items`` transfers, shaped exactly as
+``TransactionService.get_transaction_history`` returns it (datetimes and
+counterparty included), and encodes it ``--rounds`` times per path:
+FastAPI's classic path (jsonable_encoder, then stdlib json as JSONResponse
+does), its response-model path (validate ``Dict[str, Any]`` and dump with
+pydantic-core) and EnvelopeRoute's direct orjson path. Reports the mean
+time per response and the body size.
+"""
+import argparse
+import json
+import time
+from datetime import timedelta
+from typing import Any, Dict
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+import benchmarks.common  # noqa: F401
+from app.core.clock import utcnow
+from app.core.json_response import dumps
+from app.core.response_handler import ResponseHandler
+from app.core.money import from_cents
+
+
+def history_page(items):
+    started = utcnow()
+    return ResponseHandler.success(
+        data={
+            "transactions": [
+                {
+                    "id": i,
+                    "amount": from_cents(100 + i),
+                    "created_at": started - timedelta(seconds=i),
+                    "type": 3,
+                    "description": f"Transferência enviada para ID {i % 100}",
+                    "direction": "out",
+                    "counterparty": {"id": i % 100, "name": "Empresa Teste LTDA", "document": "12.345.678/****-**"}
+                }
+                for i in range(items)
+            ],
+            "next_cursor": None
+        },
+        message="Extrato de transações recuperado com sucesso"
+    )
+
+
+def jsonable(content):
+    return json.dumps(jsonable_encoder(content), ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def response_model(adapter):
+    return lambda content: adapter.dump_json(adapter.validate_python(content))
+
+
+def measure(label, encode, content, rounds):
+    body = encode(content)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        encode(content)
+    elapsed = (time.perf_counter() - started) / rounds
+    print(f"{label:<16} {elapsed * 1000:8.1f} ms/response, {len(body) / 2**20:.2f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    content = history_page(args.items)
+    measure("jsonable+json", jsonable, content, args.rounds)
+    measure("response model", response_model(TypeAdapter(Dict[str, Any])), content, args.rounds)
+    measure("orjson", dumps, content, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
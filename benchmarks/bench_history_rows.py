@@ -0,0 +1,121 @@
+"""History formatting: ORM entities + Python branching vs. SQL CASE rows.
+
+Usage:
+    python -m benchmarks.bench_history_rows --database-url postgresql://... --transactions 100000
+
+Seeds one account with ``--transactions`` movements (a mix of deposits,
+withdrawals and transfers in both directions) and formats its whole history
+twice: the way the service used to, loading ``Transaction`` entities into
+the identity map and deciding direction/description per row in Python, and
+through ``TransactionRepository.stream_user_transactions``, whose rows
+already carry both as SQL CASE columns. Reports wall time, CPU time and
+the tracemalloc peak of each pass.
+"""
+import argparse
+import time
+import tracemalloc
+from datetime import timedelta
+from sqlalchemy import or_, select
+from benchmarks.common import make_session_factory, seed_accounts
+from app.core import config
+from app.core.clock import utcnow
+from app.core.money import from_cents
+from app.models.transaction import Transaction, TYPE_TRANSACTION_DEPOSIT, TYPE_TRANSACTION_WITHDRAW, TYPE_TRANSACTION_TRANSFER
+from app.repositories.transaction_repository import TransactionRepository
+from app.services.transaction_service import TransactionService
+
+
+def seed_history(session_factory, user_id, other_id, transactions):
+    db = session_factory()
+    started = utcnow() - timedelta(seconds=transactions)
+    rows = []
+    for i in range(transactions):
+        kind = i % 4
+        if kind == 0:
+            row = {"transaction_type": TYPE_TRANSACTION_DEPOSIT, "sender_id": user_id, "recipient_id": None}
+        elif kind == 1:
+            row = {"transaction_type": TYPE_TRANSACTION_WITHDRAW, "sender_id": user_id, "recipient_id": None}
+        elif kind == 2:
+            row = {"transaction_type": TYPE_TRANSACTION_TRANSFER, "sender_id": user_id, "recipient_id": other_id}
+        else:
+            row = {"transaction_type": TYPE_TRANSACTION_TRANSFER, "sender_id": other_id, "recipient_id": user_id}
+        row.update(amount=100 + i, created_at=started + timedelta(seconds=i))
+        rows.append(row)
+    repository = TransactionRepository(db)
+    for offset in range(0, len(rows), 10000):
+        repository.create_transactions(rows[offset:offset + 10000])
+    db.commit()
+    db.close()
+
+
+def format_entities(db, user_id, chunk_size):
+    """The pre-SQL-CASE path: full entities, branching per row"""
+    query = (
+        select(Transaction)
+        .where(or_(Transaction.sender_id == user_id, Transaction.recipient_id == user_id))
+        .order_by(Transaction.created_at.desc(), Transaction.id.desc())
+        .execution_options(yield_per=chunk_size)
+    )
+    formatted = 0
+    for transaction in db.execute(query).scalars():
+        data = {
+            "id": transaction.id,
+            "amount": from_cents(transaction.amount),
+            "created_at": transaction.created_at,
+            "type": transaction.transaction_type
+        }
+        if transaction.transaction_type == TYPE_TRANSACTION_TRANSFER:
+            if transaction.sender_id == user_id:
+                data["description"] = f"Transferência enviada para ID {transaction.recipient_id}"
+                data["direction"] = "out"
+            else:
+                data["description"] = f"Transferência recebida de ID {transaction.sender_id}"
+                data["direction"] = "in"
+        elif transaction.transaction_type == TYPE_TRANSACTION_DEPOSIT:
+            data["description"] = "Depósito"
+            data["direction"] = "in"
+        else:
+            data["description"] = "Saque"
+            data["direction"] = "out"
+        formatted += 1
+    return formatted
+
+
+def format_rows(db, user_id, chunk_size):
+    service = TransactionService(db)
+    formatted = 0
+    for row in service.transaction_repository.stream_user_transactions(user_id, chunk_size):
+        service._format_history_row(row)
+        formatted += 1
+    return formatted
+
+
+def profile(label, session_factory, fn, user_id, chunk_size):
+    db = session_factory()
+    tracemalloc.start()
+    wall, cpu = time.perf_counter(), time.process_time()
+    formatted = fn(db, user_id, chunk_size)
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    db.close()
+    print(f"{label:<10} {formatted} rows in {wall:.2f}s (cpu {cpu:.2f}s) -> {formatted / wall:,.0f} rows/s, peak {peak / 2**20:.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--transactions", type=int, default=100000)
+    parser.add_argument("--chunk-size", type=int, default=config.HISTORY_EXPORT_CHUNK_ROWS)
+    args = parser.parse_args()
+
+    session_factory = make_session_factory(args.database_url)
+    user_id, other_id = seed_accounts(session_factory, 2, 0)
+    seed_history(session_factory, user_id, other_id, args.transactions)
+
+    profile("entities", session_factory, format_entities, user_id, args.chunk_size)
+    profile("rows", session_factory, format_rows, user_id, args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Optimistic (version check + retry) vs. pessimistic (SELECT ... FOR UPDATE) balance updates.
+
+Usage:
+    python -m benchmarks.bench_optimistic_locking --database-url postgresql://... --hot-accounts 1 8 64 512
+
+Each operation reads an account, waits ``--think-ms`` (standing in for the
+validation work a transfer does between its read and its write) and adds to
+the balance. Operations pick uniformly among ``--hot-accounts`` accounts,
+so fewer accounts means a higher conflict rate. Optimistic updates hold no
+lock while thinking but redo the work when they lose; pessimistic ones
+queue behind the row lock instead.
+
+SQLite ignores FOR UPDATE, so without ``--database-url`` only the
+optimistic strategy runs.
+"""
+import argparse
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy.orm.exc import StaleDataError
+from benchmarks.common import make_session_factory, measure, seed_accounts
+from app.core.retry import retry_on_conflict
+from app.repositories.person_repository import PersonRepository
+
+
+class Counter:
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def increment(self):
+        with self._lock:
+            self.value += 1
+
+
+def optimistic(db, account_id, think_ms, conflicts):
+    def attempt():
+        repository = PersonRepository(db)
+        repository.get_by_id(account_id)
+        time.sleep(think_ms / 1000)
+        try:
+            repository.update_balance(account_id, 1)
+            db.commit()
+        except StaleDataError:
+            conflicts.increment()
+            raise
+    retry_on_conflict(db, attempt, attempts=1000, backoff_ms=1)
+
+
+def pessimistic(db, account_id, think_ms, conflicts):
+    repository = PersonRepository(db)
+    repository.get_for_update(account_id)
+    time.sleep(think_ms / 1000)
+    repository.update_balance(account_id, 1)
+    db.commit()
+
+
+def run(strategy, session_factory, account_ids, operations, threads, think_ms):
+    conflicts = Counter()
+    rng = random.Random(7)
+    targets = [rng.choice(account_ids) for _ in range(operations)]
+
+    def operation(account_id):
+        db = session_factory()
+        try:
+            strategy(db, account_id, think_ms, conflicts)
+        finally:
+            db.close()
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(operation, targets))
+    return f"{conflicts.value} version conflicts retried"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--operations", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--think-ms", type=float, default=1.0)
+    parser.add_argument("--hot-accounts", type=int, nargs="+", default=[1, 8, 64, 512])
+    args = parser.parse_args()
+
+    strategies = [("optimistic", optimistic)]
+    if args.database_url and not args.database_url.startswith("sqlite"):
+        strategies.append(("for_update", pessimistic))
+    else:
+        print("SQLite has no row locks: skipping the FOR UPDATE strategy")
+
+    for hot_accounts in args.hot_accounts:
+        for name, strategy in strategies:
+            session_factory = make_session_factory(args.database_url)
+            account_ids = seed_accounts(session_factory, hot_accounts, 0)
+            measure(
+                f"{name} n={hot_accounts}",
+                lambda: run(strategy, session_factory, account_ids, args.operations, args.threads, args.think_ms),
+                args.operations
+            )
+
+
+if __name__ == "__main__":
+    main()
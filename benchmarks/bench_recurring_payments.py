@@ -0,0 +1,66 @@
+"""Throughput of one recurring payment run by batch size.
+
+Usage:
+    python -m benchmarks.bench_recurring_payments --database-url postgresql://... --schedules 100000 --batch-sizes 100 1000
+
+Seeds ``--schedules`` monthly payments all due now and times a single
+``run_due``. Throughput here, multiplied by the number of scheduler
+processes (they split batches with ``SKIP LOCKED``), bounds how long a
+million active schedules take.
+"""
+import argparse
+from datetime import timedelta
+from benchmarks.common import make_session_factory, measure, seed_accounts
+from app.core.clock import utcnow
+from app.models.recurring_payment import RecurringPayment, RECURRING_PAYMENT_ACTIVE, RECURRENCE_MONTHLY
+from app.services.recurring_payment_service import RecurringPaymentService
+
+INITIAL_BALANCE = 10_000_000
+
+
+def seed_schedules(session_factory, accounts, schedules):
+    due = utcnow() - timedelta(seconds=1)
+    db = session_factory()
+    db.bulk_insert_mappings(RecurringPayment, [
+        {
+            "sender_id": accounts[(2 * i) % len(accounts)],
+            "recipient_id": accounts[(2 * i + 1) % len(accounts)],
+            "amount": 100,
+            "interval": RECURRENCE_MONTHLY,
+            "start_at": due,
+            "next_run_at": due,
+            "catch_up": True,
+            "status": RECURRING_PAYMENT_ACTIVE
+        }
+        for i in range(schedules)
+    ])
+    db.commit()
+    db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--schedules", type=int, default=10000)
+    parser.add_argument("--accounts", type=int, default=1000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[100, 1000])
+    args = parser.parse_args()
+
+    for batch_size in args.batch_sizes:
+        session_factory = make_session_factory(args.database_url)
+        accounts = seed_accounts(session_factory, args.accounts, INITIAL_BALANCE)
+        seed_schedules(session_factory, accounts, args.schedules)
+
+        def run():
+            db = session_factory()
+            try:
+                metrics = RecurringPaymentService(db).run_due(batch_size)
+            finally:
+                db.close()
+            return f"executed={metrics['executed']} batches={metrics['batches']}"
+
+        measure(f"batch={batch_size}", run, args.schedules)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Time to drain a backlog of due scheduled transfers by worker count.
+
+Usage:
+    python -m benchmarks.bench_scheduled_transfers --database-url postgresql://... --workers 1 4 8
+
+Seeds ``--transfers`` transfers all due at the same instant (the midnight
+case) between distinct pairs of accounts and runs the executor once with no
+rate limit. Workers claim disjoint batches with ``FOR UPDATE SKIP LOCKED``,
+which only Postgres honours: on SQLite use ``--workers 1``.
+"""
+import argparse
+from datetime import timedelta
+from benchmarks.common import make_session_factory, measure, seed_accounts
+from app.core.clock import utcnow
+from app.models.scheduled_transfer import ScheduledTransfer, SCHEDULED_TRANSFER_PENDING
+from app.services.scheduled_transfer_executor import ScheduledTransferExecutor
+
+INITIAL_BALANCE = 10_000_000
+
+
+def seed_backlog(session_factory, accounts, transfers):
+    due = utcnow() - timedelta(seconds=1)
+    db = session_factory()
+    db.bulk_insert_mappings(ScheduledTransfer, [
+        {
+            "sender_id": accounts[(2 * i) % len(accounts)],
+            "recipient_id": accounts[(2 * i + 1) % len(accounts)],
+            "amount": 100,
+            "execute_at": due,
+            "status": SCHEDULED_TRANSFER_PENDING
+        }
+        for i in range(transfers)
+    ])
+    db.commit()
+    db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--transfers", type=int, default=10000)
+    parser.add_argument("--accounts", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1])
+    args = parser.parse_args()
+
+    for workers in args.workers:
+        session_factory = make_session_factory(args.database_url)
+        accounts = seed_accounts(session_factory, args.accounts, INITIAL_BALANCE)
+        seed_backlog(session_factory, accounts, args.transfers)
+        executor = ScheduledTransferExecutor(
+            session_factory, workers=workers, batch_size=args.batch_size, max_per_second=None
+        )
+
+        def drain():
+            totals = executor.run_once()
+            return f"executed={totals['executed']} failed={totals['failed']} retried={totals['retried']}"
+
+        measure(f"workers={workers}", drain, args.transfers)
+
+
+if __name__ == "__main__":
+    main()
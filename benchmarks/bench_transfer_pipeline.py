@@ -0,0 +1,80 @@
+"""Throughput of per-request commits vs. the group-commit transfer pipeline.
+
+Usage:
+    python -m benchmarks.bench_transfer_pipeline --transfers 2000 --threads 16
+    python -m benchmarks.bench_transfer_pipeline --database-url postgresql://...
+
+Without ``--database-url`` a throwaway SQLite file is used. Every commit is
+durable there too, so the difference between both paths is mostly the number
+of commits (fsyncs) paid per transfer.
+"""
+import argparse
+import random
+from concurrent.futures import ThreadPoolExecutor
+from benchmarks.common import make_session_factory, measure, seed_accounts
+from app.services.transaction_service import TransactionService
+from app.services.transfer_pipeline import TransferPipeline
+
+ACCOUNTS = 50
+INITIAL_BALANCE = 10_000_000
+
+
+def random_pairs(ids, count):
+    rng = random.Random(42)
+    return [tuple(rng.sample(ids, 2)) for _ in range(count)]
+
+
+def run_direct(session_factory, pairs, threads):
+    def transfer(pair):
+        db = session_factory()
+        try:
+            TransactionService(db).execute_transfer(pair[0], pair[1], 100)
+            db.commit()
+        finally:
+            db.close()
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(transfer, pairs))
+
+
+def run_pipeline(session_factory, pairs, threads, batch_size, linger_ms):
+    pipeline = TransferPipeline(session_factory=session_factory, batch_size=batch_size, linger_ms=linger_ms)
+    pipeline.start()
+
+    def transfer(pair):
+        return pipeline.submit(
+            lambda db: TransactionService(db).execute_transfer(pair[0], pair[1], 100)
+        ).result()
+
+    try:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(transfer, pairs))
+    finally:
+        pipeline.stop()
+    return f"{pipeline.committed_batches} commits"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--transfers", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--linger-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    session_factory = make_session_factory(args.database_url)
+    pairs = random_pairs(seed_accounts(session_factory, ACCOUNTS, INITIAL_BALANCE), args.transfers)
+    measure("direct", lambda: run_direct(session_factory, pairs, args.threads), args.transfers)
+
+    session_factory = make_session_factory(args.database_url)
+    pairs = random_pairs(seed_accounts(session_factory, ACCOUNTS, INITIAL_BALANCE), args.transfers)
+    measure(
+        "pipeline",
+        lambda: run_pipeline(session_factory, pairs, args.threads, args.batch_size, args.linger_ms),
+        args.transfers
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Helpers shared by the benchmark scripts."""
+import os
+import tempfile
+import time
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from app.core.database import Base  # noqa: E402
+from app.models.person import Person, TYPE_NATURAL_PERSON  # noqa: E402
+import app.models.transaction  # noqa: E402,F401
+import app.models.idempotency_key  # noqa: E402,F401
+import app.models.balance_shard  # noqa: E402,F401
+import app.models.ledger_entry  # noqa: E402,F401
+import app.models.balance_checkpoint  # noqa: E402,F401
+import app.models.scheduled_transfer  # noqa: E402,F401
+import app.models.recurring_payment  # noqa: E402,F401
+import app.models.recurring_payment_run  # noqa: E402,F401
+import app.models.outbox_event  # noqa: E402,F401
+import app.models.outbox_partition  # noqa: E402,F401
+import app.models.monthly_statement  # noqa: E402,F401
+import app.models.daily_rollup  # noqa: E402,F401
+
+
+def make_session_factory(database_url=None, pool_size=32):
+    """Fresh schema on ``database_url``, or on a throwaway SQLite file when omitted"""
+    if database_url is None:
+        database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    is_sqlite = database_url.startswith("sqlite")
+    connect_args = {"check_same_thread": False, "timeout": 60} if is_sqlite else {}
+    engine = create_engine(database_url, connect_args=connect_args, pool_size=pool_size, max_overflow=pool_size)
+    if is_sqlite:
+        @event.listens_for(engine, "connect")
+        def _durable(dbapi_connection, _):
+            dbapi_connection.execute("PRAGMA synchronous=FULL")
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def seed_accounts(session_factory, count, balance):
+    db = session_factory()
+    db.add_all([
+        Person(
+            name=f"Conta {i}",
+            email=f"conta{i}@bench.local",
+            password="x",
+            address="Rua",
+            city="Cidade",
+            state="SP",
+            type=TYPE_NATURAL_PERSON,
+            cpf=f"{i:011d}",
+            balance=balance
+        )
+        for i in range(count)
+    ])
+    db.commit()
+    ids = [person_id for (person_id,) in db.query(Person.id).order_by(Person.id)]
+    db.close()
+    return ids
+
+
+def measure(label, fn, operations):
+    started = time.perf_counter()
+    extra = fn()
+    elapsed = time.perf_counter() - started
+    line = f"{label:<16} {operations} operations in {elapsed:.2f}s -> {operations / elapsed:,.0f} ops/s"
+    if extra is not None:
+        line += f" ({extra})"
+    print(line)
@@ -12,6 +12,9 @@ from app.core.database import Base, get_db
 from app.main import app
 from app.models.person import Person, TYPE_NATURAL_PERSON, TYPE_LEGAL_PERSON
 from app.core.security import get_password_hash, create_access_token
+from app.services.idempotency_service import clear_idempotency_cache
+from app.services.balance_cache import clear_balance_cache
+from app.services.profile_service import clear_profile_cache
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
 
@@ -23,6 +26,14 @@ engine = create_engine(
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+@pytest.fixture(autouse=True)
+def reset_caches():
+    clear_idempotency_cache()
+    clear_balance_cache()
+    clear_profile_cache()
+    yield
+
+
 @pytest.fixture(scope="function")
 def db_session():
     Base.metadata.create_all(bind=engine)
@@ -35,6 +46,11 @@ def db_session():
         Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture(scope="function")
+def session_factory(db_session):
+    return TestingSessionLocal
+
+
 @pytest.fixture(scope="function")
 def client(db_session):
     def override_get_db():
@@ -64,7 +80,7 @@ def test_natural_person(db_session):
         city="São Paulo",
         state="SP",
         cpf="12345678901",
-        balance=1000.0,
+        balance=100000,
         type=TYPE_NATURAL_PERSON
     )
     db_session.add(person)
@@ -84,7 +100,7 @@ def test_legal_person(db_session):
         city="São Paulo",
         state="SP",
         cnpj="12345678901234",
-        balance=5000,
+        balance=500000,
         type=TYPE_LEGAL_PERSON
     )
     db_session.add(person)
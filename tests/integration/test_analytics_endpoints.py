@@ -0,0 +1,154 @@
+import pytest
+from unittest.mock import patch
+from datetime import date, datetime
+from app.models.daily_rollup import DailyRollup, DailyCounterpartyRollup
+from app.models.transaction import Transaction, TYPE_TRANSACTION_DEPOSIT, TYPE_TRANSACTION_WITHDRAW, TYPE_TRANSACTION_TRANSFER
+from app.services.analytics_service import AnalyticsService
+from app.services.balance_shard_service import BalanceShardService
+from app.core.clock import utcnow
+from app.core.exceptions import ValidationException
+
+NOW = datetime(2024, 3, 10, 12, 0, 0)
+
+@pytest.fixture
+def january(db_session, test_natural_person, test_legal_person):
+    """Two weeks of January 2024, both starting on a Monday"""
+    natural, legal = test_natural_person.id, test_legal_person.id
+    rows = [
+        (10000, TYPE_TRANSACTION_DEPOSIT, natural, None, datetime(2024, 1, 1, 9)),
+        (3000, TYPE_TRANSACTION_WITHDRAW, natural, None, datetime(2024, 1, 3, 18)),
+        (2000, TYPE_TRANSACTION_TRANSFER, natural, legal, datetime(2024, 1, 8, 23, 59)),
+        (5000, TYPE_TRANSACTION_DEPOSIT, natural, None, datetime(2024, 1, 10)),
+        (7700, TYPE_TRANSACTION_DEPOSIT, natural, None, datetime(2024, 1, 15)),
+    ]
+    db_session.add_all([
+        Transaction(amount=amount, transaction_type=transaction_type, sender_id=sender_id,
+                    recipient_id=recipient_id, created_at=created_at)
+        for amount, transaction_type, sender_id, recipient_id, created_at in rows
+    ])
+    db_session.commit()
+
+def today():
+    return utcnow().date().isoformat()
+
+@pytest.mark.integration
+class TestAnalyticsEndpoints:
+    
+    def test_movements_update_todays_rollup(self, db_session, client_with_auth, test_natural_person, test_legal_person):
+        client = client_with_auth(test_natural_person)
+        client.post("/api/v1/operation/deposit", json={"amount": 100.0})
+        client.post("/api/v1/operation/withdraw", json={"amount": 30.0})
+        client.post("/api/v1/operation/transfer", json={"recipient_id": test_legal_person.id, "amount": 20.0})
+        
+        data = client.get("/api/v1/operation/analytics", params={"from": today(), "to": today()}).json()["data"]
+        
+        assert data["series"] == [{
+            "period": today(),
+            "deposits": 100.0,
+            "withdrawals": 30.0,
+            "transfers_in": 0.0,
+            "transfers_out": 20.0,
+            "total_in": 100.0,
+            "total_out": 50.0,
+            "transaction_count": 3
+        }]
+        assert data["average_ticket"] == {"in": 100.0, "out": 25.0}
+        assert data["top_counterparties"] == [
+            {"counterparty_id": test_legal_person.id, "total_in": 0.0, "total_out": 20.0, "transaction_count": 1}
+        ]
+        assert db_session.query(DailyRollup).filter_by(account_id=test_natural_person.id).count() == 1
+        
+        data = client_with_auth(test_legal_person).get("/api/v1/operation/analytics").json()["data"]
+        assert data["totals"]["transfers_in"] == 20.0
+        assert data["top_counterparties"][0]["counterparty_id"] == test_natural_person.id
+    
+    def test_default_period_is_dense(self, client_natural_person):
+        data = client_natural_person.get("/api/v1/operation/analytics").json()["data"]
+        
+        assert data["to"] == today()
+        assert len(data["series"]) == 30
+        assert data["totals"]["transaction_count"] == 0
+        assert data["average_ticket"] == {"in": None, "out": None}
+        assert data["top_counterparties"] == []
+    
+    def test_movement_is_bucketed_by_its_transaction_timestamp(self, db_session, client_with_auth, test_natural_person, test_legal_person):
+        created_at = datetime(2024, 1, 8, 23, 59, 59, 999999)
+        with patch("app.services.transaction_service.utcnow", return_value=created_at):
+            client_with_auth(test_natural_person).post(
+                "/api/v1/operation/transfer",
+                json={"recipient_id": test_legal_person.id, "amount": 20.0}
+            )
+        
+        def rollups():
+            return [(row.day, row.transfers_out) for row in db_session.query(DailyRollup).filter_by(account_id=test_natural_person.id)]
+        
+        assert rollups() == [(date(2024, 1, 8), 2000)]
+        AnalyticsService(db_session).rebuild_days(date(2024, 1, 8), date(2024, 1, 9), now=NOW)
+        assert rollups() == [(date(2024, 1, 8), 2000)]
+    
+    def test_credit_to_sharded_account_is_caught_up_when_sequenced(self, db_session, client_with_auth, test_natural_person, test_legal_person):
+        BalanceShardService(db_session).set_shard_count(test_legal_person.id, 4)
+        with patch("app.services.transaction_service.utcnow", return_value=datetime(2024, 1, 8, 12)):
+            client_with_auth(test_natural_person).post(
+                "/api/v1/operation/transfer",
+                json={"recipient_id": test_legal_person.id, "amount": 20.0}
+            )
+        
+        def rollups():
+            daily = [(row.day, row.transfers_in) for row in db_session.query(DailyRollup).filter_by(account_id=test_legal_person.id)]
+            pairs = [(row.counterparty_id, row.amount_in) for row in db_session.query(DailyCounterpartyRollup).filter_by(account_id=test_legal_person.id)]
+            return daily, pairs
+        
+        service = AnalyticsService(db_session)
+        assert rollups() == ([], [])
+        service.rebuild_days(date(2024, 1, 8), date(2024, 1, 8), now=NOW)
+        assert rollups() == ([], [])
+        
+        BalanceShardService(db_session).rebalance()
+        expected = ([(date(2024, 1, 8), 2000)], [(test_natural_person.id, 2000)])
+        assert rollups() == expected
+        service.rebuild_days(date(2024, 1, 8), date(2024, 1, 8), now=NOW)
+        assert rollups() == expected
+    
+    def test_rebuild_days_grouped_by_week(self, db_session, january, client_natural_person):
+        rebuilt = AnalyticsService(db_session).rebuild_days(date(2024, 1, 1), date(2024, 1, 31), now=NOW)
+        
+        assert rebuilt == 31
+        data = client_natural_person.get(
+            "/api/v1/operation/analytics",
+            params={"granularity": "week", "from": "2024-01-01", "to": "2024-01-14"}
+        ).json()["data"]
+        
+        assert [bucket["period"] for bucket in data["series"]] == ["2024-01-01", "2024-01-08"]
+        assert data["series"][0]["deposits"] == 100.0
+        assert data["series"][0]["withdrawals"] == 30.0
+        assert data["series"][1]["deposits"] == 50.0
+        assert data["series"][1]["transfers_out"] == 20.0
+        assert data["totals"]["total_in"] == 150.0
+        assert data["totals"]["total_out"] == 50.0
+        assert data["average_ticket"] == {"in": 75.0, "out": 25.0}
+    
+    def test_rebuild_replaces_drifted_rows(self, db_session, january, test_natural_person):
+        service = AnalyticsService(db_session)
+        service.rebuild_days(date(2024, 1, 1), date(2024, 1, 1), now=NOW)
+        db_session.query(DailyRollup).update({"deposits": 1})
+        db_session.commit()
+        
+        service.rebuild_days(date(2024, 1, 1), date(2024, 1, 1), now=NOW)
+        
+        row = db_session.query(DailyRollup).filter_by(account_id=test_natural_person.id).one()
+        assert row.deposits == 10000
+        assert row.count_in == 1
+    
+    def test_rebuild_rejects_unfinished_day(self, db_session):
+        with pytest.raises(ValidationException):
+            AnalyticsService(db_session).rebuild_days(date(2024, 3, 9), date(2024, 3, 10), now=NOW)
+    
+    def test_invalid_period_rejected(self, client_natural_person):
+        response = client_natural_person.get("/api/v1/operation/analytics", params={"from": "2024-02-01", "to": "2024-01-01"})
+        
+        assert response.status_code == 422
+        assert response.json()["error_code"] == "INVALID_PERIOD"
+        
+        response = client_natural_person.get("/api/v1/operation/analytics", params={"from": "2020-01-01", "to": "2024-01-01"})
+        assert response.status_code == 422
@@ -0,0 +1,56 @@
+import pytest
+from app.services.balance_cache import balance_cache_stats, cached_balance, stage_balances
+from app.services.balance_shard_service import BalanceShardService
+
+@pytest.mark.integration
+class TestBalanceCache:
+    
+    def test_repeated_polls_hit_cache(self, client_natural_person, test_natural_person):
+        for _ in range(3):
+            response = client_natural_person.get("/api/v1/operation/balance")
+            assert response.json()["data"]["balance"] == 1000.0
+        
+        stats = balance_cache_stats()
+        assert stats["misses"] == 1
+        assert stats["hits"] == 2
+    
+    def test_movements_write_through(self, client_with_auth, test_natural_person, test_legal_person):
+        client = client_with_auth(test_natural_person)
+        client.get("/api/v1/operation/balance")
+        client.post("/api/v1/operation/deposit", json={"amount": 100.0})
+        client.post("/api/v1/operation/transfer", json={"recipient_id": test_legal_person.id, "amount": 20.0})
+        
+        assert cached_balance(test_natural_person.id) == 108000
+        assert cached_balance(test_legal_person.id) == 502000
+        assert client.get("/api/v1/operation/balance").json()["data"]["balance"] == 1080.0
+        assert balance_cache_stats()["misses"] == 1
+    
+    def test_rolled_back_movement_is_not_cached(self, db_session, test_natural_person):
+        stage_balances(db_session, {test_natural_person.id: (test_natural_person.version + 1, 1)})
+        db_session.rollback()
+        
+        assert cached_balance(test_natural_person.id) is None
+    
+    def test_rolled_back_savepoint_only_invalidates(self, db_session, test_natural_person):
+        version = test_natural_person.version
+        savepoint = db_session.begin_nested()
+        stage_balances(db_session, {test_natural_person.id: (version + 1, 1)})
+        savepoint.rollback()
+        db_session.commit()
+        
+        assert cached_balance(test_natural_person.id) is None
+        assert balance_cache_stats()["invalidations"] == 1
+    
+    def test_sharded_account_is_not_cached(self, db_session, client_with_auth, test_natural_person, test_legal_person):
+        client = client_with_auth(test_legal_person)
+        client.get("/api/v1/operation/balance")
+        BalanceShardService(db_session).set_shard_count(test_legal_person.id, 4)
+        
+        assert cached_balance(test_legal_person.id) is None
+        client_with_auth(test_natural_person).post(
+            "/api/v1/operation/transfer",
+            json={"recipient_id": test_legal_person.id, "amount": 20.0}
+        )
+        
+        assert client_with_auth(test_legal_person).get("/api/v1/operation/balance").json()["data"]["balance"] == 5020.0
+        assert cached_balance(test_legal_person.id) is None
@@ -0,0 +1,118 @@
+import pytest
+from datetime import datetime, timedelta
+from app.models.balance_checkpoint import BalanceCheckpoint
+from app.models.transaction import Transaction, TYPE_TRANSACTION_DEPOSIT, TYPE_TRANSACTION_WITHDRAW, TYPE_TRANSACTION_TRANSFER
+from app.services.balance_checkpoint_service import BalanceCheckpointService
+from app.core.exceptions import NotFoundException
+
+DAY = timedelta(days=1)
+START = datetime(2026, 1, 1, 12, 0, 0)
+
+@pytest.fixture
+def history(db_session, test_natural_person, test_legal_person):
+    """Three days of activity; the natural person nets 100 + 50 - 30 - 20 = 100.00"""
+    natural, legal = test_natural_person.id, test_legal_person.id
+    rows = [
+        (10000, TYPE_TRANSACTION_DEPOSIT, natural, None, START),
+        (5000, TYPE_TRANSACTION_TRANSFER, legal, natural, START + timedelta(hours=1)),
+        (3000, TYPE_TRANSACTION_WITHDRAW, natural, None, START + DAY),
+        (2000, TYPE_TRANSACTION_TRANSFER, natural, legal, START + 2 * DAY),
+    ]
+    db_session.add_all([
+        Transaction(amount=amount, transaction_type=transaction_type, sender_id=sender_id,
+                    recipient_id=recipient_id, created_at=created_at)
+        for amount, transaction_type, sender_id, recipient_id, created_at in rows
+    ])
+    db_session.commit()
+
+@pytest.mark.integration
+class TestBalanceCheckpoints:
+    
+    def test_balance_at_without_checkpoints(self, db_session, history, test_natural_person, test_legal_person):
+        service = BalanceCheckpointService(db_session)
+        
+        assert service.get_balance_at(test_natural_person.id, START - DAY) == 0
+        assert service.get_balance_at(test_natural_person.id, START + timedelta(hours=2)) == 15000
+        assert service.get_balance_at(test_natural_person.id, START + DAY) == 12000
+        assert service.get_balance_at(test_natural_person.id) == 10000
+        assert service.get_balance_at(test_legal_person.id) == -3000
+    
+    def test_create_checkpoints_skips_recent_transactions(self, db_session, history, test_natural_person, client_natural_person):
+        client_natural_person.post("/api/v1/operation/deposit", json={"amount": 1.0})
+        
+        created = BalanceCheckpointService(db_session).create_checkpoints()
+        
+        checkpoints = db_session.query(BalanceCheckpoint).order_by(BalanceCheckpoint.account_id).all()
+        assert created == 2
+        assert {checkpoint.transaction_id for checkpoint in checkpoints} == {4}
+        assert checkpoints[0].balance == 10000
+        assert checkpoints[0].as_of == START + 2 * DAY
+        assert BalanceCheckpointService(db_session).create_checkpoints() == 0
+    
+    def test_checkpoint_rounds_chain(self, db_session, history, test_natural_person, test_legal_person):
+        service = BalanceCheckpointService(db_session)
+        service.create_checkpoints()
+        db_session.add(Transaction(
+            amount=700, transaction_type=TYPE_TRANSACTION_DEPOSIT,
+            sender_id=test_natural_person.id, created_at=START + 3 * DAY
+        ))
+        db_session.commit()
+        
+        assert service.create_checkpoints() == 1
+        
+        latest = db_session.query(BalanceCheckpoint).filter_by(
+            account_id=test_natural_person.id
+        ).order_by(BalanceCheckpoint.transaction_id.desc()).first()
+        assert latest.balance == 10700
+        assert service.get_balance_at(test_legal_person.id) == -3000
+    
+    def test_balance_at_uses_checkpoint_plus_delta(self, db_session, history, test_natural_person):
+        service = BalanceCheckpointService(db_session)
+        service.create_checkpoints()
+        # A checkpoint that disagrees with the history proves it is the starting point
+        db_session.query(BalanceCheckpoint).filter_by(account_id=test_natural_person.id).update({"balance": 999})
+        db_session.add(Transaction(
+            amount=700, transaction_type=TYPE_TRANSACTION_DEPOSIT,
+            sender_id=test_natural_person.id, created_at=START + 3 * DAY
+        ))
+        db_session.commit()
+        
+        assert service.get_balance_at(test_natural_person.id) == 999 + 700
+        assert service.get_balance_at(test_natural_person.id, START + DAY) == 12000
+    
+    def test_audit(self, db_session, test_natural_person, client_natural_person):
+        test_natural_person.balance = 0
+        db_session.commit()
+        client_natural_person.post("/api/v1/operation/deposit", json={"amount": 80.0})
+        client_natural_person.post("/api/v1/operation/withdraw", json={"amount": 30.0})
+        service = BalanceCheckpointService(db_session)
+        
+        assert service.audit(test_natural_person.id)["difference"] == 0
+        
+        test_natural_person.balance += 1
+        db_session.commit()
+        assert service.audit(test_natural_person.id) == {
+            "account_id": test_natural_person.id,
+            "stored_balance": 5001,
+            "rebuilt_balance": 5000,
+            "difference": 1
+        }
+        with pytest.raises(NotFoundException):
+            service.audit(9999)
+    
+    def test_balance_endpoint_at_date(self, history, client_natural_person):
+        response = client_natural_person.get(
+            "/api/v1/operation/balance",
+            params={"at": (START + DAY).isoformat()}
+        )
+        
+        assert response.status_code == 200
+        assert response.json()["data"]["balance"] == 120.0
+    
+    def test_balance_endpoint_at_aware_date(self, history, client_natural_person):
+        response = client_natural_person.get(
+            "/api/v1/operation/balance",
+            params={"at": "2026-01-02T09:00:00-03:00"}
+        )
+        
+        assert response.json()["data"]["balance"] == 120.0
@@ -0,0 +1,156 @@
+import pytest
+from app.models.balance_shard import BalanceShard
+from app.services.balance_shard_service import BalanceShardService
+from app.repositories.balance_shard_repository import BalanceShardRepository
+from app.core.exceptions import NotFoundException, ValidationException
+from sqlalchemy.orm.exc import StaleDataError
+
+@pytest.fixture
+def sharded_merchant(db_session, test_legal_person):
+    BalanceShardService(db_session).set_shard_count(test_legal_person.id, 4)
+    db_session.refresh(test_legal_person)
+    return test_legal_person
+
+def shard_total(db_session, person):
+    return BalanceShardRepository(db_session).get_total(person.id)
+
+@pytest.mark.integration
+class TestBalanceSharding:
+    
+    def test_set_shard_count_creates_empty_shards(self, db_session, sharded_merchant):
+        shards = db_session.query(BalanceShard).filter_by(person_id=sharded_merchant.id).all()
+        
+        assert sharded_merchant.balance_shards == 4
+        assert sorted(shard.shard_index for shard in shards) == [0, 1, 2, 3]
+        assert all(shard.balance == 0 for shard in shards)
+        assert sharded_merchant.balance == 500000
+    
+    def test_credit_to_sharded_account_skips_person_row(self, db_session, sharded_merchant, client_natural_person):
+        for _ in range(3):
+            response = client_natural_person.post(
+                "/api/v1/operation/transfer",
+                json={"recipient_id": sharded_merchant.id, "amount": 100.0}
+            )
+            assert response.status_code == 200
+        
+        db_session.refresh(sharded_merchant)
+        assert sharded_merchant.balance == 500000
+        assert shard_total(db_session, sharded_merchant) == 30000
+    
+    def test_balance_and_profile_include_shards(self, sharded_merchant, client_natural_person, client_with_auth):
+        client_natural_person.post(
+            "/api/v1/operation/transfer",
+            json={"recipient_id": sharded_merchant.id, "amount": 250.0}
+        )
+        client = client_with_auth(sharded_merchant)
+        
+        assert client.get("/api/v1/operation/balance").json()["data"]["balance"] == 5250.0
+        assert client.get("/api/v1/user/profile").json()["data"]["balance"] == 5250.0
+    
+    def test_debit_drains_shards_when_main_balance_is_short(self, db_session, sharded_merchant, test_natural_person, client_natural_person, client_with_auth):
+        client_natural_person.post(
+            "/api/v1/operation/transfer",
+            json={"recipient_id": sharded_merchant.id, "amount": 800.0}
+        )
+        client = client_with_auth(sharded_merchant)
+        
+        response = client.post(
+            "/api/v1/operation/transfer",
+            json={"recipient_id": test_natural_person.id, "amount": 5300.0}
+        )
+        
+        assert response.status_code == 200
+        assert response.json()["data"]["new_balance"] == 500.0
+        db_session.refresh(sharded_merchant)
+        assert sharded_merchant.balance == 0
+        assert shard_total(db_session, sharded_merchant) == 50000
+    
+    def test_debit_beyond_shards_is_rejected(self, sharded_merchant, test_natural_person, client_with_auth):
+        client = client_with_auth(sharded_merchant)
+        
+        response = client.post(
+            "/api/v1/operation/transfer",
+            json={"recipient_id": test_natural_person.id, "amount": 5000.01}
+        )
+        
+        assert response.status_code == 400
+        assert response.json()["error_code"] == "INSUFFICIENT_FUNDS"
+    
+    def test_batch_transfer_credits_sharded_recipient(self, db_session, sharded_merchant, client_natural_person):
+        response = client_natural_person.post(
+            "/api/v1/operation/transfer/batch",
+            json={"items": [
+                {"recipient_id": sharded_merchant.id, "amount": 10.0},
+                {"recipient_id": sharded_merchant.id, "amount": 20.0}
+            ]}
+        )
+        
+        assert response.status_code == 200
+        db_session.refresh(sharded_merchant)
+        assert sharded_merchant.balance == 500000
+        assert shard_total(db_session, sharded_merchant) == 3000
+    
+    def test_rebalance_sweeps_shards_into_main_balance(self, db_session, sharded_merchant, client_natural_person):
+        client_natural_person.post(
+            "/api/v1/operation/transfer",
+            json={"recipient_id": sharded_merchant.id, "amount": 150.0}
+        )
+        
+        moved = BalanceShardService(db_session).rebalance()
+        
+        assert moved == 15000
+        db_session.refresh(sharded_merchant)
+        assert sharded_merchant.balance == 515000
+        assert shard_total(db_session, sharded_merchant) == 0
+    
+    def test_unsharding_restores_single_balance(self, db_session, sharded_merchant, client_natural_person):
+        client_natural_person.post(
+            "/api/v1/operation/transfer",
+            json={"recipient_id": sharded_merchant.id, "amount": 50.0}
+        )
+        
+        BalanceShardService(db_session).set_shard_count(sharded_merchant.id, 0)
+        
+        db_session.refresh(sharded_merchant)
+        assert sharded_merchant.balance_shards == 0
+        assert sharded_merchant.balance == 505000
+        assert db_session.query(BalanceShard).filter_by(person_id=sharded_merchant.id).count() == 0
+    
+    def test_resharding_keeps_remaining_shard_rows(self, db_session, sharded_merchant, client_natural_person):
+        client_natural_person.post(
+            "/api/v1/operation/transfer",
+            json={"recipient_id": sharded_merchant.id, "amount": 50.0}
+        )
+        kept = {
+            shard.shard_index: shard.id
+            for shard in db_session.query(BalanceShard).filter_by(person_id=sharded_merchant.id)
+            if shard.shard_index < 2
+        }
+        
+        BalanceShardService(db_session).set_shard_count(sharded_merchant.id, 2)
+        
+        db_session.refresh(sharded_merchant)
+        shards = db_session.query(BalanceShard).filter_by(person_id=sharded_merchant.id).all()
+        assert {shard.shard_index: shard.id for shard in shards} == kept
+        assert all(shard.balance == 0 for shard in shards)
+        assert sharded_merchant.balance == 505000
+        
+        BalanceShardService(db_session).set_shard_count(sharded_merchant.id, 3)
+        indexes = [shard.shard_index for shard in db_session.query(BalanceShard).filter_by(person_id=sharded_merchant.id)]
+        assert sorted(indexes) == [0, 1, 2]
+    
+    def test_credit_to_removed_shard_is_a_conflict(self, db_session, sharded_merchant):
+        BalanceShardService(db_session).set_shard_count(sharded_merchant.id, 0)
+        
+        with pytest.raises(StaleDataError):
+            BalanceShardRepository(db_session).credit(sharded_merchant.id, 1000, 4)
+        db_session.rollback()
+        assert shard_total(db_session, sharded_merchant) == 0
+    
+    def test_set_shard_count_validation(self, db_session, test_legal_person):
+        service = BalanceShardService(db_session)
+        
+        with pytest.raises(ValidationException):
+            service.set_shard_count(test_legal_person.id, -1)
+        with pytest.raises(NotFoundException):
+            service.set_shard_count(9999, 4)
@@ -0,0 +1,131 @@
+import pytest
+from app.models.person import Person, TYPE_NATURAL_PERSON
+from app.models.transaction import Transaction, TYPE_TRANSACTION_TRANSFER
+from app.core import config
+
+@pytest.fixture
+def employees(db_session):
+    people = [
+        Person(
+            name=f"Funcionário {index}",
+            email=f"funcionario{index}@example.com",
+            password="hash",
+            address="Rua Teste, 1",
+            city="São Paulo",
+            state="SP",
+            cpf=f"{index:011d}",
+            balance=0,
+            type=TYPE_NATURAL_PERSON
+        )
+        for index in range(3)
+    ]
+    db_session.add_all(people)
+    db_session.commit()
+    return people
+
+@pytest.mark.integration
+class TestBatchTransferEndpoints:
+    
+    def test_batch_transfer_success(self, db_session, test_legal_person, employees, client_legal_person):
+        initial_balance = test_legal_person.balance
+        
+        response = client_legal_person.post(
+            "/api/v1/operation/transfer/batch",
+            json={
+                "items": [
+                    {"recipient_id": employees[0].id, "amount": 1000.0},
+                    {"recipient_id": employees[1].id, "amount": 1500.5},
+                    {"recipient_id": employees[0].id, "amount": 10.0}
+                ]
+            }
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["success"] is True
+        assert data["data"]["succeeded"] == 3
+        assert data["data"]["failed"] == 0
+        assert data["data"]["total_amount"] == 2510.5
+        assert all(item["status"] == "success" for item in data["data"]["items"])
+        
+        for person in [test_legal_person, *employees]:
+            db_session.refresh(person)
+        assert test_legal_person.balance == initial_balance - 251050
+        assert employees[0].balance == 101000
+        assert employees[1].balance == 150050
+        assert data["data"]["new_balance"] == test_legal_person.balance / 100
+        
+        transactions = db_session.query(Transaction).order_by(Transaction.id).all()
+        assert [t.id for t in transactions] == [item["transaction_id"] for item in data["data"]["items"]]
+        assert all(t.transaction_type == TYPE_TRANSACTION_TRANSFER for t in transactions)
+        assert all(t.sender_id == test_legal_person.id for t in transactions)
+    
+    def test_all_or_nothing_rejects_whole_batch(self, db_session, test_legal_person, employees, client_legal_person):
+        initial_balance = test_legal_person.balance
+        
+        response = client_legal_person.post(
+            "/api/v1/operation/transfer/batch",
+            json={
+                "items": [
+                    {"recipient_id": employees[0].id, "amount": 100.0},
+                    {"recipient_id": 9999, "amount": 100.0},
+                    {"recipient_id": test_legal_person.id, "amount": 100.0}
+                ]
+            }
+        )
+        
+        assert response.status_code == 400
+        data = response.json()
+        assert data["error_code"] == "BATCH_REJECTED"
+        statuses = [(item["status"], item.get("error_code")) for item in data["data"]["items"]]
+        assert statuses == [
+            ("success", None),
+            ("failed", "USER_NOT_FOUND"),
+            ("failed", "INVALID_RECIPIENT")
+        ]
+        
+        db_session.refresh(test_legal_person)
+        assert test_legal_person.balance == initial_balance
+        assert db_session.query(Transaction).count() == 0
+    
+    def test_best_effort_processes_valid_items(self, db_session, test_legal_person, employees, client_legal_person):
+        response = client_legal_person.post(
+            "/api/v1/operation/transfer/batch",
+            json={
+                "mode": "best_effort",
+                "items": [
+                    {"recipient_id": employees[0].id, "amount": 4000.0},
+                    {"recipient_id": employees[1].id, "amount": 2000.0},
+                    {"recipient_id": employees[2].id, "amount": 1000.0}
+                ]
+            }
+        )
+        
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert data["succeeded"] == 2
+        assert data["failed"] == 1
+        assert data["items"][1]["error_code"] == "INSUFFICIENT_FUNDS"
+        assert "transaction_id" not in data["items"][1]
+        
+        db_session.refresh(test_legal_person)
+        assert test_legal_person.balance == 0
+        assert db_session.query(Transaction).count() == 2
+    
+    def test_batch_respects_max_items(self, client_legal_person):
+        items = [{"recipient_id": 1, "amount": 1.0}] * (config.BATCH_TRANSFER_MAX_ITEMS + 1)
+        
+        response = client_legal_person.post("/api/v1/operation/transfer/batch", json={"items": items})
+        
+        assert response.status_code == 422
+        assert response.json()["error_code"] == "VALIDATION_ERROR"
+    
+    def test_batch_transfer_is_idempotent(self, db_session, employees, client_legal_person):
+        payload = {"items": [{"recipient_id": employees[0].id, "amount": 10.0}]}
+        headers = {"Idempotency-Key": "payroll-2026-10"}
+        
+        first = client_legal_person.post("/api/v1/operation/transfer/batch", json=payload, headers=headers)
+        second = client_legal_person.post("/api/v1/operation/transfer/batch", json=payload, headers=headers)
+        
+        assert second.json() == first.json()
+        assert db_session.query(Transaction).count() == 1
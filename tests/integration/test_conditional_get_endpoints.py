@@ -0,0 +1,85 @@
+import pytest
+from unittest.mock import patch
+from app.services.balance_shard_service import BalanceShardService
+
+ACCOUNT_URLS = ["/api/v1/operation/balance", "/api/v1/operation/history", "/api/v1/user/profile"]
+
+@pytest.mark.integration
+class TestConditionalGet:
+    
+    @pytest.mark.parametrize("url", ACCOUNT_URLS)
+    def test_response_carries_etag(self, client_natural_person, url):
+        response = client_natural_person.get(url)
+        
+        assert response.status_code == 200
+        assert response.headers["ETag"].startswith('"')
+        assert response.headers["Cache-Control"] == "private, no-cache"
+    
+    @pytest.mark.parametrize("url", ACCOUNT_URLS)
+    def test_matching_etag_returns_not_modified(self, client_natural_person, url):
+        etag = client_natural_person.get(url).headers["ETag"]
+        
+        response = client_natural_person.get(url, headers={"If-None-Match": etag})
+        
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+    
+    def test_not_modified_skips_the_payload(self, client_natural_person):
+        etag = client_natural_person.get("/api/v1/operation/balance").headers["ETag"]
+        
+        with patch("app.api.v1.routes.transaction_router.TransactionService") as service:
+            response = client_natural_person.get("/api/v1/operation/balance", headers={"If-None-Match": f'"other", W/{etag}'})
+        
+        assert response.status_code == 304
+        service.assert_not_called()
+    
+    def test_counterparty_rename_changes_history_etag(self, db_session, client_with_auth, test_natural_person, test_legal_person):
+        client = client_with_auth(test_natural_person)
+        client.post("/api/v1/operation/transfer", json={"recipient_id": test_legal_person.id, "amount": 5.0})
+        etag = client.get("/api/v1/operation/history").headers["ETag"]
+        
+        test_legal_person.name = "Empresa Renomeada LTDA"
+        db_session.commit()
+        response = client.get("/api/v1/operation/history", headers={"If-None-Match": etag})
+        
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+        assert response.json()["data"]["transactions"][0]["counterparty"]["name"] == "Empresa Renomeada LTDA"
+    
+    def test_stale_etag_returns_full_response(self, client_natural_person):
+        etag = client_natural_person.get("/api/v1/operation/balance").headers["ETag"]
+        client_natural_person.post("/api/v1/operation/deposit", json={"amount": 10.0})
+        
+        response = client_natural_person.get("/api/v1/operation/balance", headers={"If-None-Match": etag})
+        
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+        assert response.json()["data"]["balance"] == 1010.0
+    
+    def test_incoming_transfer_changes_etag(self, client_with_auth, test_natural_person, test_legal_person):
+        client = client_with_auth(test_natural_person)
+        etag = client.get("/api/v1/user/profile").headers["ETag"]
+        
+        client_with_auth(test_legal_person).post(
+            "/api/v1/operation/transfer",
+            json={"recipient_id": test_natural_person.id, "amount": 50.0}
+        )
+        response = client_with_auth(test_natural_person).get("/api/v1/user/profile", headers={"If-None-Match": etag})
+        
+        assert response.status_code == 200
+    
+    def test_credit_to_sharded_account_changes_etag(self, db_session, client_with_auth, test_natural_person, test_legal_person):
+        BalanceShardService(db_session).set_shard_count(test_legal_person.id, 4)
+        db_session.refresh(test_legal_person)
+        etag = client_with_auth(test_legal_person).get("/api/v1/operation/balance").headers["ETag"]
+        
+        client_with_auth(test_natural_person).post(
+            "/api/v1/operation/transfer",
+            json={"recipient_id": test_legal_person.id, "amount": 50.0}
+        )
+        db_session.refresh(test_legal_person)
+        response = client_with_auth(test_legal_person).get("/api/v1/operation/balance", headers={"If-None-Match": etag})
+        
+        assert response.status_code == 200
+        assert response.json()["data"]["balance"] == 5050.0
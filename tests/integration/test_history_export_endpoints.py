@@ -0,0 +1,97 @@
+import csv
+import gzip
+import io
+import json
+import pytest
+from unittest.mock import patch
+from datetime import datetime, timedelta
+from app.services.transaction_service import TransactionService
+from app.models.transaction import Transaction, TYPE_TRANSACTION_DEPOSIT, TYPE_TRANSACTION_WITHDRAW, TYPE_TRANSACTION_TRANSFER
+
+@pytest.fixture
+def history(db_session, test_natural_person, test_legal_person):
+    start = datetime(2024, 1, 1)
+    rows = [
+        (TYPE_TRANSACTION_DEPOSIT, 10000, test_natural_person.id, None),
+        (TYPE_TRANSACTION_WITHDRAW, 3000, test_natural_person.id, None),
+        (TYPE_TRANSACTION_TRANSFER, 2000, test_natural_person.id, test_legal_person.id),
+        (TYPE_TRANSACTION_TRANSFER, 550, test_legal_person.id, test_natural_person.id),
+    ]
+    for i, (transaction_type, amount, sender_id, recipient_id) in enumerate(rows):
+        db_session.add(Transaction(
+            transaction_type=transaction_type,
+            amount=amount,
+            sender_id=sender_id,
+            recipient_id=recipient_id,
+            created_at=start + timedelta(days=i)
+        ))
+    db_session.commit()
+
+@pytest.mark.integration
+class TestHistoryExportEndpoints:
+    
+    def test_export_ndjson(self, history, client_natural_person):
+        response = client_natural_person.get("/api/v1/operation/history/export")
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert 'filename="extrato.ndjson"' in response.headers["content-disposition"]
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["amount"] for row in rows] == [5.5, 20.0, 30.0, 100.0]
+        assert rows[0] == {
+            "id": 4,
+            "amount": 5.5,
+            "created_at": "2024-01-04T00:00:00",
+            "type": TYPE_TRANSACTION_TRANSFER,
+            "description": "Transferência recebida de ID 2",
+            "direction": "in"
+        }
+    
+    def test_export_csv(self, history, client_natural_person):
+        response = client_natural_person.get("/api/v1/operation/history/export", params={"format": "csv"})
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert list(rows[0]) == ["id", "created_at", "type", "direction", "amount", "description"]
+        assert [row["description"] for row in rows] == [
+            "Transferência recebida de ID 2",
+            "Transferência enviada para ID 2",
+            "Saque",
+            "Depósito"
+        ]
+    
+    def test_export_gzip(self, history, client_natural_person):
+        response = client_natural_person.get(
+            "/api/v1/operation/history/export", params={"format": "csv", "gzip": True}
+        )
+        
+        assert response.headers["content-type"] == "application/gzip"
+        assert 'filename="extrato.csv.gz"' in response.headers["content-disposition"]
+        text = gzip.decompress(response.content).decode("utf-8")
+        assert len(text.splitlines()) == 5
+    
+    def test_export_applies_filters(self, history, client_natural_person):
+        response = client_natural_person.get(
+            "/api/v1/operation/history/export", params={"type": "transfer", "direction": "out"}
+        )
+        
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["amount"] for row in rows] == [20.0]
+    
+    def test_export_is_generated_in_chunks(self, history, db_session, test_natural_person):
+        with patch("app.services.transaction_service.config.HISTORY_EXPORT_CHUNK_ROWS", 1):
+            chunks = TransactionService(db_session).export_transaction_history(test_natural_person.id, "ndjson")
+            sizes = [len(chunk.splitlines()) for chunk in chunks]
+        
+        assert sizes == [1, 1, 1, 1]
+    
+    def test_export_rejects_unknown_format(self, client_natural_person):
+        response = client_natural_person.get("/api/v1/operation/history/export", params={"format": "xlsx"})
+        
+        assert response.status_code == 422
+    
+    def test_export_unauthenticated(self, client):
+        response = client.get("/api/v1/operation/history/export")
+        
+        assert response.status_code == 401
@@ -0,0 +1,41 @@
+import pytest
+from datetime import datetime
+from sqlalchemy import text
+from app.repositories.transaction_repository import TransactionRepository
+
+def query_plan(db_session, statement):
+    sql = str(statement.compile(db_session.get_bind(), compile_kwargs={"literal_binds": True}))
+    return [row[-1] for row in db_session.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+
+@pytest.mark.integration
+class TestHistoryQueryPlan:
+    
+    @pytest.mark.parametrize("before", [None, (datetime(2024, 1, 1), 100)])
+    def test_history_uses_both_indexes_without_table_scan(self, db_session, before):
+        statement = TransactionRepository(db_session)._user_history(1, before, 50)
+        
+        plan = query_plan(db_session, statement)
+        
+        assert any("ix_transaction_sender_created" in step for step in plan), plan
+        assert any("ix_transaction_recipient_created" in step for step in plan), plan
+        assert not any(step.startswith("SCAN transaction") for step in plan), plan
+    
+    def test_filtered_history_keeps_index_range_scans(self, db_session):
+        statement = TransactionRepository(db_session)._user_history(
+            1, None, 50,
+            created_from=datetime(2024, 1, 1),
+            created_to=datetime(2024, 1, 31),
+            min_amount=1000
+        )
+        
+        plan = query_plan(db_session, statement)
+        
+        assert any("ix_transaction_sender_created (sender_id=? AND created_at>? AND created_at<?)" in step for step in plan), plan
+        assert not any(step.startswith("SCAN transaction") for step in plan), plan
+    
+    def test_outgoing_only_history_reads_one_side(self, db_session):
+        statement = TransactionRepository(db_session)._user_history(1, None, 50, direction="out")
+        
+        plan = query_plan(db_session, statement)
+        
+        assert not any("ix_transaction_recipient_created" in step for step in plan), plan
@@ -0,0 +1,104 @@
+import pytest
+from datetime import timedelta
+from app.models.transaction import Transaction
+from app.models.idempotency_key import IdempotencyKey
+from app.core.clock import utcnow
+from app.services.idempotency_service import clear_idempotency_cache
+
+@pytest.mark.integration
+class TestIdempotencyEndpoints:
+    
+    def test_replayed_transfer_is_not_executed_twice(self, db_session, test_natural_person, test_legal_person, client_natural_person):
+        initial_balance = test_natural_person.balance
+        headers = {"Idempotency-Key": "transfer-1"}
+        payload = {"recipient_id": test_legal_person.id, "amount": 100.0}
+        
+        first = client_natural_person.post("/api/v1/operation/transfer", json=payload, headers=headers)
+        second = client_natural_person.post("/api/v1/operation/transfer", json=payload, headers=headers)
+        
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert second.json() == first.json()
+        
+        db_session.refresh(test_natural_person)
+        assert test_natural_person.balance == initial_balance - 10000
+        assert db_session.query(Transaction).count() == 1
+    
+    def test_replay_is_served_from_database_after_cache_loss(self, db_session, test_natural_person, client_natural_person):
+        headers = {"Idempotency-Key": "deposit-1"}
+        
+        first = client_natural_person.post("/api/v1/operation/deposit", json={"amount": 50.0}, headers=headers)
+        clear_idempotency_cache()
+        second = client_natural_person.post("/api/v1/operation/deposit", json={"amount": 50.0}, headers=headers)
+        
+        assert second.json() == first.json()
+        assert db_session.query(Transaction).count() == 1
+        
+        record = db_session.query(IdempotencyKey).one()
+        assert record.user_id == test_natural_person.id
+        assert record.response["data"]["transaction_id"] == first.json()["data"]["transaction_id"]
+    
+    def test_key_reused_with_different_payload(self, db_session, client_natural_person):
+        headers = {"Idempotency-Key": "withdraw-1"}
+        
+        client_natural_person.post("/api/v1/operation/withdraw", json={"amount": 10.0}, headers=headers)
+        response = client_natural_person.post("/api/v1/operation/withdraw", json={"amount": 20.0}, headers=headers)
+        
+        assert response.status_code == 422
+        assert response.json()["error_code"] == "IDEMPOTENCY_KEY_MISMATCH"
+        assert db_session.query(Transaction).count() == 1
+    
+    def test_failed_operation_is_not_stored(self, db_session, test_natural_person, test_legal_person, client_natural_person):
+        headers = {"Idempotency-Key": "transfer-2"}
+        payload = {"recipient_id": test_legal_person.id, "amount": 5000.0}
+        
+        first = client_natural_person.post("/api/v1/operation/transfer", json=payload, headers=headers)
+        assert first.status_code == 400
+        assert db_session.query(IdempotencyKey).count() == 0
+        
+        test_natural_person.balance = 1000000
+        db_session.commit()
+        
+        second = client_natural_person.post("/api/v1/operation/transfer", json=payload, headers=headers)
+        assert second.status_code == 200
+        assert db_session.query(Transaction).count() == 1
+    
+    def test_expired_key_executes_again(self, db_session, client_natural_person):
+        headers = {"Idempotency-Key": "deposit-2"}
+        
+        client_natural_person.post("/api/v1/operation/deposit", json={"amount": 10.0}, headers=headers)
+        record = db_session.query(IdempotencyKey).one()
+        record.expires_at = utcnow() - timedelta(seconds=1)
+        db_session.commit()
+        clear_idempotency_cache()
+        
+        response = client_natural_person.post("/api/v1/operation/deposit", json={"amount": 10.0}, headers=headers)
+        
+        assert response.status_code == 200
+        assert db_session.query(Transaction).count() == 2
+        assert db_session.query(IdempotencyKey).count() == 1
+    
+    def test_requests_without_key_are_not_deduplicated(self, db_session, client_natural_person):
+        client_natural_person.post("/api/v1/operation/deposit", json={"amount": 10.0})
+        client_natural_person.post("/api/v1/operation/deposit", json={"amount": 10.0})
+        
+        assert db_session.query(Transaction).count() == 2
+        assert db_session.query(IdempotencyKey).count() == 0
+    
+    def test_purge_removes_only_expired_keys(self, db_session, test_natural_person):
+        from app.services.idempotency_service import IdempotencyService
+        
+        for index, delta in enumerate([-10, -5, 3600]):
+            db_session.add(IdempotencyKey(
+                key=f"key-{index}",
+                user_id=test_natural_person.id,
+                request_hash="x" * 64,
+                response={"success": True},
+                expires_at=utcnow() + timedelta(seconds=delta)
+            ))
+        db_session.commit()
+        
+        deleted = IdempotencyService(db_session).purge_expired(batch_size=1)
+        
+        assert deleted == 2
+        assert [record.key for record in db_session.query(IdempotencyKey).all()] == ["key-2"]
@@ -0,0 +1,156 @@
+import pytest
+from unittest.mock import patch
+from sqlalchemy import func
+from app.models.ledger_entry import LedgerEntry
+from app.models.transaction import TYPE_TRANSACTION_DEPOSIT, TYPE_TRANSACTION_WITHDRAW, TYPE_TRANSACTION_TRANSFER
+from app.repositories.ledger_repository import LedgerRepository
+from app.repositories.balance_shard_repository import BalanceShardRepository
+from app.services.balance_shard_service import BalanceShardService
+
+@pytest.fixture
+def opening_entries(db_session, test_natural_person, test_legal_person):
+    # What the ledger migration writes for accounts that already have a balance
+    LedgerRepository(db_session).post_entries([
+        {"account_id": person.id, "amount": person.balance, "balance_after": person.balance}
+        for person in (test_natural_person, test_legal_person)
+    ])
+    db_session.commit()
+
+def entries_of(db_session, person):
+    return db_session.query(LedgerEntry).filter_by(account_id=person.id).order_by(LedgerEntry.id).all()
+
+def assert_ledger_matches_balance(db_session, person):
+    db_session.expire_all()
+    entries = [entry for entry in entries_of(db_session, person)]
+    balance = BalanceShardRepository(db_session).get_available_balance(person)
+    
+    assert sum(entry.amount for entry in entries) == balance
+    sequenced = sorted((entry for entry in entries if entry.seq is not None), key=lambda entry: entry.seq)
+    assert [entry.seq for entry in sequenced] == list(range(1, len(sequenced) + 1))
+    running = 0
+    for entry in sequenced:
+        running += entry.amount
+        assert entry.balance_after == running
+
+@pytest.mark.integration
+class TestLedger:
+    
+    def test_transfer_posts_both_legs(self, db_session, opening_entries, test_natural_person, test_legal_person, client_natural_person):
+        response = client_natural_person.post(
+            "/api/v1/operation/transfer",
+            json={"recipient_id": test_legal_person.id, "amount": 300.0}
+        )
+        transaction_id = response.json()["data"]["transaction_id"]
+        
+        debit = entries_of(db_session, test_natural_person)[-1]
+        credit = entries_of(db_session, test_legal_person)[-1]
+        
+        assert (debit.seq, debit.amount, debit.balance_after) == (2, -30000, 70000)
+        assert (credit.seq, credit.amount, credit.balance_after) == (2, 30000, 530000)
+        assert debit.transaction_id == credit.transaction_id == transaction_id
+        assert debit.counterparty_id == test_legal_person.id
+        assert credit.counterparty_id == test_natural_person.id
+        assert debit.transaction_type == credit.transaction_type == TYPE_TRANSACTION_TRANSFER
+    
+    def test_deposit_and_withdraw_post_single_leg(self, db_session, opening_entries, test_natural_person, client_natural_person):
+        client_natural_person.post("/api/v1/operation/deposit", json={"amount": 200.0})
+        client_natural_person.post("/api/v1/operation/withdraw", json={"amount": 50.0})
+        
+        deposit, withdraw = entries_of(db_session, test_natural_person)[1:]
+        
+        assert (deposit.seq, deposit.amount, deposit.balance_after) == (2, 20000, 120000)
+        assert deposit.transaction_type == TYPE_TRANSACTION_DEPOSIT
+        assert (withdraw.seq, withdraw.amount, withdraw.balance_after) == (3, -5000, 115000)
+        assert withdraw.transaction_type == TYPE_TRANSACTION_WITHDRAW
+        assert deposit.counterparty_id is None and withdraw.counterparty_id is None
+    
+    def test_failed_operation_posts_nothing(self, db_session, opening_entries, test_natural_person, test_legal_person, client_natural_person):
+        client_natural_person.post(
+            "/api/v1/operation/transfer",
+            json={"recipient_id": test_legal_person.id, "amount": 999999.0}
+        )
+        
+        assert len(entries_of(db_session, test_natural_person)) == 1
+        assert len(entries_of(db_session, test_legal_person)) == 1
+    
+    def test_batch_transfer_running_balances(self, db_session, opening_entries, test_natural_person, test_legal_person, client_legal_person):
+        client_legal_person.post(
+            "/api/v1/operation/transfer/batch",
+            json={"items": [
+                {"recipient_id": test_natural_person.id, "amount": 10.0},
+                {"recipient_id": test_natural_person.id, "amount": 20.0}
+            ]}
+        )
+        
+        debits = entries_of(db_session, test_legal_person)[1:]
+        credits = entries_of(db_session, test_natural_person)[1:]
+        
+        assert [(entry.seq, entry.balance_after) for entry in debits] == [(2, 499000), (3, 497000)]
+        assert [(entry.seq, entry.balance_after) for entry in credits] == [(2, 101000), (3, 103000)]
+        assert_ledger_matches_balance(db_session, test_legal_person)
+        assert_ledger_matches_balance(db_session, test_natural_person)
+    
+    def test_sharded_credits_are_sequenced_later(self, db_session, opening_entries, test_natural_person, test_legal_person, client_natural_person, client_with_auth):
+        BalanceShardService(db_session).set_shard_count(test_legal_person.id, 4)
+        for amount in (100.0, 200.0):
+            client_natural_person.post(
+                "/api/v1/operation/transfer",
+                json={"recipient_id": test_legal_person.id, "amount": amount}
+            )
+        
+        pending = [entry for entry in entries_of(db_session, test_legal_person) if entry.seq is None]
+        assert [entry.amount for entry in pending] == [10000, 20000]
+        assert all(entry.balance_after is None for entry in pending)
+        
+        client_with_auth(test_legal_person).post(
+            "/api/v1/operation/transfer",
+            json={"recipient_id": test_natural_person.id, "amount": 5100.0}
+        )
+        
+        db_session.expire_all()
+        entries = entries_of(db_session, test_legal_person)
+        assert [(entry.seq, entry.balance_after) for entry in entries] == [
+            (1, 500000), (2, 510000), (3, 530000), (4, 20000)
+        ]
+        assert_ledger_matches_balance(db_session, test_legal_person)
+    
+    def test_debit_skips_credit_landing_after_sequencing(self, db_session, opening_entries, test_natural_person, test_legal_person, client_with_auth):
+        BalanceShardService(db_session).set_shard_count(test_legal_person.id, 4)
+        sequence_pending = BalanceShardService.sequence_pending
+        
+        def credit_lands_after(service, user_id):
+            sequence_pending(service, user_id)
+            # Another transfer to the account commits while the debit still runs
+            BalanceShardRepository(service.db).credit(user_id, 5000, 4)
+            LedgerRepository(service.db).post_entries([{
+                "account_id": user_id,
+                "amount": 5000,
+                "transaction_type": TYPE_TRANSACTION_TRANSFER,
+                "counterparty_id": test_natural_person.id
+            }])
+        
+        with patch.object(BalanceShardService, "sequence_pending", credit_lands_after):
+            client_with_auth(test_legal_person).post(
+                "/api/v1/operation/transfer",
+                json={"recipient_id": test_natural_person.id, "amount": 100.0}
+            )
+        BalanceShardService(db_session).rebalance()
+        
+        db_session.expire_all()
+        entries = sorted(entries_of(db_session, test_legal_person), key=lambda entry: entry.seq)
+        assert [(entry.seq, entry.amount, entry.balance_after) for entry in entries] == [
+            (1, 500000, 500000), (2, -10000, 490000), (3, 5000, 495000)
+        ]
+        assert_ledger_matches_balance(db_session, test_legal_person)
+    
+    def test_rebalance_sequences_pending_entries(self, db_session, opening_entries, test_legal_person, client_natural_person):
+        BalanceShardService(db_session).set_shard_count(test_legal_person.id, 2)
+        client_natural_person.post(
+            "/api/v1/operation/transfer",
+            json={"recipient_id": test_legal_person.id, "amount": 100.0}
+        )
+        
+        BalanceShardService(db_session).rebalance()
+        
+        assert db_session.query(func.count(LedgerEntry.id)).filter(LedgerEntry.seq.is_(None)).scalar() == 0
+        assert_ledger_matches_balance(db_session, test_legal_person)
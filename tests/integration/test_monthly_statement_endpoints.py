@@ -0,0 +1,186 @@
+import pytest
+from unittest.mock import patch
+from datetime import date, datetime
+from app.models.monthly_statement import MonthlyStatement
+from app.models.transaction import Transaction, TYPE_TRANSACTION_DEPOSIT, TYPE_TRANSACTION_WITHDRAW, TYPE_TRANSACTION_TRANSFER
+from app.repositories.ledger_repository import LedgerRepository
+from app.services.balance_shard_service import BalanceShardService
+from app.services.statement_service import StatementService
+from app.core.clock import utcnow, month_start
+from app.core.exceptions import ValidationException
+
+NOW = datetime(2024, 3, 10, 12, 0, 0)
+
+@pytest.fixture
+def january(db_session, test_natural_person, test_legal_person):
+    """January 2024: the natural person nets 100 - 30 - 20 = 50.00"""
+    natural, legal = test_natural_person.id, test_legal_person.id
+    rows = [
+        (10000, TYPE_TRANSACTION_DEPOSIT, natural, None, datetime(2024, 1, 5)),
+        (3000, TYPE_TRANSACTION_WITHDRAW, natural, None, datetime(2024, 1, 10)),
+        (2000, TYPE_TRANSACTION_TRANSFER, natural, legal, datetime(2024, 1, 31, 23, 59)),
+        (9900, TYPE_TRANSACTION_DEPOSIT, natural, None, datetime(2024, 2, 1)),
+    ]
+    db_session.add_all([
+        Transaction(amount=amount, transaction_type=transaction_type, sender_id=sender_id,
+                    recipient_id=recipient_id, created_at=created_at)
+        for amount, transaction_type, sender_id, recipient_id, created_at in rows
+    ])
+    db_session.commit()
+
+def current_month():
+    return f"{month_start(utcnow()):%Y-%m}"
+
+@pytest.mark.integration
+class TestMonthlyStatementEndpoints:
+    
+    def test_movements_update_current_month(self, client_with_auth, test_natural_person, test_legal_person):
+        client = client_with_auth(test_natural_person)
+        client.post("/api/v1/operation/deposit", json={"amount": 100.0})
+        client.post("/api/v1/operation/withdraw", json={"amount": 30.0})
+        client.post("/api/v1/operation/transfer", json={"recipient_id": test_legal_person.id, "amount": 20.0})
+        
+        data = client.get(f"/api/v1/operation/statement/{current_month()}").json()["data"]
+        
+        assert data["opening_balance"] == 1000.0
+        assert data["closing_balance"] == 1050.0
+        assert data["deposits"] == 100.0
+        assert data["withdrawals"] == 30.0
+        assert data["transfers_out"] == 20.0
+        assert data["total_in"] == 100.0
+        assert data["total_out"] == 50.0
+        assert data["transaction_count"] == 3
+        assert data["closed"] is False
+        
+        data = client_with_auth(test_legal_person).get(f"/api/v1/operation/statement/{current_month()}").json()["data"]
+        assert data["opening_balance"] == 5000.0
+        assert data["closing_balance"] == 5020.0
+        assert data["transfers_in"] == 20.0
+        assert data["transaction_count"] == 1
+    
+    def test_statement_is_a_single_row(self, db_session, client_natural_person, test_natural_person):
+        for _ in range(3):
+            client_natural_person.post("/api/v1/operation/deposit", json={"amount": 10.0})
+        
+        rows = db_session.query(MonthlyStatement).filter_by(account_id=test_natural_person.id).all()
+        assert len(rows) == 1
+        assert rows[0].transaction_count == 3
+        assert rows[0].closing_balance == 103000
+    
+    def test_credit_to_sharded_account_is_added_when_sequenced(self, db_session, client_with_auth, test_natural_person, test_legal_person):
+        # Opening entry, as the ledger migration writes for existing balances
+        LedgerRepository(db_session).post_entries([
+            {"account_id": test_legal_person.id, "amount": test_legal_person.balance, "balance_after": test_legal_person.balance}
+        ])
+        BalanceShardService(db_session).set_shard_count(test_legal_person.id, 4)
+        db_session.refresh(test_legal_person)
+        client_with_auth(test_natural_person).post(
+            "/api/v1/operation/transfer",
+            json={"recipient_id": test_legal_person.id, "amount": 20.0}
+        )
+        
+        assert db_session.query(MonthlyStatement).filter_by(account_id=test_legal_person.id).count() == 0
+        
+        BalanceShardService(db_session).rebalance()
+        data = client_with_auth(test_legal_person).get(f"/api/v1/operation/statement/{current_month()}").json()["data"]
+        
+        assert data["opening_balance"] == 5000.0
+        assert data["closing_balance"] == 5020.0
+        assert data["transfers_in"] == 20.0
+        assert data["transaction_count"] == 1
+    
+    def test_pending_credit_is_counted_once_around_close_month(self, db_session, client_with_auth, test_natural_person, test_legal_person):
+        BalanceShardService(db_session).set_shard_count(test_legal_person.id, 4)
+        with patch("app.services.transaction_service.utcnow", return_value=datetime(2024, 1, 20)):
+            client_with_auth(test_natural_person).post(
+                "/api/v1/operation/transfer",
+                json={"recipient_id": test_legal_person.id, "amount": 20.0}
+            )
+        
+        def transfers_in():
+            row = StatementService(db_session).statement_repository.get_statement(test_legal_person.id, date(2024, 1, 1))
+            return row.transfers_in if row else None
+        
+        service = StatementService(db_session)
+        service.close_month(date(2024, 1, 1), now=NOW)
+        assert transfers_in() is None
+        
+        BalanceShardService(db_session).rebalance()
+        assert transfers_in() == 2000
+        
+        service.close_month(date(2024, 1, 1), now=NOW)
+        assert transfers_in() == 2000
+    
+    def test_movement_is_bucketed_by_its_transaction_timestamp(self, db_session, client_natural_person, test_natural_person):
+        created_at = datetime(2024, 1, 31, 23, 59, 59, 999999)
+        with patch("app.services.transaction_service.utcnow", return_value=created_at):
+            client_natural_person.post("/api/v1/operation/deposit", json={"amount": 10.0})
+        
+        transaction = db_session.query(Transaction).filter_by(sender_id=test_natural_person.id).one()
+        assert transaction.created_at == created_at
+        incremental = db_session.query(MonthlyStatement).filter_by(account_id=test_natural_person.id).one()
+        assert incremental.month == date(2024, 1, 1)
+        assert incremental.deposits == 1000
+        
+        StatementService(db_session).close_month(date(2024, 1, 1), now=NOW)
+        rebuilt = db_session.query(MonthlyStatement).filter_by(account_id=test_natural_person.id).one()
+        assert rebuilt.month == date(2024, 1, 1)
+        assert rebuilt.deposits == 1000
+    
+    def test_close_month_rebuilds_from_transactions(self, db_session, january, client_with_auth, test_natural_person, test_legal_person):
+        closed = StatementService(db_session).close_month(date(2024, 1, 1), now=NOW)
+        
+        assert closed == 2
+        data = client_with_auth(test_natural_person).get("/api/v1/operation/statement/2024-01").json()["data"]
+        assert data["opening_balance"] == 0.0
+        assert data["closing_balance"] == 50.0
+        assert data["deposits"] == 100.0
+        assert data["withdrawals"] == 30.0
+        assert data["transfers_out"] == 20.0
+        assert data["transaction_count"] == 3
+        assert data["closed"] is True
+        
+        data = client_with_auth(test_legal_person).get("/api/v1/operation/statement/2024-01").json()["data"]
+        assert data["closing_balance"] == 20.0
+        assert data["transfers_in"] == 20.0
+    
+    def test_close_month_carries_quiet_accounts_forward(self, db_session, january, client_with_auth, test_natural_person, test_legal_person):
+        service = StatementService(db_session)
+        service.close_month(date(2024, 1, 1), now=NOW)
+        service.close_month(date(2024, 2, 1), now=NOW)
+        
+        data = client_with_auth(test_natural_person).get("/api/v1/operation/statement/2024-02").json()["data"]
+        assert data["opening_balance"] == 50.0
+        assert data["closing_balance"] == 149.0
+        assert data["transaction_count"] == 1
+        
+        data = client_with_auth(test_legal_person).get("/api/v1/operation/statement/2024-02").json()["data"]
+        assert data["opening_balance"] == 20.0
+        assert data["closing_balance"] == 20.0
+        assert data["transaction_count"] == 0
+        assert data["closed"] is True
+    
+    def test_month_without_row_uses_last_closing_balance(self, db_session, january, client_natural_person):
+        StatementService(db_session).close_month(date(2024, 1, 1), now=NOW)
+        
+        data = client_natural_person.get("/api/v1/operation/statement/2024-05").json()["data"]
+        
+        assert data["opening_balance"] == 50.0
+        assert data["closing_balance"] == 50.0
+        assert data["transaction_count"] == 0
+        assert data["closed"] is False
+    
+    def test_close_month_rejects_unfinished_month(self, db_session):
+        with pytest.raises(ValidationException):
+            StatementService(db_session).close_month(date(2024, 3, 1), now=NOW)
+    
+    def test_future_month_not_found(self, client_natural_person):
+        response = client_natural_person.get("/api/v1/operation/statement/2999-01")
+        
+        assert response.status_code == 404
+        assert response.json()["error_code"] == "STATEMENT_NOT_FOUND"
+    
+    def test_invalid_month_rejected(self, client_natural_person):
+        response = client_natural_person.get("/api/v1/operation/statement/2024-13")
+        
+        assert response.status_code == 422
@@ -0,0 +1,95 @@
+import pytest
+from sqlalchemy import update
+from sqlalchemy.orm.exc import StaleDataError
+from app.models.person import Person
+from app.models.transaction import Transaction
+from app.repositories.person_repository import PersonRepository
+
+def concurrent_write(session_factory, person_id, amount):
+    """Commit a balance change from another session, like a second worker would"""
+    db = session_factory()
+    try:
+        db.execute(
+            update(Person)
+            .where(Person.id == person_id)
+            .values(balance=Person.balance + amount, version=Person.version + 1)
+        )
+        db.commit()
+    finally:
+        db.close()
+
+@pytest.fixture
+def interfering_writer(monkeypatch, session_factory):
+    """Make the next ``times`` balance updates lose their version check"""
+    original = PersonRepository.update_balance
+    state = {"remaining": 0}
+    
+    def update_balance(self, user_id, amount):
+        if state["remaining"] > 0:
+            state["remaining"] -= 1
+            concurrent_write(session_factory, user_id, 1)
+        return original(self, user_id, amount)
+    
+    monkeypatch.setattr(PersonRepository, "update_balance", update_balance)
+    
+    def arm(times):
+        state["remaining"] = times
+    return arm
+
+@pytest.mark.integration
+class TestOptimisticLocking:
+    
+    def test_version_starts_at_one_and_increments(self, db_session, test_natural_person):
+        assert test_natural_person.version == 1
+        
+        PersonRepository(db_session).update_balance(test_natural_person.id, 100)
+        db_session.commit()
+        
+        assert test_natural_person.version == 2
+    
+    def test_stale_update_is_rejected(self, db_session, session_factory, test_natural_person):
+        stale = session_factory()
+        try:
+            loaded = PersonRepository(stale).get_by_id(test_natural_person.id)
+            concurrent_write(session_factory, test_natural_person.id, 500)
+            
+            with pytest.raises(StaleDataError):
+                PersonRepository(stale).update_balance(loaded.id, 100)
+        finally:
+            stale.rollback()
+            stale.close()
+        
+        db_session.expire_all()
+        assert test_natural_person.balance == 100500
+    
+    def test_bulk_credit_bumps_version(self, db_session, test_natural_person, test_legal_person):
+        PersonRepository(db_session).credit_balances({test_natural_person.id: 10, test_legal_person.id: 20})
+        db_session.commit()
+        
+        versions = dict(db_session.query(Person.id, Person.version).all())
+        assert versions == {test_natural_person.id: 2, test_legal_person.id: 2}
+    
+    def test_transfer_retries_after_conflict(self, db_session, interfering_writer, test_natural_person, test_legal_person, client_natural_person):
+        interfering_writer(2)
+        
+        response = client_natural_person.post(
+            "/api/v1/operation/transfer",
+            json={"recipient_id": test_legal_person.id, "amount": 100.0}
+        )
+        
+        assert response.status_code == 200
+        # Both interfering writes (+0.01 each) are kept, none is overwritten
+        assert response.json()["data"]["new_balance"] == 900.02
+        assert db_session.query(Transaction).count() == 1
+    
+    def test_transfer_gives_up_with_conflict_error(self, db_session, interfering_writer, test_legal_person, client_natural_person):
+        interfering_writer(100)
+        
+        response = client_natural_person.post(
+            "/api/v1/operation/transfer",
+            json={"recipient_id": test_legal_person.id, "amount": 100.0}
+        )
+        
+        assert response.status_code == 409
+        assert response.json()["error_code"] == "CONCURRENT_UPDATE"
+        assert db_session.query(Transaction).count() == 0
@@ -0,0 +1,122 @@
+import json
+import pytest
+from app.core import config
+from app.models.outbox_event import OutboxEvent
+from app.services.outbox_dispatcher import OutboxDispatcher
+from app.services.outbox_sinks import CallbackSink, FileSink, HttpSink, OutboxHttpStub
+
+def make_dispatcher(session_factory, sinks, **options):
+    options.setdefault("workers", 1)
+    options.setdefault("poll_seconds", 0)
+    return OutboxDispatcher(sinks, session_factory=session_factory, **options)
+
+@pytest.fixture
+def stub():
+    stub = OutboxHttpStub().start()
+    yield stub
+    stub.stop()
+
+@pytest.mark.integration
+class TestOutboxWrites:
+    
+    def test_transfer_writes_one_event_per_account(self, db_session, client_natural_person, test_natural_person, test_legal_person):
+        response = client_natural_person.post(
+            "/api/v1/operation/transfer",
+            json={"recipient_id": test_legal_person.id, "amount": 100.0}
+        )
+        transaction_id = response.json()["data"]["transaction_id"]
+        
+        events = {event.account_id: event for event in db_session.query(OutboxEvent)}
+        sent = events[test_natural_person.id]
+        received = events[test_legal_person.id]
+        assert sent.event_type == "transaction.transfer.sent"
+        assert sent.payload == {
+            "transaction_id": transaction_id,
+            "amount": 100.0,
+            "direction": "out",
+            "counterparty_id": test_legal_person.id,
+            "balance": 900.0
+        }
+        assert received.event_type == "transaction.transfer.received"
+        assert received.payload["balance"] == 5100.0
+        assert sent.partition == test_natural_person.id % config.OUTBOX_PARTITIONS
+    
+    def test_deposit_and_withdraw_write_events(self, db_session, client_natural_person):
+        client_natural_person.post("/api/v1/operation/deposit", json={"amount": 50.0})
+        client_natural_person.post("/api/v1/operation/withdraw", json={"amount": 20.0})
+        
+        event_types = [event.event_type for event in db_session.query(OutboxEvent).order_by(OutboxEvent.id)]
+        assert event_types == ["transaction.deposit", "transaction.withdraw"]
+    
+    def test_failed_transfer_writes_no_event(self, db_session, client_natural_person, test_legal_person):
+        response = client_natural_person.post(
+            "/api/v1/operation/transfer",
+            json={"recipient_id": test_legal_person.id, "amount": 5000.0}
+        )
+        
+        assert response.status_code == 400
+        assert db_session.query(OutboxEvent).count() == 0
+
+@pytest.mark.integration
+class TestOutboxDispatcher:
+    
+    def test_delivers_in_order_and_deletes(self, db_session, session_factory, client_natural_person, test_natural_person):
+        for amount in (10.0, 20.0, 30.0):
+            client_natural_person.post("/api/v1/operation/deposit", json={"amount": amount})
+        received = []
+        
+        delivered = make_dispatcher(session_factory, [CallbackSink(received.extend)]).run_once()
+        
+        assert delivered == 3
+        assert [event["amount"] for event in received] == [10.0, 20.0, 30.0]
+        assert all(event["account_id"] == test_natural_person.id for event in received)
+        assert db_session.query(OutboxEvent).count() == 0
+    
+    def test_mark_mode_keeps_dispatched_rows(self, db_session, session_factory, client_natural_person):
+        client_natural_person.post("/api/v1/operation/deposit", json={"amount": 10.0})
+        
+        make_dispatcher(session_factory, [CallbackSink(lambda events: None)], delete_dispatched=False).run_once()
+        
+        event = db_session.query(OutboxEvent).one()
+        db_session.refresh(event)
+        assert event.dispatched_at is not None
+    
+    def test_sink_failure_keeps_events_for_retry(self, db_session, session_factory, client_natural_person):
+        client_natural_person.post("/api/v1/operation/deposit", json={"amount": 10.0})
+        
+        def fail(events):
+            raise RuntimeError("sink down")
+        dispatcher = make_dispatcher(session_factory, [CallbackSink(fail)])
+        
+        assert dispatcher.run_once() == 0
+        assert dispatcher.failed_batches == 1
+        assert db_session.query(OutboxEvent).count() == 1
+    
+    def test_batches_are_bounded(self, session_factory, client_natural_person):
+        for _ in range(5):
+            client_natural_person.post("/api/v1/operation/deposit", json={"amount": 1.0})
+        batches = []
+        
+        make_dispatcher(session_factory, [CallbackSink(batches.append)], batch_size=2).run_once()
+        
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+    
+    def test_file_sink_appends_json_lines(self, tmp_path, session_factory, client_natural_person):
+        client_natural_person.post("/api/v1/operation/deposit", json={"amount": 10.0})
+        path = tmp_path / "events.ndjson"
+        
+        make_dispatcher(session_factory, [FileSink(str(path))]).run_once()
+        
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [line["event_type"] for line in lines] == ["transaction.deposit"]
+    
+    def test_http_sink_retries_after_failure(self, db_session, session_factory, client_natural_person, stub):
+        client_natural_person.post("/api/v1/operation/deposit", json={"amount": 10.0})
+        stub.fail_next = 1
+        dispatcher = make_dispatcher(session_factory, [HttpSink(stub.url)])
+        
+        assert dispatcher.run_once() == 0
+        assert dispatcher.run_once() == 1
+        assert stub.requests == 2
+        assert [event["amount"] for event in stub.events] == [10.0]
+        assert db_session.query(OutboxEvent).count() == 0
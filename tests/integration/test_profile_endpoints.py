@@ -1,5 +1,7 @@
 import pytest
+from datetime import datetime
 from app.models.person import Person
+from app.services.balance_cache import balance_cache_stats
 
 @pytest.mark.integration
 class TestProfileEndpoints:
@@ -13,7 +15,7 @@ class TestProfileEndpoints:
         assert data["data"]["id"] == test_natural_person.id
         assert data["data"]["name"] == test_natural_person.name
         assert data["data"]["email"] == test_natural_person.email
-        assert data["data"]["balance"] == float(test_natural_person.balance)
+        assert data["data"]["balance"] == test_natural_person.balance / 100
         assert "cpf" in data["data"]
         assert "password" not in data["data"]
     
@@ -26,7 +28,7 @@ class TestProfileEndpoints:
         assert data["data"]["id"] == test_legal_person.id
         assert data["data"]["name"] == test_legal_person.name
         assert data["data"]["email"] == test_legal_person.email
-        assert data["data"]["balance"] == float(test_legal_person.balance)
+        assert data["data"]["balance"] == test_legal_person.balance / 100
         assert "cnpj" in data["data"]
         assert "password" not in data["data"]
     
@@ -40,3 +42,36 @@ class TestProfileEndpoints:
         assert data["error_code"] == "INVALID_TOKEN"
     
 
+
+    def test_repeat_calls_served_from_cache(self, db_session, client_natural_person, test_natural_person):
+        client_natural_person.get("/api/v1/user/profile")
+        # A change behind the cache's back is not seen until a profile field changes
+        db_session.execute(Person.__table__.update().where(Person.id == test_natural_person.id).values(name="Outro Nome"))
+        db_session.commit()
+        
+        data = client_natural_person.get("/api/v1/user/profile").json()["data"]
+        
+        assert data["name"] == "João Silva"
+        assert balance_cache_stats()["hits"] == 1
+    
+    def test_balance_changes_keep_document_but_update_balance(self, client_natural_person, test_natural_person):
+        client_natural_person.get("/api/v1/user/profile")
+        client_natural_person.post("/api/v1/operation/deposit", json={"amount": 50.0})
+        
+        data = client_natural_person.get("/api/v1/user/profile").json()["data"]
+        
+        assert data["balance"] == 1050.0
+        assert data["name"] == "João Silva"
+    
+    def test_profile_field_change_invalidates(self, db_session, client_natural_person, test_natural_person):
+        client_natural_person.get("/api/v1/user/profile")
+        test_natural_person.last_login = datetime(2024, 1, 1)
+        db_session.commit()
+        assert client_natural_person.get("/api/v1/user/profile").json()["data"]["city"] == "São Paulo"
+        
+        test_natural_person.city = "Campinas"
+        db_session.commit()
+        
+        data = client_natural_person.get("/api/v1/user/profile").json()["data"]
+        assert data["city"] == "Campinas"
+        assert data["balance"] == 1000.0
@@ -0,0 +1,190 @@
+import pytest
+from datetime import timedelta
+from unittest.mock import patch
+from sqlalchemy.exc import OperationalError
+from app.core.clock import utcnow
+from app.models.recurring_payment import (
+    RecurringPayment,
+    RECURRING_PAYMENT_ACTIVE,
+    RECURRING_PAYMENT_FINISHED,
+    RECURRING_PAYMENT_CANCELLED,
+    RECURRENCE_WEEKLY
+)
+from app.models.recurring_payment_run import RecurringPaymentRun
+from app.services.recurring_payment_service import RecurringPaymentService, next_occurrence
+from app.services.transaction_service import TransactionService
+
+def create(client, recipient_id, amount, interval="daily", **extra):
+    payload = {
+        "recipient_id": recipient_id,
+        "amount": amount,
+        "interval": interval,
+        "start_at": (utcnow() + timedelta(hours=1)).isoformat()
+    }
+    payload.update(extra)
+    return client.post("/api/v1/operation/transfer/recurring", json=payload)
+
+def backdate(db_session, start_at):
+    db_session.query(RecurringPayment).update({"start_at": start_at, "next_run_at": start_at})
+    db_session.commit()
+
+@pytest.mark.integration
+class TestRecurringPaymentEndpoints:
+    
+    def test_create_recurring_payment(self, client_natural_person, test_legal_person):
+        response = create(client_natural_person, test_legal_person.id, 50.0, "monthly")
+        
+        assert response.status_code == 201
+        data = response.json()["data"]
+        assert data["interval"] == "monthly"
+        assert data["status"] == "active"
+        assert data["next_run_at"] == data["start_at"]
+    
+    def test_end_before_start_is_rejected(self, client_natural_person, test_legal_person):
+        response = create(
+            client_natural_person, test_legal_person.id, 50.0,
+            end_at=(utcnow() - timedelta(days=1)).isoformat()
+        )
+        
+        assert response.status_code == 422
+    
+    def test_list_and_cancel(self, client_natural_person, test_legal_person):
+        recurring_id = create(client_natural_person, test_legal_person.id, 50.0).json()["data"]["id"]
+        
+        response = client_natural_person.delete(f"/api/v1/operation/transfer/recurring/{recurring_id}")
+        assert response.status_code == 200
+        assert response.json()["data"]["status"] == "cancelled"
+        
+        again = client_natural_person.delete(f"/api/v1/operation/transfer/recurring/{recurring_id}")
+        assert again.status_code == 400
+        assert again.json()["error_code"] == "RECURRING_PAYMENT_NOT_ACTIVE"
+        
+        listed = client_natural_person.get("/api/v1/operation/transfer/recurring").json()["data"]
+        assert [item["id"] for item in listed["recurring_payments"]] == [recurring_id]
+
+@pytest.mark.integration
+class TestRecurringPaymentRuns:
+    
+    def test_run_executes_and_advances(self, db_session, client_natural_person, test_natural_person, test_legal_person):
+        create(client_natural_person, test_legal_person.id, 100.0)
+        now = utcnow()
+        backdate(db_session, now - timedelta(minutes=5))
+        
+        metrics = RecurringPaymentService(db_session).run_due(batch_size=10, now=now)
+        
+        assert metrics["executed"] == 1
+        recurring = db_session.query(RecurringPayment).one()
+        assert recurring.next_run_at == now - timedelta(minutes=5) + timedelta(days=1)
+        assert recurring.last_transaction_id is not None
+        db_session.refresh(test_natural_person)
+        assert test_natural_person.balance == 90000
+        
+        again = RecurringPaymentService(db_session).run_due(batch_size=10, now=now)
+        assert again["executed"] == 0
+    
+    def test_catch_up_runs_every_missed_occurrence(self, db_session, client_natural_person, test_natural_person, test_legal_person):
+        create(client_natural_person, test_legal_person.id, 10.0)
+        now = utcnow()
+        backdate(db_session, now - timedelta(days=2, minutes=1))
+        
+        metrics = RecurringPaymentService(db_session).run_due(batch_size=10, now=now)
+        
+        assert metrics["executed"] == 3
+        assert metrics["batches"] == 3
+        assert metrics["max_lag_seconds"] >= 2 * 86400
+        db_session.refresh(test_natural_person)
+        assert test_natural_person.balance == 97000
+    
+    def test_without_catch_up_missed_occurrences_are_skipped(self, db_session, client_natural_person, test_natural_person, test_legal_person):
+        create(client_natural_person, test_legal_person.id, 10.0, catch_up=False)
+        now = utcnow()
+        backdate(db_session, now - timedelta(days=2, minutes=1))
+        
+        metrics = RecurringPaymentService(db_session).run_due(batch_size=10, now=now)
+        
+        assert metrics["executed"] == 1
+        assert metrics["skipped"] == 2
+        assert db_session.query(RecurringPayment).one().next_run_at > now
+    
+    def test_failed_occurrence_advances_and_records_error(self, db_session, client_natural_person, test_legal_person):
+        create(client_natural_person, test_legal_person.id, 5000.0)
+        now = utcnow()
+        backdate(db_session, now - timedelta(minutes=1))
+        
+        metrics = RecurringPaymentService(db_session).run_due(batch_size=10, now=now)
+        
+        assert metrics["failed"] == 1
+        recurring = db_session.query(RecurringPayment).one()
+        assert recurring.last_error_code == "INSUFFICIENT_FUNDS"
+        assert recurring.next_run_at > now
+        assert recurring.status == RECURRING_PAYMENT_ACTIVE
+    
+    def test_unexpected_error_fails_only_that_schedule(self, db_session, client_natural_person, test_natural_person, test_legal_person):
+        for amount in (1.0, 2.0, 3.0):
+            create(client_natural_person, test_legal_person.id, amount)
+        now = utcnow()
+        backdate(db_session, now - timedelta(minutes=1))
+        execute_transfer = TransactionService.execute_transfer
+        
+        def flaky(service, sender_id, recipient_id, amount):
+            if amount == 200:
+                raise OperationalError("INSERT", {}, Exception("deadlock detected"))
+            return execute_transfer(service, sender_id, recipient_id, amount)
+        
+        with patch.object(TransactionService, "execute_transfer", flaky):
+            metrics = RecurringPaymentService(db_session).run_due(batch_size=10, now=now)
+        
+        assert metrics["executed"] == 2
+        assert metrics["failed"] == 1
+        broken = db_session.query(RecurringPayment).filter_by(amount=200).one()
+        assert broken.last_error_code == "EXECUTION_ERROR"
+        assert broken.next_run_at > now
+        assert broken.status == RECURRING_PAYMENT_ACTIVE
+        db_session.refresh(test_natural_person)
+        assert test_natural_person.balance == 100000 - 100 - 300
+    
+    def test_schedule_that_cannot_advance_is_cancelled(self, db_session, client_natural_person, test_legal_person):
+        create(client_natural_person, test_legal_person.id, 1.0, interval="weekly")
+        create(client_natural_person, test_legal_person.id, 2.0)
+        now = utcnow()
+        backdate(db_session, now - timedelta(minutes=1))
+        real_next = next_occurrence
+        
+        def broken_weekly(interval, start_at, after):
+            if interval == RECURRENCE_WEEKLY:
+                raise ValueError("bad interval")
+            return real_next(interval, start_at, after)
+        
+        with patch("app.services.recurring_payment_service.next_occurrence", side_effect=broken_weekly):
+            metrics = RecurringPaymentService(db_session).run_due(batch_size=10, now=now)
+        
+        assert metrics["executed"] == 2
+        broken = db_session.query(RecurringPayment).filter_by(amount=100).one()
+        assert broken.status == RECURRING_PAYMENT_CANCELLED
+        assert broken.last_error_code == "EXECUTION_ERROR"
+        assert db_session.query(RecurringPayment).filter_by(amount=200).one().next_run_at > now
+    
+    def test_schedule_finishes_after_end_at(self, db_session, client_natural_person, test_legal_person):
+        create(client_natural_person, test_legal_person.id, 10.0)
+        now = utcnow()
+        backdate(db_session, now - timedelta(minutes=1))
+        db_session.query(RecurringPayment).update({"end_at": now})
+        db_session.commit()
+        
+        metrics = RecurringPaymentService(db_session).run_due(batch_size=10, now=now)
+        
+        assert metrics["finished"] == 1
+        assert db_session.query(RecurringPayment).one().status == RECURRING_PAYMENT_FINISHED
+    
+    def test_run_metrics_are_stored(self, db_session, client_natural_person, test_legal_person):
+        for _ in range(5):
+            create(client_natural_person, test_legal_person.id, 1.0)
+        now = utcnow()
+        backdate(db_session, now - timedelta(minutes=1))
+        
+        RecurringPaymentService(db_session).run_due(batch_size=2, now=now)
+        
+        run = db_session.query(RecurringPaymentRun).one()
+        assert run.batches == 3
+        assert run.executed == 5
+        assert run.started_at == now
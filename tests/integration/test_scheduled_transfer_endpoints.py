@@ -0,0 +1,149 @@
+import pytest
+from unittest.mock import patch
+from sqlalchemy.exc import OperationalError
+from datetime import timedelta
+from app.core.clock import utcnow
+from app.models.scheduled_transfer import (
+    ScheduledTransfer,
+    SCHEDULED_TRANSFER_PENDING,
+    SCHEDULED_TRANSFER_EXECUTED,
+    SCHEDULED_TRANSFER_FAILED
+)
+from app.schemas.transaction import ScheduledTransferRequest
+from app.services.scheduled_transfer_service import ScheduledTransferService
+from app.services.transaction_service import TransactionService
+from app.services.scheduled_transfer_executor import ScheduledTransferExecutor
+
+def schedule(client, recipient_id, amount, execute_at=None):
+    execute_at = execute_at or utcnow() + timedelta(hours=1)
+    return client.post(
+        "/api/v1/operation/transfer/scheduled",
+        json={"recipient_id": recipient_id, "amount": amount, "execute_at": execute_at.isoformat()}
+    )
+
+def make_due(db_session):
+    db_session.query(ScheduledTransfer).update({"execute_at": utcnow() - timedelta(seconds=1)})
+    db_session.commit()
+
+@pytest.mark.integration
+class TestScheduledTransferEndpoints:
+    
+    def test_schedule_transfer(self, db_session, client_natural_person, test_natural_person, test_legal_person):
+        response = schedule(client_natural_person, test_legal_person.id, 150.0)
+        
+        assert response.status_code == 201
+        data = response.json()["data"]
+        assert data["status"] == "pending"
+        assert data["amount"] == 150.0
+        assert data["transaction_id"] is None
+        
+        db_session.refresh(test_natural_person)
+        assert test_natural_person.balance == 100000
+    
+    def test_schedule_in_the_past_is_rejected(self, client_natural_person, test_legal_person):
+        response = schedule(client_natural_person, test_legal_person.id, 10.0, utcnow() - timedelta(minutes=1))
+        
+        assert response.status_code == 422
+    
+    def test_schedule_to_self_is_rejected(self, client_natural_person, test_natural_person):
+        response = schedule(client_natural_person, test_natural_person.id, 10.0)
+        
+        assert response.status_code == 400
+        assert response.json()["error_code"] == "INVALID_RECIPIENT"
+    
+    def test_list_and_cancel(self, client_natural_person, test_legal_person):
+        scheduled_id = schedule(client_natural_person, test_legal_person.id, 10.0).json()["data"]["id"]
+        
+        response = client_natural_person.delete(f"/api/v1/operation/transfer/scheduled/{scheduled_id}")
+        assert response.status_code == 200
+        assert response.json()["data"]["status"] == "cancelled"
+        
+        again = client_natural_person.delete(f"/api/v1/operation/transfer/scheduled/{scheduled_id}")
+        assert again.status_code == 400
+        assert again.json()["error_code"] == "SCHEDULED_TRANSFER_NOT_PENDING"
+        
+        listed = client_natural_person.get("/api/v1/operation/transfer/scheduled").json()["data"]
+        assert [item["status"] for item in listed["scheduled_transfers"]] == ["cancelled"]
+    
+    def test_cancel_other_users_transfer_is_not_found(self, db_session, client_natural_person, test_natural_person, test_legal_person):
+        data = ScheduledTransferRequest(
+            recipient_id=test_natural_person.id, amount=10.0, execute_at=utcnow() + timedelta(hours=1)
+        )
+        scheduled_id = ScheduledTransferService(db_session).schedule(data, test_legal_person)["data"]["id"]
+        
+        response = client_natural_person.delete(f"/api/v1/operation/transfer/scheduled/{scheduled_id}")
+        
+        assert response.status_code == 404
+        assert response.json()["error_code"] == "SCHEDULED_TRANSFER_NOT_FOUND"
+
+@pytest.mark.integration
+class TestScheduledTransferExecution:
+    
+    def test_execute_due_runs_only_due_transfers(self, db_session, client_natural_person, test_natural_person, test_legal_person):
+        schedule(client_natural_person, test_legal_person.id, 100.0)
+        make_due(db_session)
+        schedule(client_natural_person, test_legal_person.id, 50.0)
+        
+        counts = ScheduledTransferService(db_session).execute_due(limit=10)
+        
+        assert counts == {"claimed": 1, "executed": 1, "failed": 0, "retried": 0}
+        executed = db_session.query(ScheduledTransfer).filter_by(status=SCHEDULED_TRANSFER_EXECUTED).one()
+        assert executed.transaction_id is not None
+        assert executed.executed_at is not None
+        assert db_session.query(ScheduledTransfer).filter_by(status=SCHEDULED_TRANSFER_PENDING).count() == 1
+        
+        db_session.refresh(test_natural_person)
+        db_session.refresh(test_legal_person)
+        assert test_natural_person.balance == 90000
+        assert test_legal_person.balance == 510000
+    
+    def test_failure_does_not_block_the_batch(self, db_session, client_natural_person, test_natural_person, test_legal_person):
+        schedule(client_natural_person, test_legal_person.id, 5000.0)
+        schedule(client_natural_person, test_legal_person.id, 200.0)
+        make_due(db_session)
+        
+        counts = ScheduledTransferService(db_session).execute_due(limit=10)
+        
+        assert counts["executed"] == 1
+        assert counts["failed"] == 1
+        failed = db_session.query(ScheduledTransfer).filter_by(status=SCHEDULED_TRANSFER_FAILED).one()
+        assert failed.error_code == "INSUFFICIENT_FUNDS"
+        db_session.refresh(test_natural_person)
+        assert test_natural_person.balance == 80000
+    
+    def test_unexpected_error_fails_only_that_transfer(self, db_session, client_natural_person, test_natural_person, test_legal_person):
+        schedule(client_natural_person, test_legal_person.id, 100.0)
+        schedule(client_natural_person, test_legal_person.id, 200.0)
+        make_due(db_session)
+        broken = db_session.query(ScheduledTransfer).filter_by(amount=10000).one().id
+        execute_transfer = TransactionService.execute_transfer
+        
+        def flaky(service, sender_id, recipient_id, amount):
+            if amount == 10000:
+                raise OperationalError("INSERT", {}, Exception("deadlock detected"))
+            return execute_transfer(service, sender_id, recipient_id, amount)
+        
+        with patch.object(TransactionService, "execute_transfer", flaky):
+            counts = ScheduledTransferService(db_session).execute_due(limit=10)
+        
+        assert counts["executed"] == 1
+        assert counts["failed"] == 1
+        failed = db_session.get(ScheduledTransfer, broken)
+        assert failed.status == SCHEDULED_TRANSFER_FAILED
+        assert failed.error_code == "EXECUTION_ERROR"
+        db_session.refresh(test_natural_person)
+        assert test_natural_person.balance == 80000
+        assert ScheduledTransferService(db_session).execute_due(limit=10)["claimed"] == 0
+    
+    def test_executor_drains_backlog_in_batches(self, db_session, session_factory, client_natural_person, test_natural_person, test_legal_person):
+        for _ in range(7):
+            schedule(client_natural_person, test_legal_person.id, 1.0)
+        make_due(db_session)
+        
+        executor = ScheduledTransferExecutor(session_factory, workers=1, batch_size=3, max_per_second=None)
+        totals = executor.run_once()
+        
+        assert totals["executed"] == 7
+        assert db_session.query(ScheduledTransfer).filter_by(status=SCHEDULED_TRANSFER_PENDING).count() == 0
+        db_session.refresh(test_natural_person)
+        assert test_natural_person.balance == 99300
@@ -24,19 +24,19 @@ class TestTransactionEndpoints:
         assert data["data"]["amount"] == 100.0
         assert "message" in data
         
-        assert test_natural_person.balance == initial_sender_balance - 100.0
-        assert test_legal_person.balance == initial_recipient_balance + 100.0
+        assert test_natural_person.balance == initial_sender_balance - 10000
+        assert test_legal_person.balance == initial_recipient_balance + 10000
         
         transaction = db_session.query(Transaction).order_by(Transaction.id.desc()).first()
         assert transaction is not None
-        assert transaction.amount == 100.0
+        assert transaction.amount == 10000
         assert transaction.transaction_type == TYPE_TRANSACTION_TRANSFER
         assert transaction.sender_id == test_natural_person.id
         assert transaction.recipient_id == test_legal_person.id
     
     def test_transfer_insufficient_funds(self, db_session, test_natural_person, test_legal_person, client_natural_person):
 
-        test_natural_person.balance = 50.0
+        test_natural_person.balance = 5000
         db_session.commit()
        
         response = client_natural_person.post(
@@ -70,11 +70,11 @@ class TestTransactionEndpoints:
         assert "message" in data
         
         db_session.refresh(test_natural_person)
-        assert test_natural_person.balance == initial_balance + 200.0
+        assert test_natural_person.balance == initial_balance + 20000
         
         transaction = db_session.query(Transaction).order_by(Transaction.id.desc()).first()
         assert transaction is not None
-        assert transaction.amount == 200.0
+        assert transaction.amount == 20000
         assert transaction.transaction_type == TYPE_TRANSACTION_DEPOSIT
         assert transaction.sender_id == test_natural_person.id
     
@@ -109,16 +109,16 @@ class TestTransactionEndpoints:
         assert "message" in data
         
         db_session.refresh(test_natural_person)
-        assert test_natural_person.balance == initial_balance - 100.0
+        assert test_natural_person.balance == initial_balance - 10000
         
         transaction = db_session.query(Transaction).order_by(Transaction.id.desc()).first()
         assert transaction is not None
-        assert transaction.amount == 100.0
+        assert transaction.amount == 10000
         assert transaction.transaction_type == TYPE_TRANSACTION_WITHDRAW
         assert transaction.sender_id == test_natural_person.id
 
     def test_withdraw_insufficient_funds(self, db_session, test_natural_person, client_natural_person):
-        test_natural_person.balance = 50.0
+        test_natural_person.balance = 5000
         db_session.commit()
         
         response = client_natural_person.post(
@@ -175,3 +175,30 @@ class TestTransactionEndpoints:
         assert data["success"] is False
         assert "message" in data
         assert data["error_code"] == "NOT_NATURAL_PERSON"
+
+    def test_deposit_amounts_do_not_drift(self, db_session, test_natural_person, client_natural_person):
+        initial_balance = test_natural_person.balance
+        
+        for _ in range(3):
+            response = client_natural_person.post(
+                "/api/v1/operation/deposit",
+                json={"amount": 0.1}
+            )
+            assert response.status_code == 200
+        
+        db_session.refresh(test_natural_person)
+        assert test_natural_person.balance == initial_balance + 30
+        
+        response = client_natural_person.get("/api/v1/operation/balance")
+        assert response.json()["data"]["balance"] == (initial_balance + 30) / 100
+
+    def test_deposit_rejects_fractional_cents(self, client_natural_person):
+        response = client_natural_person.post(
+            "/api/v1/operation/deposit",
+            json={"amount": 10.001}
+        )
+        
+        assert response.status_code == 422
+        data = response.json()
+        assert data["success"] is False
+        assert data["error_code"] == "VALIDATION_ERROR"
@@ -9,23 +9,23 @@ class TestTransactionHistoryEndpoints:
         # Create some test transactions first
         transactions = [
             Transaction(
-                amount=200.0,
+                amount=20000,
                 transaction_type=TYPE_TRANSACTION_DEPOSIT,
                 sender_id=test_natural_person.id
             ),
             Transaction(
-                amount=50.0,
+                amount=5000,
                 transaction_type=TYPE_TRANSACTION_WITHDRAW,
                 sender_id=test_natural_person.id
             ),
             Transaction(
-                amount=100.0,
+                amount=10000,
                 transaction_type=TYPE_TRANSACTION_TRANSFER,
                 sender_id=test_natural_person.id,
                 recipient_id=test_legal_person.id
             ),
             Transaction(
-                amount=25.0,
+                amount=2500,
                 transaction_type=TYPE_TRANSACTION_TRANSFER,
                 sender_id=test_legal_person.id,
                 recipient_id=test_natural_person.id
@@ -65,6 +65,35 @@ class TestTransactionHistoryEndpoints:
         assert incoming is not None
         assert "recebida" in incoming["description"]
     
+    def test_history_includes_counterparty(self, db_session, test_natural_person, test_legal_person, client_with_auth):
+        client = client_with_auth(test_natural_person)
+        client.post("/api/v1/operation/deposit", json={"amount": 10.0})
+        client.post("/api/v1/operation/transfer", json={"recipient_id": test_legal_person.id, "amount": 5.0})
+        
+        transactions = client.get("/api/v1/operation/history").json()["data"]["transactions"]
+        
+        assert transactions[0]["counterparty"] == {
+            "id": test_legal_person.id,
+            "name": "Empresa Teste LTDA",
+            "document": "12.345.678/****-**"
+        }
+        assert transactions[1]["counterparty"] is None
+        
+        incoming = client_with_auth(test_legal_person).get("/api/v1/operation/history").json()["data"]["transactions"]
+        assert incoming[0]["counterparty"]["name"] == "João Silva"
+        assert incoming[0]["counterparty"]["document"] == "***.456.789-**"
+    
+    def test_counterparty_name_change_is_seen(self, db_session, test_natural_person, test_legal_person, client_with_auth):
+        client = client_with_auth(test_natural_person)
+        client.post("/api/v1/operation/transfer", json={"recipient_id": test_legal_person.id, "amount": 5.0})
+        client.get("/api/v1/operation/history")
+        
+        test_legal_person.name = "Empresa Renomeada LTDA"
+        db_session.commit()
+        
+        transactions = client.get("/api/v1/operation/history").json()["data"]["transactions"]
+        assert transactions[0]["counterparty"]["name"] == "Empresa Renomeada LTDA"
+    
     def test_get_transaction_history_empty(self, client_legal_person):
         # Legal person with no transactions yet
         response = client_legal_person.get("/api/v1/operation/history")
@@ -83,4 +112,108 @@ class TestTransactionHistoryEndpoints:
         assert "error_code" in data
         assert data["error_code"] == "INVALID_TOKEN"
     
-   
\ No newline at end of file
+       
+    def test_history_pages_follow_next_cursor(self, db_session, test_natural_person, client_natural_person):
+        created_at = datetime(2024, 1, 1, 12, 0, 0)
+        # Two rows share each timestamp, so the id breaks ties between pages.
+        for i in range(7):
+            db_session.add(Transaction(
+                amount=100 * (i + 1),
+                transaction_type=TYPE_TRANSACTION_DEPOSIT,
+                sender_id=test_natural_person.id,
+                created_at=created_at + timedelta(minutes=i // 2)
+            ))
+        db_session.commit()
+        
+        ids, cursor, pages = [], None, 0
+        while True:
+            params = {"limit": 3}
+            if cursor:
+                params["cursor"] = cursor
+            data = client_natural_person.get("/api/v1/operation/history", params=params).json()["data"]
+            ids.extend(t["id"] for t in data["transactions"])
+            pages += 1
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+        
+        assert pages == 3
+        assert ids == sorted(ids, reverse=True)
+        assert len(set(ids)) == 7
+    
+    def test_history_rejects_invalid_cursor(self, client_natural_person):
+        response = client_natural_person.get("/api/v1/operation/history", params={"cursor": "not-a-cursor"})
+        
+        assert response.status_code == 422
+        assert response.json()["error_code"] == "INVALID_CURSOR"
+    
+    def test_history_limit_is_bounded(self, client_natural_person):
+        response = client_natural_person.get("/api/v1/operation/history", params={"limit": 0})
+        
+        assert response.status_code == 422
+
+@pytest.mark.integration
+class TestTransactionHistoryFilters:
+    
+    @pytest.fixture
+    def history(self, db_session, test_natural_person, test_legal_person):
+        rows = [
+            (TYPE_TRANSACTION_DEPOSIT, 10000, test_natural_person.id, None, datetime(2024, 1, 5)),
+            (TYPE_TRANSACTION_WITHDRAW, 3000, test_natural_person.id, None, datetime(2024, 1, 20)),
+            (TYPE_TRANSACTION_TRANSFER, 2000, test_natural_person.id, test_legal_person.id, datetime(2024, 2, 3)),
+            (TYPE_TRANSACTION_TRANSFER, 50000, test_legal_person.id, test_natural_person.id, datetime(2024, 2, 10)),
+            (TYPE_TRANSACTION_DEPOSIT, 700, test_natural_person.id, None, datetime(2024, 3, 1)),
+        ]
+        for transaction_type, amount, sender_id, recipient_id, created_at in rows:
+            db_session.add(Transaction(
+                transaction_type=transaction_type,
+                amount=amount,
+                sender_id=sender_id,
+                recipient_id=recipient_id,
+                created_at=created_at
+            ))
+        db_session.commit()
+    
+    def amounts(self, client, **params):
+        response = client.get("/api/v1/operation/history", params=params)
+        assert response.status_code == 200, response.json()
+        return [t["amount"] for t in response.json()["data"]["transactions"]]
+    
+    def test_date_range(self, history, client_natural_person):
+        assert self.amounts(client_natural_person, **{"from": "2024-01-10T00:00:00", "to": "2024-02-28T23:59:59"}) == [500.0, 20.0, 30.0]
+    
+    def test_type(self, history, client_natural_person):
+        assert self.amounts(client_natural_person, type="deposit") == [7.0, 100.0]
+        assert self.amounts(client_natural_person, type="transfer") == [500.0, 20.0]
+    
+    def test_direction(self, history, client_natural_person):
+        assert self.amounts(client_natural_person, direction="in") == [7.0, 500.0, 100.0]
+        assert self.amounts(client_natural_person, direction="out") == [20.0, 30.0]
+        assert self.amounts(client_natural_person, direction="in", type="withdraw") == []
+    
+    def test_amount_bounds(self, history, client_natural_person):
+        assert self.amounts(client_natural_person, min_amount=20, max_amount=100) == [20.0, 30.0, 100.0]
+    
+    def test_filters_combine_with_pagination(self, history, client_natural_person):
+        first = client_natural_person.get(
+            "/api/v1/operation/history", params={"direction": "in", "limit": 2}
+        ).json()["data"]
+        second = client_natural_person.get(
+            "/api/v1/operation/history", params={"direction": "in", "limit": 2, "cursor": first["next_cursor"]}
+        ).json()["data"]
+        
+        assert [t["amount"] for t in first["transactions"]] == [7.0, 500.0]
+        assert [t["amount"] for t in second["transactions"]] == [100.0]
+        assert second["next_cursor"] is None
+    
+    @pytest.mark.parametrize("params", [
+        {"from": "2024-02-01T00:00:00", "to": "2024-01-01T00:00:00"},
+        {"min_amount": 10, "max_amount": 5},
+        {"type": "loan"},
+        {"direction": "sideways"},
+        {"min_amount": "1.234"},
+    ])
+    def test_invalid_filters_are_rejected(self, client_natural_person, params):
+        response = client_natural_person.get("/api/v1/operation/history", params=params)
+        
+        assert response.status_code == 422
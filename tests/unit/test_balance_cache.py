@@ -0,0 +1,54 @@
+import pytest
+from unittest.mock import MagicMock
+from app.services.balance_cache import (
+    WORKER_ID,
+    BalanceInvalidationListener,
+    balance_cache_stats,
+    cached_balance,
+    invalidate_balance,
+    store_balance
+)
+
+@pytest.mark.unit
+class TestBalanceCache:
+    
+    def test_hit_after_store(self):
+        assert cached_balance(1) is None
+        store_balance(1, 3, 5000)
+        
+        assert cached_balance(1) == 5000
+        stats = balance_cache_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+    
+    def test_older_version_cannot_overwrite_newer(self):
+        store_balance(1, 4, 7000)
+        
+        assert not store_balance(1, 3, 5000)
+        assert cached_balance(1) == 7000
+        assert balance_cache_stats()["stale_writes"] == 1
+        
+        assert store_balance(1, 5, 6000)
+        assert cached_balance(1) == 6000
+    
+    def test_invalidation_refuses_values_read_before_it(self):
+        store_balance(1, 3, 5000)
+        invalidate_balance(1, 4)
+        
+        assert cached_balance(1) is None
+        assert not store_balance(1, 3, 5000)
+        assert store_balance(1, 4, 6000)
+        assert cached_balance(1) == 6000
+    
+    def test_listener_skips_own_messages(self):
+        listener = BalanceInvalidationListener(MagicMock())
+        store_balance(1, 3, 5000)
+        store_balance(2, 3, 5000)
+        
+        listener.handle(f"{WORKER_ID}:1.4")
+        listener.handle("other-worker:1.4,2.9")
+        
+        assert cached_balance(1) is None
+        assert cached_balance(2) is None
+        assert not store_balance(2, 8, 5000)
@@ -0,0 +1,94 @@
+import pytest
+import threading
+import time
+from app.core.cache import LRUCache
+from app.core.single_flight import SingleFlight
+
+@pytest.mark.unit
+class TestLRUCache:
+    
+    def test_get_and_set(self):
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        
+        assert cache.get("a") == 1
+        assert cache.get("missing") is None
+        assert cache.hits == 1
+        assert cache.misses == 1
+    
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+    
+    def test_expired_entries_are_dropped(self):
+        cache = LRUCache(maxsize=10, ttl=0.01)
+        cache.set("a", 1)
+        time.sleep(0.02)
+        
+        assert cache.get("a") is None
+        assert len(cache) == 0
+    
+    def test_delete_and_clear(self):
+        cache = LRUCache()
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.delete("a")
+        
+        assert cache.get("a") is None
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.hits == 0
+
+@pytest.mark.unit
+class TestSingleFlight:
+    
+    def test_concurrent_calls_share_one_execution(self):
+        single_flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+        results = []
+        
+        def slow():
+            calls.append(1)
+            started.set()
+            release.wait(1)
+            return "done"
+        
+        leader = threading.Thread(target=lambda: results.append(single_flight.do("k", slow)))
+        leader.start()
+        started.wait(1)
+        
+        followers = [
+            threading.Thread(target=lambda: results.append(single_flight.do("k", slow)))
+            for _ in range(3)
+        ]
+        for follower in followers:
+            follower.start()
+        time.sleep(0.05)
+        release.set()
+        
+        leader.join(1)
+        for follower in followers:
+            follower.join(1)
+        
+        assert len(calls) == 1
+        assert results == ["done"] * 4
+    
+    def test_exception_is_shared_and_key_released(self):
+        single_flight = SingleFlight()
+        
+        def failing():
+            raise ValueError("boom")
+        
+        with pytest.raises(ValueError):
+            single_flight.do("k", failing)
+        
+        assert single_flight.do("k", lambda: 42) == 42
@@ -0,0 +1,27 @@
+import pytest
+from app.core.etag import make_etag, etag_matches
+
+@pytest.mark.unit
+class TestEtag:
+    
+    def test_make_etag_is_quoted_and_deterministic(self):
+        etag = make_etag(1, 7)
+        
+        assert etag.startswith('"') and etag.endswith('"')
+        assert etag == make_etag(1, 7)
+        assert etag != make_etag(1, 8)
+    
+    def test_matches_exact_list_weak_and_wildcard(self):
+        etag = make_etag(1, 7)
+        
+        assert etag_matches(etag, etag)
+        assert etag_matches(f'"other", {etag}', etag)
+        assert etag_matches(f"W/{etag}", etag)
+        assert etag_matches("*", etag)
+    
+    def test_rejects_missing_or_different_tags(self):
+        etag = make_etag(1, 7)
+        
+        assert not etag_matches(None, etag)
+        assert not etag_matches("", etag)
+        assert not etag_matches(make_etag(1, 8), etag)
@@ -0,0 +1,90 @@
+import json
+import pytest
+from datetime import date, datetime
+from decimal import Decimal
+from fastapi import APIRouter, FastAPI, Response, status
+from fastapi.testclient import TestClient
+from app.core.json_response import EnvelopeJSONResponse, EnvelopeRoute, PreEncodedResponse, dumps, is_envelope
+from app.core.response_handler import ResponseHandler
+
+@pytest.fixture
+def envelope_client():
+    router = APIRouter(route_class=EnvelopeRoute)
+    
+    @router.post("/created", status_code=status.HTTP_201_CREATED)
+    def created(response: Response):
+        response.headers["ETag"] = '"abc"'
+        response.set_cookie("session", "1")
+        return ResponseHandler.success(data={"at": datetime(2024, 1, 4, 12, 30)})
+    
+    @router.get("/plain")
+    def plain():
+        return {"value": 1}
+    
+    app = FastAPI(default_response_class=EnvelopeJSONResponse)
+    app.include_router(router)
+    return TestClient(app)
+
+@pytest.mark.unit
+class TestJsonResponse:
+    
+    def test_dumps_matches_stdlib_output(self):
+        content = ResponseHandler.success(data={
+            "created_at": datetime(2024, 1, 4, 0, 0, 0, 5),
+            "day": date(2024, 1, 4),
+            "amount": Decimal("5.50"),
+            "items": (1, 2),
+            "name": "João"
+        })
+        
+        assert json.loads(dumps(content)) == {
+            "success": True,
+            "data": {
+                "created_at": "2024-01-04T00:00:00.000005",
+                "day": "2024-01-04",
+                "amount": 5.5,
+                "items": [1, 2],
+                "name": "João"
+            },
+            "message": "Operação concluída com sucesso"
+        }
+    
+    def test_is_envelope(self):
+        assert is_envelope(ResponseHandler.success())
+        assert is_envelope(ResponseHandler.error(error_code="X"))
+        assert not is_envelope({"message": "Banking API is running"})
+        assert not is_envelope([])
+    
+    def test_envelope_keeps_status_headers_and_cookies(self, envelope_client):
+        response = envelope_client.post("/created")
+        
+        assert response.status_code == 201
+        assert response.headers["etag"] == '"abc"'
+        assert response.cookies["session"] == "1"
+        assert response.json()["data"] == {"at": "2024-01-04T12:30:00"}
+    
+    def test_other_content_goes_through_fastapi(self, envelope_client):
+        response = envelope_client.get("/plain")
+        
+        assert response.status_code == 200
+        assert response.json() == {"value": 1}
+    
+    def test_pre_encoded_response_matches_json_response(self):
+        content = ResponseHandler.error(message="Não autorizado", error_code="INVALID_TOKEN")
+        pre_encoded = PreEncodedResponse(401, content, headers={"WWW-Authenticate": "Bearer"})
+        expected = EnvelopeJSONResponse(content, status_code=401, headers={"WWW-Authenticate": "Bearer"})
+        
+        response = pre_encoded()
+        
+        assert response.status_code == 401
+        assert response.body == expected.body
+        assert sorted(response.raw_headers) == sorted(expected.raw_headers)
+    
+    def test_pre_encoded_response_headers_are_not_shared(self):
+        pre_encoded = PreEncodedResponse(404, ResponseHandler.error(error_code="NOT_FOUND"))
+        
+        first = pre_encoded()
+        first.headers["Access-Control-Allow-Origin"] = "*"
+        
+        assert "access-control-allow-origin" not in pre_encoded().headers
+        assert first.body is pre_encoded().body
@@ -0,0 +1,43 @@
+import pytest
+from decimal import Decimal
+from app.core.money import to_cents, from_cents
+from app.schemas.transaction import TransferRequest, DepositRequest
+from pydantic import ValidationError
+
+@pytest.mark.unit
+class TestMoney:
+    
+    def test_to_cents_accepts_numbers_and_strings(self):
+        assert to_cents(100) == 10000
+        assert to_cents(0.1) == 10
+        assert to_cents(19.99) == 1999
+        assert to_cents("1234.56") == 123456
+        assert to_cents(Decimal("0.30")) == 30
+    
+    def test_to_cents_rejects_fractional_cents(self):
+        with pytest.raises(ValueError):
+            to_cents(1.234)
+    
+    def test_to_cents_rejects_invalid_values(self):
+        for value in ["abc", True, float("nan"), float("inf")]:
+            with pytest.raises(ValueError):
+                to_cents(value)
+    
+    def test_from_cents(self):
+        assert from_cents(123456) == 1234.56
+        assert from_cents(0) == 0
+        assert from_cents(None) is None
+    
+    def test_request_schemas_parse_amount_into_cents(self):
+        transfer = TransferRequest(recipient_id=2, amount=0.3)
+        assert transfer.amount == 30
+        assert isinstance(transfer.amount, int)
+        
+        deposit = DepositRequest(amount="10.50")
+        assert deposit.amount == 1050
+    
+    def test_request_schemas_reject_non_positive_amount(self):
+        with pytest.raises(ValidationError):
+            DepositRequest(amount=0)
+        with pytest.raises(ValidationError):
+            DepositRequest(amount=-1.5)
@@ -1,6 +1,7 @@
 import pytest
 from unittest.mock import MagicMock, patch
-from app.services.profile_service import ProfileService
+from app.services.balance_cache import WORKER_ID
+from app.services.profile_service import ProfileService, ProfileInvalidationListener, _profile_cache, _counterparty_cache
 from app.models.person import TYPE_NATURAL_PERSON, TYPE_LEGAL_PERSON
 from app.core.exceptions import NotFoundException, BadRequestException
 
@@ -16,7 +17,8 @@ class TestProfileService:
         mock_user.address = "Rua Teste, 123"
         mock_user.city = "São Paulo"
         mock_user.state = "SP"
-        mock_user.balance = 1000.0
+        mock_user.balance = 100000
+        mock_user.balance_shards = 0
         mock_user.type = TYPE_NATURAL_PERSON
         mock_user.created_at = "2023-01-01T00:00:00"
         mock_user.last_login = "2023-01-02T00:00:00"
@@ -49,7 +51,8 @@ class TestProfileService:
         mock_user.address = "Av Comercial, 456"
         mock_user.city = "São Paulo"
         mock_user.state = "SP"
-        mock_user.balance = 5000.0
+        mock_user.balance = 500000
+        mock_user.balance_shards = 0
         mock_user.type = TYPE_LEGAL_PERSON
         mock_user.created_at = "2023-01-01T00:00:00"
         mock_user.last_login = "2023-01-02T00:00:00"
@@ -90,4 +93,16 @@ class TestProfileService:
         
         mock_person_repo_instance.get_profile_by_id.assert_called_once_with(999)
     
-
+    
+    def test_invalidation_listener_skips_own_messages(self):
+        listener = ProfileInvalidationListener(MagicMock())
+        for user_id in (1, 2):
+            _profile_cache.set(user_id, {"id": user_id})
+            _counterparty_cache.set(user_id, {"id": user_id})
+        
+        listener.handle(f"{WORKER_ID}:1")
+        listener.handle("other-worker:2")
+        
+        assert _profile_cache.get(1) is not None
+        assert _profile_cache.get(2) is None
+        assert _counterparty_cache.get(2) is None
@@ -0,0 +1,30 @@
+import pytest
+from unittest.mock import patch
+from app.core.rate_limiter import RateLimiter
+
+@pytest.mark.unit
+class TestRateLimiter:
+    
+    def test_disabled_limiter_never_waits(self):
+        limiter = RateLimiter(None)
+        
+        assert limiter.acquire(10000) == 0.0
+    
+    def test_burst_is_served_without_waiting(self):
+        limiter = RateLimiter(100)
+        
+        with patch("app.core.rate_limiter.time.sleep") as sleep:
+            assert limiter.acquire(100) == 0.0
+        sleep.assert_not_called()
+    
+    def test_waits_for_tokens_beyond_the_burst(self):
+        limiter = RateLimiter(100)
+        
+        with patch("app.core.rate_limiter.time.sleep") as sleep:
+            limiter.acquire(100)
+            first = limiter.acquire(50)
+            second = limiter.acquire(50)
+        
+        assert first == pytest.approx(0.5, abs=0.05)
+        assert second == pytest.approx(1.0, abs=0.05)
+        assert sleep.call_count == 2
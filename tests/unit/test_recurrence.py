@@ -0,0 +1,27 @@
+import pytest
+from datetime import datetime
+from app.models.recurring_payment import RECURRENCE_DAILY, RECURRENCE_WEEKLY, RECURRENCE_MONTHLY
+from app.services.recurring_payment_service import next_occurrence
+
+@pytest.mark.unit
+class TestNextOccurrence:
+    
+    def test_daily_and_weekly(self):
+        start = datetime(2024, 1, 1, 9, 0)
+        
+        assert next_occurrence(RECURRENCE_DAILY, start, start) == datetime(2024, 1, 2, 9, 0)
+        assert next_occurrence(RECURRENCE_WEEKLY, start, start) == datetime(2024, 1, 8, 9, 0)
+    
+    def test_monthly_clamps_to_short_months_and_recovers(self):
+        start = datetime(2024, 1, 31, 8, 30)
+        
+        february = next_occurrence(RECURRENCE_MONTHLY, start, start)
+        march = next_occurrence(RECURRENCE_MONTHLY, start, february)
+        
+        assert february == datetime(2024, 2, 29, 8, 30)
+        assert march == datetime(2024, 3, 31, 8, 30)
+    
+    def test_monthly_rolls_over_the_year(self):
+        start = datetime(2024, 12, 15)
+        
+        assert next_occurrence(RECURRENCE_MONTHLY, start, start) == datetime(2025, 1, 15)
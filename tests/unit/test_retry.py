@@ -0,0 +1,43 @@
+import pytest
+from unittest.mock import MagicMock
+from sqlalchemy.orm.exc import StaleDataError
+from app.core.retry import retry_on_conflict
+from app.core.exceptions import ConcurrentUpdateException, BadRequestException
+
+@pytest.mark.unit
+class TestRetryOnConflict:
+    
+    def test_returns_first_success(self):
+        db = MagicMock()
+        operation = MagicMock(return_value="ok")
+        
+        assert retry_on_conflict(db, operation) == "ok"
+        operation.assert_called_once()
+        db.rollback.assert_not_called()
+    
+    def test_retries_stale_data_with_rollback(self):
+        db = MagicMock()
+        operation = MagicMock(side_effect=[StaleDataError(), ConcurrentUpdateException(), "ok"])
+        
+        assert retry_on_conflict(db, operation, attempts=3, backoff_ms=0) == "ok"
+        assert operation.call_count == 3
+        assert db.rollback.call_count == 2
+    
+    def test_raises_concurrent_update_after_last_attempt(self):
+        db = MagicMock()
+        operation = MagicMock(side_effect=StaleDataError())
+        
+        with pytest.raises(ConcurrentUpdateException) as exc_info:
+            retry_on_conflict(db, operation, attempts=2, backoff_ms=0)
+        
+        assert exc_info.value.status_code == 409
+        assert operation.call_count == 2
+    
+    def test_does_not_retry_other_errors(self):
+        db = MagicMock()
+        operation = MagicMock(side_effect=BadRequestException())
+        
+        with pytest.raises(BadRequestException):
+            retry_on_conflict(db, operation, attempts=3, backoff_ms=0)
+        
+        operation.assert_called_once()
@@ -0,0 +1,71 @@
+import pytest
+from datetime import date, datetime
+from unittest.mock import MagicMock
+from app.core.clock import add_months, month_start
+from app.core.exceptions import BadRequestException
+from app.services.transaction_partition_service import (
+    TransactionPartitionService,
+    partition_name,
+    partition_month,
+    partition_bounds
+)
+
+@pytest.mark.unit
+class TestTransactionPartitions:
+    
+    def test_add_months_crosses_years(self):
+        assert add_months(date(2024, 12, 1), 1) == date(2025, 1, 1)
+        assert add_months(date(2024, 1, 1), -1) == date(2023, 12, 1)
+        assert add_months(date(2024, 3, 1), -24) == date(2022, 3, 1)
+        assert month_start(datetime(2024, 2, 29, 23, 59)) == date(2024, 2, 1)
+    
+    def test_partition_name_round_trip(self):
+        assert partition_name(date(2024, 3, 1)) == "transaction_y2024m03"
+        assert partition_month("transaction_y2024m03") == date(2024, 3, 1)
+        assert partition_month("transaction_default") is None
+    
+    def test_partition_bounds_cover_the_month(self):
+        assert partition_bounds(date(2024, 12, 1)) == (datetime(2024, 12, 1), datetime(2025, 1, 1))
+    
+    def test_requires_postgresql(self):
+        db = MagicMock()
+        db.get_bind.return_value.dialect.name = "sqlite"
+        
+        with pytest.raises(BadRequestException) as error:
+            TransactionPartitionService(db).create_partitions()
+        
+        assert error.value.error_code == "TRANSACTION_NOT_PARTITIONED"
+    
+    def test_archive_requires_checkpoints_past_the_partition(self, tmp_path):
+        db = MagicMock()
+        db.get_bind.return_value.dialect.name = "postgresql"
+        service = TransactionPartitionService(db)
+        service.transaction_repository = MagicMock()
+        service.transaction_repository.get_partitions.return_value = {"transaction_y2020m01": True}
+        service.transaction_repository.get_partition_max_id.return_value = 500
+        service.checkpoint_service = MagicMock()
+        service.checkpoint_service.checkpoint_repository.get_last_transaction_id.return_value = 400
+        
+        with pytest.raises(BadRequestException) as error:
+            service.archive_partitions(retention_months=24, archive_dir=str(tmp_path), now=datetime(2024, 3, 10))
+        
+        assert error.value.error_code == "CHECKPOINTS_BEHIND"
+        service.checkpoint_service.create_checkpoints.assert_called_once()
+        service.transaction_repository.detach_partition.assert_not_called()
+        service.transaction_repository.drop_partition.assert_not_called()
+    
+    def test_archive_checkpoints_before_dropping(self, tmp_path):
+        db = MagicMock()
+        db.get_bind.return_value.dialect.name = "postgresql"
+        service = TransactionPartitionService(db)
+        service.transaction_repository = MagicMock()
+        service.transaction_repository.get_partitions.return_value = {"transaction_y2020m01": True}
+        service.transaction_repository.get_partition_max_id.return_value = 500
+        service.checkpoint_service = MagicMock()
+        service.checkpoint_service.checkpoint_repository.get_last_transaction_id.side_effect = [400, 650]
+        
+        archived = service.archive_partitions(retention_months=24, archive_dir=str(tmp_path), now=datetime(2024, 3, 10))
+        
+        assert archived == [str(tmp_path / "transaction_y2020m01.csv.gz")]
+        service.checkpoint_service.create_checkpoints.assert_called_once()
+        service.transaction_repository.drop_partition.assert_called_once_with("transaction_y2020m01")
@@ -13,9 +13,12 @@ class TestTransactionService:
     def test_transfer_success(self, mock_transaction_repo, mock_person_repo):
         mock_sender = MagicMock()
         mock_sender.id = 1
-        mock_sender.balance = 1000.0
+        mock_sender.balance = 100000
+        mock_sender.balance_shards = 0
         
         mock_recipient = MagicMock()
+        
+        mock_recipient.balance_shards = 0
         mock_recipient.id = 2
         
         mock_transaction = MagicMock()
@@ -36,7 +39,7 @@ class TestTransactionService:
         )
         current_user = MagicMock()
         current_user.id = 1
-        current_user.balance = 1000.0
+        current_user.balance = 100000
         
         db = MagicMock()
         service = TransactionService(db)
@@ -48,17 +51,20 @@ class TestTransactionService:
         assert "message" in result
         
         assert mock_person_repo_instance.get_by_id.call_count == 2
-        mock_person_repo_instance.update_balance.assert_any_call(1, -500.0)
-        mock_person_repo_instance.update_balance.assert_any_call(2, 500.0)
+        mock_person_repo_instance.update_balance.assert_any_call(1, -50000)
+        mock_person_repo_instance.update_balance.assert_any_call(2, 50000)
         mock_transaction_repo_instance.create_transaction.assert_called_once()
     
     @patch('app.services.transaction_service.PersonRepository')
     def test_transfer_insufficient_balance(self, mock_person_repo):
         mock_sender = MagicMock()
         mock_sender.id = 1
-        mock_sender.balance = 100.0
+        mock_sender.balance = 10000
+        mock_sender.balance_shards = 0
         
         mock_recipient = MagicMock()
+        
+        mock_recipient.balance_shards = 0
         mock_recipient.id = 2
         
         mock_person_repo_instance = MagicMock()
@@ -71,7 +77,7 @@ class TestTransactionService:
         )
         current_user = MagicMock()
         current_user.id = 1
-        current_user.balance = 100.0
+        current_user.balance = 10000
         
         db = MagicMock()
         service = TransactionService(db)
@@ -88,7 +94,8 @@ class TestTransactionService:
     def test_transfer_to_self_account(self, mock_person_repo):
         mock_person = MagicMock()
         mock_person.id = 1
-        mock_person.balance = 1000.0
+        mock_person.balance = 100000
+        mock_person.balance_shards = 0
         
         mock_person_repo_instance = MagicMock()
         mock_person_repo_instance.get_by_id.return_value = mock_person
@@ -100,7 +107,7 @@ class TestTransactionService:
         )
         current_user = MagicMock()
         current_user.id = 1
-        current_user.balance = 1000.0
+        current_user.balance = 100000
         
         db = MagicMock()
         service = TransactionService(db)
@@ -118,11 +125,13 @@ class TestTransactionService:
     def test_deposit_success(self, mock_transaction_repo, mock_person_repo):
         mock_user = MagicMock()
         mock_user.id = 1
-        mock_user.balance = 1000.0
+        mock_user.balance = 100000
+        mock_user.balance_shards = 0
         mock_user.type = TYPE_NATURAL_PERSON
         
         mock_updated_user = MagicMock()
-        mock_updated_user.balance = 1200.0
+        mock_updated_user.balance = 120000
+        mock_updated_user.balance_shards = 0
         
         mock_transaction = MagicMock()
         mock_transaction.id = 201
@@ -152,18 +161,20 @@ class TestTransactionService:
         assert result["data"]["new_balance"] == 1200.0
         assert "message" in result
         
-        mock_person_repo_instance.update_balance.assert_called_once_with(1, 200.0)
+        mock_person_repo_instance.update_balance.assert_called_once_with(1, 20000)
         mock_transaction_repo_instance.create_transaction.assert_called_once()
 
     @patch('app.services.transaction_service.PersonRepository')
     def test_withdraw_success(self, mock_person_repo):
         mock_user = MagicMock()
         mock_user.id = 1
-        mock_user.balance = 1000.0
+        mock_user.balance = 100000
+        mock_user.balance_shards = 0
         mock_user.type = TYPE_NATURAL_PERSON
         
         mock_updated_user = MagicMock()
-        mock_updated_user.balance = 800.0
+        mock_updated_user.balance = 80000
+        mock_updated_user.balance_shards = 0
         
         mock_transaction = MagicMock()
         mock_transaction.id = 301
@@ -215,7 +226,8 @@ class TestTransactionService:
     def test_withdraw_insufficient_balance(self, mock_person_repo):
         mock_user = MagicMock()
         mock_user.id = 1
-        mock_user.balance = 100.0
+        mock_user.balance = 10000
+        mock_user.balance_shards = 0
         mock_user.type = TYPE_NATURAL_PERSON
         
         mock_person_repo_instance = MagicMock()
@@ -259,7 +271,8 @@ class TestTransactionService:
     def test_transfer_recipient_not_found(self, mock_person_repo):
         mock_sender = MagicMock()
         mock_sender.id = 1
-        mock_sender.balance = 1000.0
+        mock_sender.balance = 100000
+        mock_sender.balance_shards = 0
         
         mock_person_repo_instance = MagicMock()
         mock_person_repo_instance.get_by_id.side_effect = lambda id: mock_sender if id == 1 else None
@@ -288,32 +301,36 @@ class TestTransactionService:
     def test_get_transaction_history(self, mock_transaction_repo, mock_person_repo):
         mock_user = MagicMock()
         mock_user.id = 1
-        mock_user.balance = 1000.0
+        mock_user.balance = 100000
+        mock_user.balance_shards = 0
         
         mock_transactions = [
             MagicMock(
                 id=1, 
-                amount=100.0, 
+                amount=10000, 
                 created_at="2023-01-01", 
                 transaction_type=1,  # TYPE_TRANSACTION_DEPOSIT
-                sender_id=1, 
-                recipient_id=None
+                direction="in", 
+                description_key="deposit",
+                counterparty_id=None
             ),
             MagicMock(
                 id=2, 
-                amount=200.0, 
+                amount=20000, 
                 created_at="2023-01-02", 
                 transaction_type=2,  # TYPE_TRANSACTION_WITHDRAW
-                sender_id=1, 
-                recipient_id=None
+                direction="out", 
+                description_key="withdraw",
+                counterparty_id=None
             ),
             MagicMock(
                 id=3, 
-                amount=300.0, 
+                amount=30000, 
                 created_at="2023-01-03", 
                 transaction_type=3,  # TYPE_TRANSACTION_TRANSFER
-                sender_id=2, 
-                recipient_id=1
+                direction="in", 
+                description_key="transfer_received",
+                counterparty_id=2
             )
         ]
         
@@ -322,7 +339,7 @@ class TestTransactionService:
         mock_person_repo.return_value = mock_person_repo_instance
         
         mock_transaction_repo_instance = MagicMock()
-        mock_transaction_repo_instance.get_user_transactions.return_value = mock_transactions
+        mock_transaction_repo_instance.get_user_transactions_page.return_value = mock_transactions
         mock_transaction_repo.return_value = mock_transaction_repo_instance
         
         db = MagicMock()
@@ -338,7 +355,7 @@ class TestTransactionService:
         assert result["data"]["transactions"][2]["direction"] == "in"  # Transfer received
         
         mock_person_repo_instance.get_by_id.assert_called_once_with(1)
-        mock_transaction_repo_instance.get_user_transactions.assert_called_once_with(1)
+        mock_transaction_repo_instance.get_user_transactions_page.assert_called_once_with(1, limit=51, before=None)
 
     @patch('app.services.transaction_service.PersonRepository')
     def test_get_transaction_history_user_not_found(self, mock_person_repo):
@@ -354,3 +371,39 @@ class TestTransactionService:
         
         assert exc_info.value.status_code == 404
         assert exc_info.value.error_code == "USER_NOT_FOUND"
+
+    @patch('app.services.transaction_service.PersonRepository')
+    @patch('app.services.transaction_service.TransactionRepository')
+    def test_batch_transfer_uses_bulk_statements(self, mock_transaction_repo, mock_person_repo):
+        from app.schemas.transaction import BatchTransferRequest
+        
+        mock_sender = MagicMock(id=1, balance=100000, balance_shards=0)
+        recipients = [MagicMock(id=2, balance_shards=0), MagicMock(id=3, balance_shards=0)]
+        
+        mock_person_repo_instance = MagicMock()
+        mock_person_repo_instance.get_by_id.return_value = mock_sender
+        mock_person_repo_instance.get_by_ids.return_value = recipients
+        mock_person_repo_instance.update_balance.return_value = MagicMock(balance=70000, balance_shards=0)
+        mock_person_repo.return_value = mock_person_repo_instance
+        
+        mock_transaction_repo_instance = MagicMock()
+        mock_transaction_repo_instance.create_transactions.return_value = [11, 12, 13]
+        mock_transaction_repo.return_value = mock_transaction_repo_instance
+        
+        batch = BatchTransferRequest(items=[
+            {"recipient_id": 2, "amount": 100.0},
+            {"recipient_id": 3, "amount": 100.0},
+            {"recipient_id": 2, "amount": 100.0}
+        ])
+        current_user = MagicMock(id=1)
+        
+        service = TransactionService(MagicMock())
+        result = service.batch_transfer(batch, current_user)
+        
+        assert result["data"]["succeeded"] == 3
+        assert [item["transaction_id"] for item in result["data"]["items"]] == [11, 12, 13]
+        mock_person_repo_instance.get_by_ids.assert_called_once_with({2, 3})
+        mock_person_repo_instance.update_balance.assert_called_once_with(1, -30000)
+        mock_person_repo_instance.credit_balances.assert_called_once_with({2: 20000, 3: 10000})
+        mock_transaction_repo_instance.create_transactions.assert_called_once()
+        mock_person_repo_instance.commit.assert_called_once()
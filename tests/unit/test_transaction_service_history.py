@@ -14,45 +14,49 @@ class TestTransactionServiceHistory:
         # Set up mock user
         mock_user = MagicMock()
         mock_user.id = 1
-        mock_user.balance = 1200.0
+        mock_user.balance = 120000
         
         # Set up mock transactions
         mock_transactions = [
             # Deposit
             MagicMock(
                 id=101,
-                amount=500.0,
+                amount=50000,
                 transaction_type=TYPE_TRANSACTION_DEPOSIT,
                 created_at=datetime(2023, 1, 1, 10, 0, 0),
-                sender_id=1,
-                recipient_id=None
+                direction="in",
+                description_key="deposit",
+                counterparty_id=None
             ),
             # Withdrawal
             MagicMock(
                 id=102,
-                amount=200.0,
+                amount=20000,
                 transaction_type=TYPE_TRANSACTION_WITHDRAW,
                 created_at=datetime(2023, 1, 2, 11, 0, 0),
-                sender_id=1,
-                recipient_id=None
+                direction="out",
+                description_key="withdraw",
+                counterparty_id=None
             ),
             # Outgoing transfer
             MagicMock(
                 id=103,
-                amount=300.0,
+                amount=30000,
                 transaction_type=TYPE_TRANSACTION_TRANSFER,
                 created_at=datetime(2023, 1, 3, 12, 0, 0),
-                sender_id=1,
-                recipient_id=2
+                direction="out",
+                description_key="transfer_sent",
+                counterparty_id=2
             ),
             # Incoming transfer
             MagicMock(
                 id=104,
-                amount=100.0,
+                amount=10000,
                 transaction_type=TYPE_TRANSACTION_TRANSFER,
                 created_at=datetime(2023, 1, 4, 13, 0, 0),
-                sender_id=2,
-                recipient_id=1
+                direction="in",
+                description_key="transfer_received",
+                counterparty_id=2
             )
         ]
         
@@ -61,7 +65,7 @@ class TestTransactionServiceHistory:
         mock_person_repo.return_value = mock_person_repo_instance
         
         mock_transaction_repo_instance = MagicMock()
-        mock_transaction_repo_instance.get_user_transactions.return_value = mock_transactions
+        mock_transaction_repo_instance.get_user_transactions_page.return_value = mock_transactions
         mock_transaction_repo.return_value = mock_transaction_repo_instance
         
         db = MagicMock()
@@ -97,7 +101,7 @@ class TestTransactionServiceHistory:
         assert "Transferência recebida" in incoming["description"]
         
         mock_person_repo_instance.get_by_id.assert_called_once_with(1)
-        mock_transaction_repo_instance.get_user_transactions.assert_called_once_with(1)
+        mock_transaction_repo_instance.get_user_transactions_page.assert_called_once_with(1, limit=51, before=None)
     
     @patch('app.services.transaction_service.PersonRepository')
     def test_get_transaction_history_user_not_found(self, mock_person_repo):
@@ -121,14 +125,14 @@ class TestTransactionServiceHistory:
     def test_get_transaction_history_empty(self, mock_transaction_repo, mock_person_repo):
         mock_user = MagicMock()
         mock_user.id = 1
-        mock_user.balance = 0.0
+        mock_user.balance = 0
         
         mock_person_repo_instance = MagicMock()
         mock_person_repo_instance.get_by_id.return_value = mock_user
         mock_person_repo.return_value = mock_person_repo_instance
         
         mock_transaction_repo_instance = MagicMock()
-        mock_transaction_repo_instance.get_user_transactions.return_value = []
+        mock_transaction_repo_instance.get_user_transactions_page.return_value = []
         mock_transaction_repo.return_value = mock_transaction_repo_instance
         
         db = MagicMock()
@@ -140,5 +144,5 @@ class TestTransactionServiceHistory:
         assert len(result["data"]["transactions"]) == 0
         
         mock_person_repo_instance.get_by_id.assert_called_once_with(1)
-        mock_transaction_repo_instance.get_user_transactions.assert_called_once_with(1)
+        mock_transaction_repo_instance.get_user_transactions_page.assert_called_once_with(1, limit=51, before=None)
     
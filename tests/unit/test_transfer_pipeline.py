@@ -0,0 +1,104 @@
+import pytest
+from app.services.transfer_pipeline import TransferPipeline
+from app.services.transaction_service import TransactionService
+from app.models.transaction import Transaction
+from app.core.exceptions import BadRequestException
+
+def submit_transfer(pipeline, sender_id, recipient_id, amount):
+    return pipeline.submit(
+        lambda db: TransactionService(db).execute_transfer(sender_id, recipient_id, amount)
+    )
+
+@pytest.mark.unit
+class TestTransferPipeline:
+    
+    @pytest.fixture
+    def pipeline(self, session_factory):
+        pipeline = TransferPipeline(session_factory=session_factory, batch_size=50, linger_ms=50)
+        yield pipeline
+        pipeline.stop(timeout=5)
+    
+    def test_transfers_share_one_commit(self, pipeline, db_session, test_natural_person, test_legal_person):
+        futures = [
+            submit_transfer(pipeline, test_natural_person.id, test_legal_person.id, 1000)
+            for _ in range(5)
+        ]
+        pipeline.start()
+        results = [future.result(timeout=5) for future in futures]
+        
+        assert all(result["success"] for result in results)
+        assert len({result["data"]["transaction_id"] for result in results}) == 5
+        assert pipeline.committed_batches == 1
+        
+        db_session.expire_all()
+        assert test_natural_person.balance == 95000
+        assert test_legal_person.balance == 505000
+    
+    def test_failed_item_does_not_abort_batch(self, pipeline, db_session, test_natural_person, test_legal_person):
+        futures = [
+            submit_transfer(pipeline, test_natural_person.id, test_legal_person.id, 1000),
+            submit_transfer(pipeline, test_natural_person.id, test_legal_person.id, 10000000),
+            submit_transfer(pipeline, test_natural_person.id, test_natural_person.id, 1000),
+            submit_transfer(pipeline, test_natural_person.id, test_legal_person.id, 2000)
+        ]
+        pipeline.start()
+        
+        assert futures[0].result(timeout=5)["success"] is True
+        with pytest.raises(BadRequestException) as insufficient:
+            futures[1].result(timeout=5)
+        assert insufficient.value.error_code == "INSUFFICIENT_FUNDS"
+        with pytest.raises(BadRequestException) as invalid:
+            futures[2].result(timeout=5)
+        assert invalid.value.error_code == "INVALID_RECIPIENT"
+        assert futures[3].result(timeout=5)["success"] is True
+        
+        db_session.expire_all()
+        assert test_natural_person.balance == 97000
+        assert db_session.query(Transaction).count() == 2
+    
+    def test_transfers_apply_in_submission_order(self, pipeline, db_session, test_natural_person, test_legal_person):
+        # Only succeeds if the legal person's incoming transfer is applied first
+        futures = [
+            submit_transfer(pipeline, test_natural_person.id, test_legal_person.id, 100000),
+            submit_transfer(pipeline, test_legal_person.id, test_natural_person.id, 600000),
+            submit_transfer(pipeline, test_natural_person.id, test_legal_person.id, 600000)
+        ]
+        pipeline.start()
+        
+        balances = [future.result(timeout=5)["data"]["new_balance"] for future in futures]
+        
+        assert balances == [0, 0, 0]
+    
+    def test_batch_size_bounds_each_commit(self, session_factory, db_session, test_natural_person, test_legal_person):
+        pipeline = TransferPipeline(session_factory=session_factory, batch_size=2, linger_ms=50)
+        futures = [
+            submit_transfer(pipeline, test_natural_person.id, test_legal_person.id, 100)
+            for _ in range(5)
+        ]
+        pipeline.start()
+        for future in futures:
+            future.result(timeout=5)
+        pipeline.stop(timeout=5)
+        
+        assert pipeline.committed_batches == 3
+    
+    def test_service_routes_transfers_through_running_pipeline(self, pipeline, monkeypatch, client_natural_person, test_legal_person, db_session):
+        monkeypatch.setattr("app.services.transaction_service.transfer_pipeline", pipeline)
+        pipeline.start()
+        
+        response = client_natural_person.post(
+            "/api/v1/operation/transfer",
+            json={"recipient_id": test_legal_person.id, "amount": 10.0}
+        )
+        
+        assert response.status_code == 200
+        assert response.json()["data"]["new_balance"] == 990.0
+        assert pipeline.committed_batches == 1
+        
+        client_natural_person.post(
+            "/api/v1/operation/transfer",
+            json={"recipient_id": test_legal_person.id, "amount": 10.0},
+            headers={"Idempotency-Key": "direct-path"}
+        )
+        assert pipeline.committed_batches == 1
+        assert db_session.query(Transaction).count() == 2